@@ -1,7 +1,7 @@
 """CSV dataset generator package."""
 
 from .config import SchemaConfig, SchemaError, load_schema
-from .core import generate_dataset
+from .core import generate_dataset, stream_dataset
 from .validation import ValidationResult, validate_tables
 
 __all__ = [
@@ -10,5 +10,6 @@ __all__ = [
     "ValidationResult",
     "generate_dataset",
     "load_schema",
+    "stream_dataset",
     "validate_tables",
 ]
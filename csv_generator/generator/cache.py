@@ -0,0 +1,125 @@
+"""On-disk cache of generated table files for incremental regeneration.
+
+Each table is keyed on a digest of everything its output depends on: its spec, row
+count, seed, backend, the relationships it takes part in, the keys of its parent
+tables (so a change anywhere upstream invalidates every descendant) and
+``ENGINE_VERSION``. A hit is linked (or copied) into the output directory instead of
+generated; the parent key columns children need are stored next to the CSV as JSON.
+Entries live under ``$DATAGEN_CACHE_DIR/tables`` (default ``~/.cache/datagen``) unless
+another directory is given.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Sequence
+
+from shared.io.digest import fingerprint
+
+from .core import TablePlan
+from .relationships import compact_column
+from .vocabulary import _faker_version
+
+# Bump whenever the same inputs can produce different output, e.g. a changed generator.
+ENGINE_VERSION = 4
+
+
+def default_cache_dir() -> Path:
+    configured = os.getenv("DATAGEN_CACHE_DIR")
+    base = Path(configured).expanduser() if configured else Path.home() / ".cache" / "datagen"
+    return base / "tables"
+
+
+def _vocabulary_source() -> str:
+    try:
+        return f"faker-{_faker_version()}"
+    except ImportError:
+        return "builtin"
+
+
+def table_keys(plans: list[TablePlan], relationships: list[dict[str, Any]], backend: str) -> dict[str, str]:
+    """Cache key of every table in ``plans`` (generation order, parents first)."""
+
+    keys: dict[str, str] = {}
+    vocabulary = _vocabulary_source()
+    for plan in plans:
+        related = [rel for rel in relationships if plan.name in (rel["parent_table"], rel["child_table"])]
+        keys[plan.name] = fingerprint(
+            {
+                "engine": ENGINE_VERSION,
+                "vocabulary": vocabulary,
+                "table": plan.name,
+                "spec": plan.spec,
+                "rows": plan.rows,
+                "seed": plan.seed,
+                "backend": backend,
+                "relationships": related,
+                "parents": {parent: keys[parent] for parent in plan.parents},
+            }
+        )
+    return keys
+
+
+def _link_or_copy(source: Path, dest: Path) -> None:
+    """Hard-link ``source`` to ``dest`` (replacing it), copying across file systems."""
+
+    if dest.exists() and os.path.samefile(source, dest):
+        return  # renaming a link onto the same file would leave the temporary name behind
+    tmp = dest.with_name(f".{dest.name}.{os.getpid()}.tmp")
+    tmp.unlink(missing_ok=True)
+    try:
+        os.link(source, tmp)
+    except OSError:
+        shutil.copyfile(source, tmp)
+    tmp.replace(dest)
+
+
+class TableCache:
+    """Generated CSV files and their retained key columns, by table name and key.
+
+    ``hits`` and ``misses`` list the tables looked up in the current run. Writing a
+    table into the output directory replaces the hard link instead of truncating the
+    shared file (see ``write_table``), so cached entries are never modified in place.
+    """
+
+    def __init__(self, directory: str | Path | None = None) -> None:
+        self.directory = Path(directory) if directory is not None else default_cache_dir()
+        self.hits: list[str] = []
+        self.misses: list[str] = []
+
+    def _paths(self, table_name: str, key: str) -> tuple[Path, Path]:
+        stem = self.directory / f"{table_name}-{key}"
+        return stem.with_suffix(".csv"), stem.with_suffix(".json")
+
+    def restore(self, table_name: str, key: str, dest: Path) -> tuple[int, dict[str, Sequence[Any]]] | None:
+        """Put the cached file for ``key`` at ``dest``; return its row count and key columns."""
+
+        csv_path, meta_path = self._paths(table_name, key)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            _link_or_copy(csv_path, dest)
+        except (OSError, ValueError):
+            self.misses.append(table_name)
+            return None
+        self.hits.append(table_name)
+        return int(meta["rows"]), {col: compact_column(values) for col, values in meta["retained"].items()}
+
+    def store(self, table_name: str, key: str, path: Path, rows: int, retained: dict[str, Sequence[Any]]) -> None:
+        """Add the freshly written ``path`` and its key columns under ``key``."""
+
+        csv_path, meta_path = self._paths(table_name, key)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            _link_or_copy(path, csv_path)
+            # The metadata is written last: an entry without it is never restored.
+            tmp = meta_path.with_name(f".{meta_path.name}.{os.getpid()}.tmp")
+            meta = {"rows": rows, "retained": {col: list(values) for col, values in retained.items()}}
+            tmp.write_text(json.dumps(meta), encoding="utf-8")
+            tmp.replace(meta_path)
+        except (OSError, TypeError, ValueError):
+            # Caching is an optimization; an unwritable cache (or key values JSON cannot
+            # hold) still generates correctly.
+            pass
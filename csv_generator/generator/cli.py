@@ -8,10 +8,17 @@ import os
 from pathlib import Path
 from typing import Any
 
-from .config import SchemaError, load_schema
-from .core import generate_dataset
-from .validation import validate_tables
-from .writers import write_tables
+from shared.constraints.foreign_keys import DEFAULT_MEMORY_KEYS
+from shared.constraints.streaming import UNIQUENESS_MODES, expected_row_counts, validate_stream
+from shared.io.readers import iter_csv_batches
+
+from .cache import TableCache
+from .config import SchemaConfig, SchemaError, load_schema
+from .core import DEFAULT_CHUNK_SIZE, generate_dataset
+from .scheduler import generate_to_directory
+from .sharding import generate_shard, generate_sharded, parse_shard
+from .validation import ValidationResult, validate_tables
+from .vectorized import BACKENDS
 
 
 def _resolve_path(value: str | None) -> Path | None:
@@ -28,11 +35,29 @@ def _cmd_generate(args: argparse.Namespace) -> None:
     out_dir = _resolve_path(args.out)
     assert out_dir is not None
 
-    tables, order, seed = generate_dataset(schema, rows_override=args.rows, seed_override=args.seed)
-    write_tables(out_dir, tables, order)
-    print(f"Generated dataset '{schema.raw['dataset']}' with seed={seed} at {out_dir}")
-    for table_name, rows in tables.items():
-        print(f"  - {table_name}: {len(rows)} rows")
+    options = {
+        "rows_override": args.rows,
+        "seed_override": args.seed,
+        "chunk_size": args.chunk_size,
+        "backend": args.backend,
+    }
+    if args.cache is not None and (args.shard is not None or args.shards is not None):
+        raise ValueError("--cache cannot be combined with --shard or --shards")
+    if args.shard is not None:
+        shard, shards = parse_shard(args.shard)
+        counts, seed = generate_shard(schema, out_dir, shard, shards, **options)
+        print(f"Generated shard {shard}/{shards} of dataset '{schema.raw['dataset']}' with seed={seed} at {out_dir}")
+    elif args.shards is not None:
+        counts, seed = generate_sharded(schema, out_dir, args.shards, workers=args.workers, **options)
+        print(f"Generated dataset '{schema.raw['dataset']}' in {args.shards} shards with seed={seed} at {out_dir}")
+    else:
+        cache = TableCache(_resolve_path(args.cache or None)) if args.cache is not None else None
+        counts, seed = generate_to_directory(schema, out_dir, workers=args.workers, cache=cache, **options)
+        print(f"Generated dataset '{schema.raw['dataset']}' with seed={seed} at {out_dir}")
+        if cache is not None:
+            print(f"Reused {len(cache.hits)} cached table(s), generated {len(counts) - len(cache.hits)}")
+    for table_name, count in counts.items():
+        print(f"  - {table_name}: {count} rows")
 
 
 def _cmd_describe(args: argparse.Namespace) -> None:
@@ -58,10 +83,47 @@ def _cmd_describe(args: argparse.Namespace) -> None:
             print(f"- {rel['child_table']}.{rel['child_key']} -> {rel['parent_table']}.{rel['parent_key']}")
 
 
+def _validate_files(
+    schema: SchemaConfig,
+    data_dir: Path,
+    rows_override: int | None,
+    uniqueness: str = "exact",
+    memory_keys: int = DEFAULT_MEMORY_KEYS,
+) -> ValidationResult:
+    """Validate the CSV files in ``data_dir`` chunk by chunk, without regenerating them."""
+
+    specs = schema.raw["tables"]
+    paths = {table_name: data_dir / f"{table_name}.csv" for table_name in specs}
+    for table_name, path in paths.items():
+        if not path.exists():
+            raise FileNotFoundError(f"CSV output for {table_name} not found: {path}")
+    expected_rows = expected_row_counts(schema.raw, rows_override)
+    result = validate_stream(
+        schema.raw,
+        {name: iter_csv_batches(path, specs[name].get("columns", [])) for name, path in paths.items()},
+        uniqueness=uniqueness,
+        capacity=expected_rows,
+        memory_keys=memory_keys,
+    )
+    errors = list(result.errors)
+    for table_name, expected in expected_rows.items():
+        if result.row_counts[table_name] != expected:
+            errors.append(f"Row count mismatch for {table_name}: expected {expected}, got {result.row_counts[table_name]}")
+    summary = {"table_rows": result.row_counts, "violations": result.violations}
+    return ValidationResult(valid=not errors, errors=errors, summary=summary)
+
+
 def _cmd_validate(args: argparse.Namespace) -> None:
     schema = load_schema(args.schema)
-    tables, _, _ = generate_dataset(schema, rows_override=args.rows, seed_override=args.seed)
-    result = validate_tables(schema.raw, tables)
+    if args.data is not None:
+        data_dir = _resolve_path(args.data)
+        assert data_dir is not None
+        result = _validate_files(schema, data_dir, args.rows, args.uniqueness, args.memory_keys)
+    else:
+        tables, _, _ = generate_dataset(
+            schema, rows_override=args.rows, seed_override=args.seed, backend=args.backend
+        )
+        result = validate_tables(schema.raw, tables, uniqueness=args.uniqueness, memory_keys=args.memory_keys)
 
     report_text = json.dumps(result.to_dict(), indent=2)
     out_path = _resolve_path(args.out) if args.out else (schema.path.parent / f"{schema.raw['dataset']}_validation_report.json")
@@ -88,9 +150,46 @@ def build_parser() -> argparse.ArgumentParser:
     common.add_argument("--out", default=None, help="Output path")
     common.add_argument("--seed", type=int, default=None, help="Override schema seed")
     common.add_argument("--verbose", action="store_true", help="Show full traceback on errors")
+    common.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default="python",
+        help="Value engine: row-wise random.Random (python) or columnar NumPy kernels (numpy)",
+    )
 
     gen = sub.add_parser("generate", help="Generate CSV datasets", parents=[common])
     gen.add_argument("--rows", type=int, default=None, help="Override rows for all tables")
+    gen.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="Rows generated and written per batch; bounds memory use",
+    )
+    gen.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes used to generate independent tables (or shards) concurrently",
+    )
+    gen.add_argument(
+        "--cache",
+        nargs="?",
+        const="",
+        default=None,
+        help="Reuse unchanged tables from a cache directory (default $DATAGEN_CACHE_DIR/tables)",
+    )
+    sharding = gen.add_mutually_exclusive_group()
+    sharding.add_argument(
+        "--shard",
+        default=None,
+        help="Write only shard i of N (i/N) as <table>.part-i-of-N.csv; concatenate parts in order",
+    )
+    sharding.add_argument(
+        "--shards",
+        type=int,
+        default=None,
+        help="Split every table into N row-range shards, run them on --workers processes and merge",
+    )
     gen.set_defaults(func=_cmd_generate)
 
     describe = sub.add_parser("describe", help="Describe schema contents", parents=[common])
@@ -98,6 +197,23 @@ def build_parser() -> argparse.ArgumentParser:
 
     validate = sub.add_parser("validate", help="Validate generated dataset against schema", parents=[common])
     validate.add_argument("--rows", type=int, default=None, help="Override rows for generated validation sample")
+    validate.add_argument(
+        "--data",
+        default=None,
+        help="Directory of generated CSV files to validate in place (default: validate a regenerated sample)",
+    )
+    validate.add_argument(
+        "--uniqueness",
+        choices=list(UNIQUENESS_MODES),
+        default="exact",
+        help="Unique-column check: exact sets, a Bloom filter (bounded memory) or a HyperLogLog estimate",
+    )
+    validate.add_argument(
+        "--memory-keys",
+        type=int,
+        default=DEFAULT_MEMORY_KEYS,
+        help="Parent keys held in memory per foreign key before spilling to a scratch SQLite index",
+    )
     validate.set_defaults(func=_cmd_validate)
 
     return parser
@@ -3,10 +3,10 @@
 from __future__ import annotations
 
 import re
-from typing import Any
+from typing import Any, Container
 
 
-def validate_value(value: Any, column: dict[str, Any], seen_values: set[Any] | None = None) -> bool:
+def validate_value(value: Any, column: dict[str, Any], seen_values: Container[Any] | None = None) -> bool:
     """Validate single value against constraints."""
 
     constraints = column.get("constraints", {})
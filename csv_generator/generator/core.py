@@ -4,59 +4,63 @@ from __future__ import annotations
 
 import random
 import uuid
-from datetime import date, timedelta
-from typing import Any
+from dataclasses import dataclass
+from itertools import chain
+from typing import Any, Callable, Iterator
 
-from .config import SchemaConfig
+from shared.constraints.unique import UniqueTracker
+from shared.io.rng import block_rng, derive_rng, derive_seed
+
+from .config import SchemaConfig, SchemaError
 from .constraints import validate_monotonic, validate_value
-from .corruption import apply_corruption
+from .corruption import CellEdits, CorruptionPlan, draw_cell_edits, draw_duplicate_sources
+from .expressions import CompiledExpression, compile_expression, expression_scope
 from .distributions import numeric_distribution, random_date, random_datetime, weighted_choice
-from .relationships import assign_foreign_keys, get_generation_order
-
-
-class FallbackFaker:
-    """Simple fallback for fake-like values when faker isn't installed."""
-
-    def __init__(self, rng: random.Random) -> None:
-        self.rng = rng
-
-    def name(self) -> str:
-        return f"User_{self.rng.randint(1000, 9999)}"
-
-    def email(self) -> str:
-        return f"user{self.rng.randint(1000, 9999)}@example.com"
-
-    def city(self) -> str:
-        return self.rng.choice(["Austin", "Seattle", "Miami", "Denver", "Boston"])
-
-    def state(self) -> str:
-        return self.rng.choice(["CA", "TX", "NY", "FL", "WA", "IL"])
+from .relationships import CompactColumnBuilder, ForeignKeySampler, get_generation_order
+from .uniqueness import needs_tracking, unique_generators
+from .vocabulary import DEFAULT_LOCALE, VOCABULARY_TYPES, VocabularyFaker, load_vocabulary
+from .vectorized import (
+    BACKENDS,
+    Kernel,
+    column_generator,
+    column_kernel,
+    column_random,
+    is_vectorized,
+    require_numpy,
+)
 
+DEFAULT_CHUNK_SIZE = 10_000
+RNG_BLOCK_ROWS = 4096
 
-def _make_faker(seed: int) -> Any:
-    try:
-        from faker import Faker
 
-        fake = Faker()
-        Faker.seed(seed)
-        fake.seed_instance(seed)
-        return fake
-    except ImportError:
-        return FallbackFaker(random.Random(seed))
+def _make_faker(seed: int, locale: str = DEFAULT_LOCALE, vocabulary_seed: int = 0) -> VocabularyFaker:
+    """Faker-like source for name/email/city/state values (see ``vocabulary``)."""
 
+    return VocabularyFaker(load_vocabulary(locale, vocabulary_seed), random.Random(seed))
 
-def _evaluate_expression(expression: str, row: dict[str, Any], rng: random.Random) -> Any:
-    def normal(mean: float, std: float) -> float:
-        return rng.gauss(mean, std)
 
-    def rand_days_after(start_iso: str, min_days: int, max_days: int) -> str:
-        base = date.fromisoformat(str(start_iso))
-        return (base + timedelta(days=rng.randint(min_days, max_days))).isoformat()
-
-    safe_globals = {"__builtins__": {"round": round, "min": min, "max": max, "float": float, "int": int}}
-    safe_locals = dict(row)
-    safe_locals.update({"normal": normal, "rand_days_after": rand_days_after})
-    return eval(expression, safe_globals, safe_locals)
+def _compile_computed(
+    table_name: str,
+    columns: list[dict[str, Any]],
+    relationships: list[dict[str, Any]],
+) -> dict[str, CompiledExpression]:
+    """Compile every computed column of a table once, failing fast on bad expressions."""
+
+    known = {col["name"] for col in columns}
+    for rel in relationships:
+        if rel["child_table"] == table_name:
+            known.add(rel["child_key"])
+            known.update(rel.get("lookup_columns", {}).values())
+
+    compiled: dict[str, CompiledExpression] = {}
+    for column in columns:
+        if not column.get("computed"):
+            continue
+        try:
+            compiled[column["name"]] = compile_expression(column["computed"], known)
+        except ValueError as exc:
+            raise SchemaError(f"Invalid computed expression for {table_name}.{column['name']}: {exc}") from exc
+    return compiled
 
 
 def _generate_value(
@@ -105,86 +109,490 @@ def _generate_value(
     return ""
 
 
-def _generate_table(
-    table_name: str,
-    table_spec: dict[str, Any],
-    row_count: int,
-    seed: int,
-    context: dict[str, list[dict[str, Any]]],
-    relationships: list[dict[str, Any]],
-) -> list[dict[str, Any]]:
-    rng = random.Random(seed)
-    fake = _make_faker(seed)
-    rows: list[dict[str, Any]] = []
-    unique_trackers: dict[str, set[Any]] = {
-        col["name"]: set()
-        for col in table_spec.get("columns", [])
-        if col.get("constraints", {}).get("unique") or col.get("constraints", {}).get("primary_key")
-    }
-
-    for row_idx in range(row_count):
-        row: dict[str, Any] = {}
-        for column in table_spec.get("columns", []):
+def _retained_columns(table_name: str, relationships: list[dict[str, Any]]) -> list[str]:
+    """Columns a table must expose to child tables (parent keys and lookups)."""
+
+    columns: list[str] = []
+    for rel in relationships:
+        if rel["parent_table"] != table_name:
+            continue
+        for col in [rel["parent_key"], *rel.get("lookup_columns", {})]:
+            if col not in columns:
+                columns.append(col)
+    return columns
+
+
+def _uses_vocabulary(columns: list[dict[str, Any]]) -> bool:
+    return any(col.get("type") in VOCABULARY_TYPES and not col.get("computed") for col in columns)
+
+
+def _unique_trackers(
+    columns: list[dict[str, Any]], generators: dict[str, Any], row_count: int
+) -> dict[str, UniqueTracker]:
+    return {col["name"]: UniqueTracker(row_count) for col in columns if needs_tracking(col, generators)}
+
+
+class _ColumnarTable:
+    """Column-at-a-time base and computed values for the ``numpy`` backend.
+
+    Vectorizable columns use the kernels in ``vectorized`` (name/email/city/state
+    through vocabulary lookups); the remaining types fall back to ``_generate_value``
+    with a per-column ``random.Random`` seeded from the same column stream. Streams are re-derived for every RNG block
+    (``start_block``), so every column stays independent of chunk size and sharding.
+    """
+
+    def __init__(
+        self,
+        table_name: str,
+        columns: list[dict[str, Any]],
+        seed: int,
+        expressions: dict[str, CompiledExpression],
+        unique: dict[str, Any],
+        unique_trackers: dict[str, UniqueTracker],
+        locale: str = DEFAULT_LOCALE,
+        vocabulary_seed: int = 0,
+    ) -> None:
+        self.table_name = table_name
+        self.seed = seed
+        self.unique = unique
+        self.unique_trackers = unique_trackers
+        self.columns: list[tuple[int, dict[str, Any], Kernel | None]] = []
+        self.expressions: list[tuple[int, str, CompiledExpression]] = []
+        self.base: list[tuple[dict[str, Any], Callable[[int, int], list[Any]], Callable[[int], Any]]] = []
+        self.computed: list[tuple[str, CompiledExpression, Callable[[int], Any], dict[str, Any]]] = []
+
+        vocabulary = load_vocabulary(locale, vocabulary_seed) if _uses_vocabulary(columns) else None
+        names: set[str] = set()
+        for position, column in enumerate(columns):
             if column.get("computed"):
+                self.expressions.append((position, column["name"], expressions[column["name"]]))
                 continue
+            if column["name"] in names:
+                continue
+            names.add(column["name"])
+            self.columns.append((position, column, column_kernel(column, vocabulary) if is_vectorized(column) else None))
+
+    def start_block(self, block: int) -> None:
+        """Re-derive every column stream for RNG block ``block``."""
+
+        seed = self.seed
+        self.base = []
+        for position, column, kernel in self.columns:
+            if kernel is not None:
+                values = column_generator(seed, position, 0, block)
+                retries = column_generator(seed, position, 1, block)
+                self.base.append(
+                    (
+                        column,
+                        lambda start, count, k=kernel, g=values: k(g, start, count),
+                        lambda row_idx, k=kernel, g=retries: k(g, row_idx, 1)[0],
+                    )
+                )
+            else:
+                col_rng = column_random(seed, position, 0, block)
+                self.base.append(
+                    (
+                        column,
+                        lambda start, count, c=column, r=col_rng: [
+                            _generate_value(c, idx, r, None) for idx in range(start, start + count)
+                        ],
+                        lambda row_idx, c=column, r=col_rng: _generate_value(c, row_idx, r, None),
+                    )
+                )
+            unique = self.unique.get(column["name"])
+            if unique is not None:
+                _, kernel, retry = self.base[-1]
+                self.base[-1] = (
+                    column,
+                    lambda start, count, u=unique, k=kernel: u.values(start, k(start, count)),
+                    lambda row_idx, u=unique, r=retry: u.value(row_idx, r(row_idx)),
+                )
+
+        self.computed = []
+        for position, name, expression in self.expressions:
+            generators: dict[int, Any] = {}
+
+            def generator_for(site: int, position: int = position, cache: dict[int, Any] = generators) -> Any:
+                if site not in cache:
+                    cache[site] = column_generator(seed, position, 2 + site, block)
+                return cache[site]
+
+            scope = expression_scope(column_random(seed, position, 0, block))
+            self.computed.append((name, expression, generator_for, scope))
+
+    def base_rows(self, start: int, count: int) -> list[dict[str, Any]]:
+        names: list[str] = []
+        values: list[list[Any]] = []
+        for column, kernel, retry in self.base:
+            column_values = kernel(start, count)
+            if column.get("constraints"):
+                self._enforce_constraints(column, column_values, start, retry)
+            names.append(column["name"])
+            values.append(column_values)
+        if not values:
+            return [{} for _ in range(count)]
+        return [dict(zip(names, row_values)) for row_values in zip(*values)]
+
+    def _enforce_constraints(
+        self,
+        column: dict[str, Any],
+        values: list[Any],
+        start: int,
+        retry: Callable[[int], Any],
+    ) -> None:
+        seen = self.unique_trackers.get(column["name"])
+        for offset, value in enumerate(values):
+            attempts = 1
+            while not validate_value(value, column, seen):
+                if attempts == 20:
+                    raise ValueError(f"Could not satisfy constraints for {self.table_name}.{column['name']}")
+                value = retry(start + offset)
+                attempts += 1
+            if seen is not None:
+                seen.add(value)
+            values[offset] = value
+
+    def apply_computed(self, rows: list[dict[str, Any]]) -> None:
+        for name, expression, generator_for, scope in self.computed:
+            if expression.vectorizable:
+                inputs = {col: [row[col] for row in rows] for col in expression.names}
+                for row, value in zip(rows, expression.evaluate_batch(inputs, len(rows), generator_for)):
+                    row[name] = value
+            else:
+                for row in rows:
+                    row[name] = expression.evaluate(row, scope)
+
+
+class _TableRows:
+    """Produces one table's rows block by block.
+
+    Whole-table state (per-parent child-count weights, duplicate sources) is drawn up
+    front from a table RNG; everything else is drawn from a fresh RNG per block of
+    ``RNG_BLOCK_ROWS`` rows, so any block can be generated without the ones before it.
+    Unique columns are unique by construction where possible (see ``uniqueness``);
+    the remaining ones are tracked across the whole table in a ``UniqueTracker``
+    (bounded memory), so their blocks must be generated in order.
+    """
+
+    def __init__(
+        self,
+        table_name: str,
+        table_spec: dict[str, Any],
+        row_count: int,
+        seed: int,
+        context: dict[str, dict[str, list[Any]]],
+        relationships: list[dict[str, Any]],
+        backend: str,
+    ) -> None:
+        self.table_name = table_name
+        self.row_count = row_count
+        self.seed = seed
+        columns = table_spec.get("columns", [])
+        self.expressions = _compile_computed(table_name, columns, relationships)
+        self.unique = unique_generators(table_name, columns, seed, row_count)
+        self.unique_trackers = _unique_trackers(columns, self.unique, row_count)
+        locale = table_spec.get("locale", DEFAULT_LOCALE)
+        vocabulary_seed = int(table_spec.get("vocabulary_seed", 0))
+        self.columnar = (
+            _ColumnarTable(
+                table_name, columns, seed, self.expressions, self.unique, self.unique_trackers, locale, vocabulary_seed
+            )
+            if backend == "numpy"
+            else None
+        )
+        self.fake = None
+        if self.columnar is None and _uses_vocabulary(columns):
+            self.fake = _make_faker(seed, locale, vocabulary_seed)
+        self.rng = random.Random(seed)
+        self.scope = expression_scope(self.rng)
+        self.base_columns = [col for col in columns if not col.get("computed")]
+        self.monotonic_cols = [
+            col["name"] for col in columns if col.get("constraints", {}).get("monotonic_increasing")
+        ]
+        self.last_values: dict[str, Any] = {}
+
+        table_rng = derive_rng(seed, "table")
+        self.foreign_keys: list[ForeignKeySampler] = []
+        for rel in relationships:
+            if rel["child_table"] != table_name:
+                continue
+            if rel["parent_table"] not in context:
+                raise ValueError(f"Parent table {rel['parent_table']} must be generated before {table_name}")
+            self.foreign_keys.append(ForeignKeySampler(rel, context[rel["parent_table"]], row_count, table_rng))
+        self.fk_streams: list[Any] = []
+
+        self.plan = CorruptionPlan.from_spec(table_spec)
+        self.cell_edits = CellEdits()
+        self.duplicates: dict[int, list[int]] = {}
+        for row_idx in draw_duplicate_sources(row_count, self.plan, table_rng):
+            self.duplicates.setdefault(row_idx // RNG_BLOCK_ROWS, []).append(row_idx)
+
+    @property
+    def block_count(self) -> int:
+        return -(-self.row_count // RNG_BLOCK_ROWS)
+
+    def block_batches(self, block: int, chunk_size: int) -> Iterator[list[dict[str, Any]]]:
+        """Yield block ``block`` in batches, followed by the duplicates drawn from it.
+
+        Corrupted cells are drawn for the whole block up front, so the output does not
+        depend on ``chunk_size``. Duplicates are the source row objects, not copies.
+        """
+
+        self.rng = block_rng(self.seed, "rows", block=block)
+        if self.columnar is not None:
+            self.columnar.start_block(block)
+            np = require_numpy()
+            self.fk_streams = [
+                np.random.default_rng(derive_seed(self.seed, "fk", sampler.child_key, block))
+                for sampler in self.foreign_keys
+            ]
+        else:
+            self.scope = expression_scope(self.rng)
+            if self.fake is not None:
+                self.fake.rng = self.rng
+            self.fk_streams = [
+                block_rng(self.seed, "fk", sampler.child_key, block=block) for sampler in self.foreign_keys
+            ]
+
+        block_start = block * RNG_BLOCK_ROWS
+        block_end = min(block_start + RNG_BLOCK_ROWS, self.row_count)
+        if self.plan.affects_rows:
+            corruption_rng = block_rng(self.seed, "corruption", block=block)
+            self.cell_edits = draw_cell_edits(self.plan, block_start, block_end, corruption_rng)
+        sources = self.duplicates.get(block, [])
+        pending = set(sources)
+        captured: dict[int, dict[str, Any]] = {}
+        for chunk_start in range(block_start, block_end, chunk_size):
+            batch = self._rows(chunk_start, min(chunk_start + chunk_size, block_end))
+            if pending:
+                for row_idx, row in enumerate(batch, chunk_start):
+                    if row_idx in pending:
+                        captured[row_idx] = row
+            yield batch
+
+        for dup_start in range(0, len(sources), chunk_size):
+            yield [captured[idx] for idx in sources[dup_start : dup_start + chunk_size]]
+
+    def _rows(self, start: int, end: int) -> list[dict[str, Any]]:
+        if self.columnar is None:
+            batch = []
+            for row_idx in range(start, end):
+                row = self._python_row(row_idx)
+                self._check_monotonic([row])
+                batch.append(row)
+            self.cell_edits.apply(batch, start)
+            return batch
+
+        batch = self.columnar.base_rows(start, end - start)
+        for sampler, stream in zip(self.foreign_keys, self.fk_streams):
+            for row, parent_idx in zip(batch, sampler.indices(stream.random(end - start)).tolist()):
+                sampler.assign(row, parent_idx)
+        self.columnar.apply_computed(batch)
+        self._check_monotonic(batch)
+        self.cell_edits.apply(batch, start)
+        return batch
+
+    def _python_row(self, row_idx: int) -> dict[str, Any]:
+        rng, fake = self.rng, self.fake
+        row: dict[str, Any] = {}
+        for column in self.base_columns:
             name = column["name"]
             if name in row:
                 continue
 
+            unique = self.unique.get(name)
+            seen = self.unique_trackers.get(name)
             for _ in range(20):
                 value = _generate_value(column, row_idx, rng, fake)
-                seen = unique_trackers.get(name)
+                if unique is not None:
+                    value = unique.value(row_idx, value)
                 if validate_value(value, column, seen):
                     if seen is not None:
                         seen.add(value)
                     row[name] = value
                     break
             else:
-                raise ValueError(f"Could not satisfy constraints for {table_name}.{name}")
+                raise ValueError(f"Could not satisfy constraints for {self.table_name}.{name}")
+
+        for sampler, stream in zip(self.foreign_keys, self.fk_streams):
+            sampler.assign(row, sampler.index(stream.random()))
+        for name, expression in self.expressions.items():
+            row[name] = expression.evaluate(row, self.scope)
+        return row
+
+    def _check_monotonic(self, rows: list[dict[str, Any]]) -> None:
+        for col in self.monotonic_cols:
+            values = [row[col] for row in rows]
+            if col in self.last_values:
+                values.insert(0, self.last_values[col])
+            if not validate_monotonic(values):
+                raise ValueError(f"Column {self.table_name}.{col} is not monotonic increasing")
+            if rows:
+                self.last_values[col] = rows[-1][col]
+
+
+def iter_table_batches(
+    table_name: str,
+    table_spec: dict[str, Any],
+    row_count: int,
+    seed: int,
+    context: dict[str, dict[str, list[Any]]],
+    relationships: list[dict[str, Any]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    backend: str = "python",
+    row_range: tuple[int, int] | None = None,
+) -> Iterator[list[dict[str, Any]]]:
+    """Yield a table's rows in batches of at most ``chunk_size`` rows.
+
+    ``context`` holds the key/lookup columns of already generated parent tables; the
+    columns this table exposes to its own children are registered in it once the last
+    batch has been produced. Rows are drawn from one RNG per block of
+    ``RNG_BLOCK_ROWS`` rows (per-column NumPy streams for the ``numpy`` backend, see
+    ``vectorized``) and duplicates follow the block they were copied from, so output
+    never depends on ``chunk_size``.
+
+    ``row_range`` restricts the output to the block-aligned rows ``[start, end)`` (see
+    ``sharding.shard_range``) plus their duplicates. Tables with children still
+    generate every row, since children draw keys from the whole parent. Tables with
+    set-tracked unique columns (see ``uniqueness.needs_tracking``) cannot be restricted.
+    """
+
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be >= 1")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}; expected one of {', '.join(BACKENDS)}")
+    start, end = row_range if row_range is not None else (0, row_count)
+    if not 0 <= start <= end <= row_count or start % RNG_BLOCK_ROWS or (end % RNG_BLOCK_ROWS and end != row_count):
+        raise ValueError(f"Row range [{start}, {end}) is not aligned to {RNG_BLOCK_ROWS}-row blocks of {row_count} rows")
+
+    table = _TableRows(table_name, table_spec, row_count, seed, context, relationships, backend)
+    if (start, end) != (0, row_count) and table.unique_trackers:
+        tracked = ", ".join(f"{table_name}.{name}" for name in table.unique_trackers)
+        raise SchemaError(
+            f"Unique column(s) {tracked} are checked against every earlier row and cannot be sharded; "
+            "generate without --shard/--shards or use a type that is unique by construction"
+        )
+    first_block, last_block = start // RNG_BLOCK_ROWS, -(-end // RNG_BLOCK_ROWS)
+    retained = {col: CompactColumnBuilder() for col in _retained_columns(table_name, relationships)}
+    blocks = range(table.block_count) if retained else range(first_block, last_block)
+
+    for block in blocks:
+        emit = first_block <= block < last_block
+        for batch in table.block_batches(block, chunk_size):
+            for col, builder in retained.items():
+                builder.extend([row.get(col) for row in batch])
+            if emit:
+                yield batch
+    context[table_name] = {col: builder.values for col, builder in retained.items()}
 
-        rows.append(row)
 
-    for relationship in relationships:
-        if relationship["child_table"] == table_name:
-            assign_foreign_keys(rows, relationship, context[relationship["parent_table"]], rng)
+def _generate_table(
+    table_name: str,
+    table_spec: dict[str, Any],
+    row_count: int,
+    seed: int,
+    context: dict[str, dict[str, list[Any]]],
+    relationships: list[dict[str, Any]],
+    backend: str = "python",
+) -> list[dict[str, Any]]:
+    rows: list[dict[str, Any]] = []
+    for batch in iter_table_batches(table_name, table_spec, row_count, seed, context, relationships, backend=backend):
+        rows.extend(batch)
+    return rows
 
-    for row in rows:
-        for column in table_spec.get("columns", []):
-            if column.get("computed"):
-                row[column["name"]] = _evaluate_expression(column["computed"], row, rng)
 
-    monotonic_cols = [
-        col["name"] for col in table_spec.get("columns", []) if col.get("constraints", {}).get("monotonic_increasing")
-    ]
-    for col in monotonic_cols:
-        if not validate_monotonic([row[col] for row in rows]):
-            raise ValueError(f"Column {table_name}.{col} is not monotonic increasing")
+@dataclass(frozen=True)
+class TablePlan:
+    """Row count, seed and parents resolved for one table of a generation run."""
 
-    return apply_corruption(rows, table_spec, rng)
+    name: str
+    spec: dict[str, Any]
+    rows: int
+    seed: int
+    parents: tuple[str, ...]
 
+    @property
+    def columns(self) -> list[str]:
+        return [col["name"] for col in self.spec.get("columns", [])]
 
-def generate_dataset(
+
+def plan_tables(
     schema: SchemaConfig,
     rows_override: int | None = None,
     seed_override: int | None = None,
-) -> tuple[dict[str, list[dict[str, Any]]], dict[str, list[str]], int]:
-    """Generate all tables according to schema."""
+) -> tuple[list[TablePlan], int]:
+    """Resolve every table in generation order; table seeds derive from the table name."""
 
     raw = schema.raw
     seed = int(seed_override if seed_override is not None else raw.get("seed", 0))
 
     tables: dict[str, Any] = raw["tables"]
     relationships = raw.get("relationships", [])
-    order = get_generation_order(tables, relationships)
-
-    generated: dict[str, list[dict[str, Any]]] = {}
+    plans: list[TablePlan] = []
+    for table_name in get_generation_order(tables, relationships):
+        spec = tables[table_name]
+        defaults = {key: raw[key] for key in ("locale", "vocabulary_seed") if key in raw and key not in spec}
+        if defaults:
+            spec = {**spec, **defaults}
+        parents = tuple(dict.fromkeys(rel["parent_table"] for rel in relationships if rel["child_table"] == table_name))
+        plans.append(
+            TablePlan(
+                name=table_name,
+                spec=spec,
+                rows=int(rows_override if rows_override is not None else spec.get("rows", 100)),
+                seed=derive_seed(seed, table_name),
+                parents=parents,
+            )
+        )
+    return plans, seed
+
+
+def stream_dataset(
+    schema: SchemaConfig,
+    rows_override: int | None = None,
+    seed_override: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    backend: str = "python",
+) -> tuple[dict[str, Iterator[dict[str, Any]]], dict[str, list[str]], int]:
+    """Lazily generate all tables according to schema.
+
+    Returns one row iterator per table in generation order. Iterators must be consumed
+    in that order (as ``write_tables`` does) because child tables draw their foreign
+    keys from parents that have already been produced. Output is identical to
+    ``generate_dataset`` for the same seed while only ``chunk_size`` rows per table
+    (plus parent key columns) are held in memory.
+    Duplicate rows are yielded as the same dict object as the row they duplicate.
+    """
+
+    plans, seed = plan_tables(schema, rows_override, seed_override)
+    relationships = schema.raw.get("relationships", [])
+
+    context: dict[str, dict[str, list[Any]]] = {}
+    streams: dict[str, Iterator[dict[str, Any]]] = {}
     column_order: dict[str, list[str]] = {}
 
-    for idx, table_name in enumerate(order):
-        spec = tables[table_name]
-        count = int(rows_override if rows_override is not None else spec.get("rows", 100))
-        table_seed = seed + idx * 10_000
-        generated[table_name] = _generate_table(table_name, spec, count, table_seed, generated, relationships)
-        column_order[table_name] = [col["name"] for col in spec.get("columns", [])]
+    for plan in plans:
+        batches = iter_table_batches(
+            plan.name, plan.spec, plan.rows, plan.seed, context, relationships, chunk_size=chunk_size, backend=backend
+        )
+        streams[plan.name] = chain.from_iterable(batches)
+        column_order[plan.name] = plan.columns
+
+    return streams, column_order, seed
+
+
+def generate_dataset(
+    schema: SchemaConfig,
+    rows_override: int | None = None,
+    seed_override: int | None = None,
+    backend: str = "python",
+) -> tuple[dict[str, list[dict[str, Any]]], dict[str, list[str]], int]:
+    """Generate all tables according to schema.
+
+    ``backend`` selects the value engine: ``python`` (row-wise ``random.Random``) or
+    ``numpy`` (columnar kernels with per-column seeding, see ``vectorized``).
+    """
 
+    streams, column_order, seed = stream_dataset(schema, rows_override, seed_override, backend=backend)
+    generated = {table_name: list(rows) for table_name, rows in streams.items()}
     return generated, column_order, seed
@@ -2,62 +2,158 @@
 
 from __future__ import annotations
 
+import math
 import random
-from copy import deepcopy
+from bisect import bisect_left
+from dataclasses import dataclass, field
 from typing import Any
 
 
+@dataclass(frozen=True)
+class CorruptionPlan:
+    """Per-table corruption settings resolved once from the table spec."""
+
+    missing_rate: float
+    missing_columns: tuple[str, ...]
+    missing_by_column: tuple[tuple[str, float], ...]
+    outlier_rate: float
+    numeric_columns: tuple[str, ...]
+    type_noise: tuple[tuple[str, float, Any], ...]
+    duplicate_rate: float
+
+    @classmethod
+    def from_spec(cls, table_spec: dict[str, Any]) -> "CorruptionPlan":
+        corruption = table_spec.get("corruption", {})
+        columns = table_spec.get("columns", [])
+        return cls(
+            missing_rate=float(corruption.get("missing_rate", 0.0)),
+            missing_columns=tuple(
+                c["name"] for c in columns if not c.get("constraints", {}).get("primary_key")
+            ),
+            missing_by_column=tuple(
+                (name, float(rate)) for name, rate in corruption.get("missing_by_column", {}).items()
+            ),
+            outlier_rate=float(corruption.get("outlier_rate", 0.0)),
+            numeric_columns=tuple(c["name"] for c in columns if c.get("type") in {"integer", "float"}),
+            type_noise=tuple(
+                (name, float(spec.get("rate", 0.0)), spec.get("value", "N/A"))
+                for name, spec in corruption.get("type_noise", {}).items()
+            ),
+            duplicate_rate=float(corruption.get("duplicate_rate", 0.0)),
+        )
+
+    @property
+    def affects_rows(self) -> bool:
+        return bool(
+            self.missing_rate > 0 or self.missing_by_column or self.outlier_rate > 0 or self.type_noise
+        )
+
+
+def draw_duplicate_sources(row_count: int, plan: CorruptionPlan, rng: random.Random) -> list[int]:
+    """Pick the row indices that are re-emitted as duplicates of earlier rows.
+
+    Duplicates are kept as these index references; the emitted duplicate is the source
+    row object itself, not a copy.
+    """
+
+    if plan.duplicate_rate <= 0 or row_count <= 0:
+        return []
+    return [rng.randrange(row_count) for _ in range(int(row_count * plan.duplicate_rate))]
+
+
+def skip_positions(rate: float, start: int, stop: int, rng: random.Random) -> list[int]:
+    """Indices in ``[start, stop)`` each selected independently with probability ``rate``.
+
+    Gaps between selected indices are drawn from the geometric distribution, so the cost
+    is proportional to the number of hits rather than to ``stop - start``.
+    """
+
+    if rate <= 0 or start >= stop:
+        return []
+    if rate >= 1:
+        return list(range(start, stop))
+    log_keep = math.log1p(-rate)
+    positions: list[int] = []
+    idx = start - 1
+    while True:
+        idx += 1 + int(math.log(1.0 - rng.random()) / log_keep)
+        if idx >= stop:
+            return positions
+        positions.append(idx)
+
+
+@dataclass
+class CellEdits:
+    """Corruption pre-drawn for a row range: only the affected cells, sorted by row.
+
+    Each edit is ``(column, value, scale)``: ``scale`` edits multiply a numeric cell by
+    ``value`` (outliers), the others overwrite the cell with ``value``.
+    """
+
+    rows: list[int] = field(default_factory=list)
+    edits: list[tuple[str, Any, bool]] = field(default_factory=list)
+
+    def apply(self, batch: list[dict[str, Any]], start: int) -> None:
+        """Edit the rows of ``batch`` (whose first row is row ``start``) in place."""
+
+        rows, edits = self.rows, self.edits
+        lo = bisect_left(rows, start)
+        hi = bisect_left(rows, start + len(batch), lo)
+        for idx in range(lo, hi):
+            row = batch[rows[idx] - start]
+            name, value, scale = edits[idx]
+            if not scale:
+                row[name] = value
+            elif isinstance(row.get(name), (int, float)):
+                row[name] = row[name] * value
+
+
+def draw_cell_edits(plan: CorruptionPlan, start: int, stop: int, rng: random.Random) -> CellEdits:
+    """Draw the missing values, outliers and type noise of rows ``[start, stop)``.
+
+    Every column mask is sampled with ``skip_positions``. Edits of the same row keep
+    the order missing, per-column missing, outlier, type noise, so later kinds win.
+    """
+
+    hits: list[tuple[int, int, str, Any, bool]] = []
+    order = 0
+
+    def add(rate: float, name: str | None, value: Any) -> None:
+        nonlocal order
+        for row_idx in skip_positions(rate, start, stop, rng):
+            if name is None:
+                hits.append((row_idx, order, rng.choice(plan.numeric_columns), rng.uniform(4.0, 10.0), True))
+            else:
+                hits.append((row_idx, order, name, value, False))
+        order += 1
+
+    if plan.missing_rate > 0:
+        for name in plan.missing_columns:
+            add(plan.missing_rate, name, "")
+    for name, rate in plan.missing_by_column:
+        add(rate, name, "")
+    if plan.numeric_columns:
+        add(plan.outlier_rate, None, None)
+    for name, rate, token in plan.type_noise:
+        add(rate, name, token)
+
+    hits.sort(key=lambda hit: (hit[0], hit[1]))
+    return CellEdits([hit[0] for hit in hits], [hit[2:] for hit in hits])
+
+
 def apply_corruption(
     rows: list[dict[str, Any]],
     table_spec: dict[str, Any],
     rng: random.Random,
 ) -> list[dict[str, Any]]:
-    """Apply reproducible corruption toggles to table rows."""
-
-    result = [deepcopy(r) for r in rows]
-    corruption = table_spec.get("corruption", {})
-
-    missing_rate = float(corruption.get("missing_rate", 0.0))
-    if missing_rate > 0:
-        for row in result:
-            for column in table_spec.get("columns", []):
-                if column.get("constraints", {}).get("primary_key"):
-                    continue
-                if rng.random() < missing_rate:
-                    row[column["name"]] = ""
-
-    per_column = corruption.get("missing_by_column", {})
-    for col_name, rate in per_column.items():
-        for row in result:
-            if rng.random() < float(rate):
-                row[col_name] = ""
-
-    outlier_rate = float(corruption.get("outlier_rate", 0.0))
-    if outlier_rate > 0:
-        numeric_cols = [
-            c["name"]
-            for c in table_spec.get("columns", [])
-            if c.get("type") in {"integer", "float"}
-        ]
-        for row in result:
-            if rng.random() < outlier_rate and numeric_cols:
-                col = rng.choice(numeric_cols)
-                value = row.get(col)
-                if isinstance(value, (int, float)):
-                    row[col] = value * rng.uniform(4.0, 10.0)
-
-    type_noise = corruption.get("type_noise", {})
-    for col_name, spec in type_noise.items():
-        rate = float(spec.get("rate", 0.0))
-        token = spec.get("value", "N/A")
-        for row in result:
-            if rng.random() < rate:
-                row[col_name] = token
-
-    duplicate_rate = float(corruption.get("duplicate_rate", 0.0))
-    if duplicate_rate > 0 and result:
-        duplicate_count = int(len(result) * duplicate_rate)
-        for _ in range(duplicate_count):
-            result.append(deepcopy(rng.choice(result)))
-
-    return result
+    """Apply reproducible corruption toggles to table rows.
+
+    Rows are corrupted in place and duplicates are appended as references to their
+    source rows; only the returned list is new.
+    """
+
+    plan = CorruptionPlan.from_spec(table_spec)
+    duplicates = draw_duplicate_sources(len(rows), plan, rng)
+    if plan.affects_rows:
+        draw_cell_edits(plan, 0, len(rows), rng).apply(rows, 0)
+    return [*rows, *(rows[idx] for idx in duplicates)]
@@ -1,4 +1,9 @@
-"""Distribution helpers used by schema-driven value generation."""
+"""Distribution helpers used by schema-driven value generation.
+
+Helpers only use the ``random.Random`` API, so they accept a counter-based
+``shared.io.rng.CounterRNG`` positioned at a row (``rng.at(row_idx)``) to reproduce a
+single value without replaying the rows before it.
+"""
 
 from __future__ import annotations
 
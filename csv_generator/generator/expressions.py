@@ -0,0 +1,257 @@
+"""Compilation and evaluation of ``computed`` column expressions.
+
+Expressions are parsed and checked once per table. Row evaluation reuses the compiled
+code object with a scope built once per RNG; expressions restricted to arithmetic,
+comparisons, conditionals and the whitelisted functions can also be evaluated over a
+whole batch of rows with NumPy (``evaluate_batch``).
+"""
+
+from __future__ import annotations
+
+import ast
+import random
+from dataclasses import dataclass
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Any, Callable, Iterable
+
+SAFE_BUILTINS = {"round": round, "min": min, "max": max, "float": float, "int": int}
+RNG_FUNCTIONS = ("normal", "rand_days_after")
+
+_VECTOR_NODES = (
+    ast.Expression,
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.BoolOp,
+    ast.Compare,
+    ast.IfExp,
+    ast.Call,
+    ast.Name,
+    ast.Constant,
+    ast.Load,
+    ast.operator,
+    ast.unaryop,
+    ast.boolop,
+    ast.cmpop,
+)
+_VECTOR_CMPOPS = (ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE)
+_VECTOR_UNARYOPS = (ast.USub, ast.UAdd, ast.Not)
+_VECTOR_BINOPS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow)
+
+
+@lru_cache(maxsize=8192)
+def _parse_date(value: str) -> date:
+    return date.fromisoformat(value)
+
+
+def expression_scope(rng: random.Random) -> dict[str, Any]:
+    """Build the evaluation globals (whitelisted builtins and RNG helpers) for ``rng``."""
+
+    gauss = rng.gauss
+    randint = rng.randint
+
+    def normal(mean: float, std: float) -> float:
+        return gauss(mean, std)
+
+    def rand_days_after(start_iso: str, min_days: int, max_days: int) -> str:
+        return (_parse_date(str(start_iso)) + timedelta(days=randint(min_days, max_days))).isoformat()
+
+    return {"__builtins__": SAFE_BUILTINS, "normal": normal, "rand_days_after": rand_days_after}
+
+
+@dataclass(frozen=True)
+class CompiledExpression:
+    """A validated ``computed`` expression, compiled once and reused for every row."""
+
+    source: str
+    code: Any
+    tree: ast.Expression
+    names: frozenset[str]
+    vectorizable: bool
+
+    def evaluate(self, row: dict[str, Any], scope: dict[str, Any]) -> Any:
+        return eval(self.code, scope, row)
+
+    def evaluate_batch(
+        self,
+        columns: dict[str, list[Any]],
+        count: int,
+        generator_for: Callable[[int], Any],
+    ) -> list[Any]:
+        """Evaluate over ``count`` rows given as column lists.
+
+        Each ``normal``/``rand_days_after`` call site draws from its own NumPy generator
+        (``generator_for(site_index)``, which must return the same generator for a site
+        on every call) and only for the rows that reach it, so results do not depend on
+        how rows are split into batches.
+        """
+
+        if not self.vectorizable:
+            raise ValueError(f"Expression cannot be vectorized: {self.source}")
+        import numpy as np
+
+        evaluator = _BatchEvaluator(np, self.tree, generator_for)
+        env = {name: np.asarray(columns[name]) for name in self.names if name in columns}
+        result = evaluator.eval(self.tree.body, env, np.arange(count))
+        if np.ndim(result) == 0:
+            value = result.item() if hasattr(result, "item") else result
+            return [value] * count
+        return result.tolist()
+
+
+def compile_expression(source: str, known_names: Iterable[str]) -> CompiledExpression:
+    """Parse and validate ``source``; raise ``ValueError`` on syntax or name errors."""
+
+    try:
+        tree = ast.parse(str(source).strip(), mode="eval")
+    except SyntaxError as exc:
+        raise ValueError(f"invalid syntax in expression {source!r}: {exc.msg}") from exc
+
+    functions = set(SAFE_BUILTINS) | set(RNG_FUNCTIONS)
+    allowed = set(known_names) | functions
+    names: set[str] = set()
+    vectorizable = True
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Attribute) and node.attr.startswith("__"):
+            raise ValueError(f"attribute {node.attr!r} is not allowed in expression {source!r}")
+        if isinstance(node, ast.Name):
+            if node.id not in allowed:
+                raise ValueError(f"unknown name {node.id!r} in expression {source!r}")
+            if node.id not in functions:
+                names.add(node.id)
+        if not isinstance(node, _VECTOR_NODES):
+            vectorizable = False
+        elif isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in functions or node.keywords:
+                vectorizable = False
+        elif isinstance(node, ast.Name) and node.id in functions:
+            vectorizable = vectorizable and _is_call_target(tree, node)
+        elif isinstance(node, ast.cmpop) and not isinstance(node, _VECTOR_CMPOPS):
+            vectorizable = False
+        elif isinstance(node, ast.unaryop) and not isinstance(node, _VECTOR_UNARYOPS):
+            vectorizable = False
+        elif isinstance(node, ast.operator) and not isinstance(node, _VECTOR_BINOPS):
+            vectorizable = False
+
+    code = compile(tree, f"<computed: {source}>", "eval")
+    return CompiledExpression(
+        source=str(source), code=code, tree=tree, names=frozenset(names), vectorizable=vectorizable
+    )
+
+
+def _is_call_target(tree: ast.AST, name: ast.Name) -> bool:
+    return any(isinstance(node, ast.Call) and node.func is name for node in ast.walk(tree))
+
+
+class _BatchEvaluator:
+    """Evaluate a validated expression tree over index subsets of column arrays."""
+
+    def __init__(self, np: Any, tree: ast.Expression, generator_for: Callable[[int], Any]) -> None:
+        self.np = np
+        self.generator_for = generator_for
+        self.sites: dict[int, int] = {}
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Call) and node.func.id in RNG_FUNCTIONS:
+                self.sites[id(node)] = len(self.sites)
+
+    def _generator(self, node: ast.Call) -> Any:
+        return self.generator_for(self.sites[id(node)])
+
+    def eval(self, node: ast.AST, env: dict[str, Any], rows: Any) -> Any:
+        np = self.np
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, ast.Name):
+            return env[node.id][rows]
+        if isinstance(node, ast.UnaryOp):
+            operand = self.eval(node.operand, env, rows)
+            if isinstance(node.op, ast.Not):
+                return np.logical_not(operand)
+            return -operand if isinstance(node.op, ast.USub) else +operand
+        if isinstance(node, ast.BinOp):
+            left = self.eval(node.left, env, rows)
+            right = self.eval(node.right, env, rows)
+            return _BINOPS[type(node.op)](left, right)
+        if isinstance(node, ast.BoolOp):
+            combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+            result = self.eval(node.values[0], env, rows)
+            for value in node.values[1:]:
+                result = combine(result, self.eval(value, env, rows))
+            return result
+        if isinstance(node, ast.Compare):
+            left = self.eval(node.left, env, rows)
+            result = None
+            for op, comparator in zip(node.ops, node.comparators):
+                right = self.eval(comparator, env, rows)
+                outcome = _CMPOPS[type(op)](left, right)
+                result = outcome if result is None else np.logical_and(result, outcome)
+                left = right
+            return result
+        if isinstance(node, ast.IfExp):
+            return self._if_exp(node, env, rows)
+        if isinstance(node, ast.Call):
+            return self._call(node, env, rows)
+        raise ValueError(f"Unsupported expression node {type(node).__name__}")
+
+    def _if_exp(self, node: ast.IfExp, env: dict[str, Any], rows: Any) -> Any:
+        np = self.np
+        test = np.broadcast_to(np.asarray(self.eval(node.test, env, rows), dtype=bool), rows.shape)
+        body = np.broadcast_to(self.eval(node.body, env, rows[test]), (int(test.sum()),))
+        orelse = np.broadcast_to(self.eval(node.orelse, env, rows[~test]), (int((~test).sum()),))
+        if body.dtype == orelse.dtype and body.dtype.kind in "biufU":
+            result = np.empty(rows.shape, dtype=body.dtype)
+        else:
+            result = np.empty(rows.shape, dtype=object)
+        result[test] = body
+        result[~test] = orelse
+        return result
+
+    def _call(self, node: ast.Call, env: dict[str, Any], rows: Any) -> Any:
+        np = self.np
+        name = node.func.id
+        args = [self.eval(arg, env, rows) for arg in node.args]
+        if name == "normal":
+            mean, std = args
+            return mean + std * self._generator(node).standard_normal(len(rows))
+        if name == "rand_days_after":
+            start, min_days, max_days = args
+            base = np.broadcast_to(np.asarray(start, dtype="datetime64[D]"), rows.shape)
+            if np.isnat(base).any():
+                raise ValueError("rand_days_after received an empty or invalid start date")
+            span = int(max_days) - int(min_days) + 1
+            offsets = np.floor(self._generator(node).random(len(rows)) * span).astype(np.int64) + int(min_days)
+            return np.datetime_as_string(base + offsets, unit="D")
+        if name == "round":
+            if len(args) == 1:
+                return np.rint(args[0]).astype(np.int64)
+            return np.round(args[0], int(args[1]))
+        if name in {"min", "max"}:
+            reduce = np.minimum if name == "min" else np.maximum
+            result = args[0]
+            for arg in args[1:]:
+                result = reduce(result, arg)
+            return result
+        if name == "float":
+            return np.asarray(args[0], dtype=np.float64)
+        if name == "int":
+            return np.trunc(np.asarray(args[0], dtype=np.float64)).astype(np.int64)
+        raise ValueError(f"Unsupported function {name!r}")
+
+
+_BINOPS: dict[type, Callable[[Any, Any], Any]] = {
+    ast.Add: lambda a, b: a + b,
+    ast.Sub: lambda a, b: a - b,
+    ast.Mult: lambda a, b: a * b,
+    ast.Div: lambda a, b: a / b,
+    ast.FloorDiv: lambda a, b: a // b,
+    ast.Mod: lambda a, b: a % b,
+    ast.Pow: lambda a, b: a**b,
+}
+_CMPOPS: dict[type, Callable[[Any, Any], Any]] = {
+    ast.Eq: lambda a, b: a == b,
+    ast.NotEq: lambda a, b: a != b,
+    ast.Lt: lambda a, b: a < b,
+    ast.LtE: lambda a, b: a <= b,
+    ast.Gt: lambda a, b: a > b,
+    ast.GtE: lambda a, b: a >= b,
+}
@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 import random
-from typing import Any
+from array import array
+from bisect import bisect_right
+from typing import Any, Sequence
 
 
 def get_generation_order(tables: dict[str, Any], relationships: list[dict[str, Any]]) -> list[str]:
@@ -29,6 +31,95 @@ def get_generation_order(tables: dict[str, Any], relationships: list[dict[str, A
     return ordered
 
 
+def compact_column(values: Sequence[Any]) -> Sequence[Any]:
+    """Pack an all-integer column into ``array('q')``; keep other columns as lists."""
+
+    if isinstance(values, array) and values.typecode == "q":
+        return values
+    if all(type(value) is int for value in values):
+        try:
+            return array("q", values)
+        except OverflowError:
+            pass
+    return list(values)
+
+
+class CompactColumnBuilder:
+    """Accumulates a column as ``array('q')`` while every value is an int, else a list."""
+
+    def __init__(self) -> None:
+        self.values: array[int] | list[Any] = array("q")
+
+    def extend(self, values: list[Any]) -> None:
+        if isinstance(self.values, array):
+            if all(type(value) is int for value in values):
+                try:
+                    self.values.extend(values)
+                    return
+                except OverflowError:
+                    pass
+            self.values = list(self.values)
+        self.values.extend(values)
+
+
+class ForeignKeySampler:
+    """Streams parent rows for child rows without materializing a key pool.
+
+    Every parent gets a child-count weight ``randint(min_children, max_children)``
+    (uniform weights if all are zero), stored as a cumulative ``array('q')``. A child
+    row maps a uniform draw ``u`` to the parent whose cumulative range contains
+    ``u * total`` (binary search), so children are distributed proportionally to the
+    sampled counts, any row can be assigned on its own, and memory is one integer per
+    parent plus the parent key and lookup columns, read by position.
+    """
+
+    def __init__(
+        self,
+        relationship: dict[str, Any],
+        parent_columns: dict[str, Sequence[Any]],
+        child_count: int,
+        rng: random.Random,
+    ) -> None:
+        self.child_key = relationship["child_key"]
+        lookup_cols: dict[str, str] = relationship.get("lookup_columns", {})
+        self.keys = parent_columns[relationship["parent_key"]]
+        self.lookups = [(target, parent_columns[col]) for col, target in lookup_cols.items()]
+
+        min_children = int(relationship.get("min_children", 0))
+        max_children = int(relationship.get("max_children", max(1, child_count)))
+        cumulative = array("q")
+        total = 0
+        randint = rng.randint
+        for _ in range(len(self.keys)):
+            total += randint(min_children, max_children)
+            cumulative.append(total)
+        if total == 0:
+            cumulative = array("q", range(1, len(self.keys) + 1))
+            total = len(self.keys)
+        if total == 0:
+            raise ValueError(f"Cannot assign {self.child_key}: parent table has no rows")
+        self.cumulative = cumulative
+        self.total = total
+
+    def index(self, uniform: float) -> int:
+        """Parent row index for one uniform draw in ``[0, 1)``."""
+
+        return bisect_right(self.cumulative, int(uniform * self.total))
+
+    def indices(self, uniforms: Any) -> Any:
+        """Vectorized ``index`` for a NumPy array of uniform draws."""
+
+        import numpy as np
+
+        cumulative = np.frombuffer(self.cumulative, dtype=np.int64)
+        return np.searchsorted(cumulative, (uniforms * self.total).astype(np.int64), side="right")
+
+    def assign(self, row: dict[str, Any], parent_idx: int) -> None:
+        row[self.child_key] = self.keys[parent_idx]
+        for target, column in self.lookups:
+            row[target] = column[parent_idx]
+
+
 def assign_foreign_keys(
     child_rows: list[dict[str, Any]],
     relationship: dict[str, Any],
@@ -37,29 +128,8 @@ def assign_foreign_keys(
 ) -> None:
     """Assign FK and optional lookup columns to child rows."""
 
-    parent_key = relationship["parent_key"]
-    child_key = relationship["child_key"]
-    min_children = int(relationship.get("min_children", 0))
-    max_children = int(relationship.get("max_children", max(1, len(child_rows))))
-
-    key_pool: list[Any] = []
-    for parent in parent_rows:
-        repeats = rng.randint(min_children, max_children)
-        key_pool.extend([parent[parent_key]] * repeats)
-
-    if not key_pool:
-        key_pool = [parent[parent_key] for parent in parent_rows]
-
-    while len(key_pool) < len(child_rows):
-        key_pool.append(rng.choice(key_pool))
-    rng.shuffle(key_pool)
-
-    parent_index = {row[parent_key]: row for row in parent_rows}
-    lookup_cols: dict[str, str] = relationship.get("lookup_columns", {})
-
-    for idx, row in enumerate(child_rows):
-        fk_value = key_pool[idx]
-        row[child_key] = fk_value
-        parent_row = parent_index[fk_value]
-        for parent_col, child_col in lookup_cols.items():
-            row[child_col] = parent_row[parent_col]
+    columns = [relationship["parent_key"], *relationship.get("lookup_columns", {})]
+    parent_columns = {col: [row[col] for row in parent_rows] for col in columns}
+    sampler = ForeignKeySampler(relationship, parent_columns, len(child_rows), rng)
+    for row in child_rows:
+        sampler.assign(row, sampler.index(rng.random()))
@@ -0,0 +1,122 @@
+"""Process-pool table scheduler driven by the foreign-key dependency graph."""
+
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import chain
+from pathlib import Path
+from typing import Any, Sequence
+
+from .cache import TableCache, table_keys
+from .config import SchemaConfig
+from .core import DEFAULT_CHUNK_SIZE, TablePlan, iter_table_batches, plan_tables
+from .relationships import compact_column
+from .writers import write_table
+
+
+def _parent_columns(plan: TablePlan, relationships: list[dict[str, Any]]) -> dict[str, list[str]]:
+    needed: dict[str, list[str]] = {}
+    for rel in relationships:
+        if rel["child_table"] != plan.name:
+            continue
+        columns = needed.setdefault(rel["parent_table"], [])
+        for col in [rel["parent_key"], *rel.get("lookup_columns", {})]:
+            if col not in columns:
+                columns.append(col)
+    return needed
+
+
+def _generate_table_file(
+    plan: TablePlan,
+    path: str,
+    parents: dict[str, dict[str, Sequence[Any]]],
+    relationships: list[dict[str, Any]],
+    chunk_size: int,
+    backend: str,
+) -> tuple[str, int, dict[str, Sequence[Any]]]:
+    """Generate one table straight to its CSV file; return its compacted key columns."""
+
+    context: dict[str, Any] = dict(parents)
+    batches = iter_table_batches(
+        plan.name, plan.spec, plan.rows, plan.seed, context, relationships, chunk_size=chunk_size, backend=backend
+    )
+    count = write_table(path, chain.from_iterable(batches), plan.columns)
+    retained = {col: compact_column(values) for col, values in context[plan.name].items()}
+    return plan.name, count, retained
+
+
+def generate_to_directory(
+    schema: SchemaConfig,
+    output_dir: str | Path,
+    *,
+    rows_override: int | None = None,
+    seed_override: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    backend: str = "python",
+    workers: int = 1,
+    cache: TableCache | None = None,
+) -> tuple[dict[str, int], int]:
+    """Generate every table to ``output_dir`` using up to ``workers`` processes.
+
+    Tables start as soon as all of their parents are written, and only the parent key
+    and lookup columns a child needs are shipped to it. Table seeds derive from the
+    table name, so files are identical for any worker count. Returns row counts
+    in generation order and the resolved seed.
+
+    With a ``cache``, tables whose key (see ``table_keys``) is cached are linked from it
+    instead of generated, so only changed tables and their descendants are regenerated;
+    generated tables are added to it.
+    """
+
+    if workers < 1:
+        raise ValueError("workers must be >= 1")
+
+    out = Path(output_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    plans, seed = plan_tables(schema, rows_override, seed_override)
+    relationships = schema.raw.get("relationships", [])
+    needed = {plan.name: _parent_columns(plan, relationships) for plan in plans}
+    context: dict[str, dict[str, Sequence[Any]]] = {}
+    counts: dict[str, int] = {}
+    keys = table_keys(plans, relationships, backend) if cache is not None else {}
+
+    def restored(plan: TablePlan) -> bool:
+        hit = cache.restore(plan.name, keys[plan.name], out / f"{plan.name}.csv") if cache is not None else None
+        if hit is not None:
+            counts[plan.name], context[plan.name] = hit
+        return hit is not None
+
+    def finished(name: str, count: int, retained: dict[str, Sequence[Any]]) -> None:
+        counts[name] = count
+        context[name] = retained
+        if cache is not None:
+            cache.store(name, keys[name], out / f"{name}.csv", count, retained)
+
+    def task_args(plan: TablePlan) -> tuple[Any, ...]:
+        parents = {
+            parent: {col: context[parent][col] for col in columns} for parent, columns in needed[plan.name].items()
+        }
+        return plan, str(out / f"{plan.name}.csv"), parents, relationships, chunk_size, backend
+
+    if workers == 1:
+        for plan in plans:
+            if not restored(plan):
+                finished(*_generate_table_file(*task_args(plan)))
+        return counts, seed
+
+    pending = list(plans)
+    running: dict[Future[tuple[str, int, dict[str, Sequence[Any]]]], str] = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while pending or running:
+            for plan in [p for p in pending if all(parent in context for parent in p.parents)]:
+                pending.remove(plan)
+                if not restored(plan):
+                    running[pool.submit(_generate_table_file, *task_args(plan))] = plan.name
+            if not running:
+                continue  # restored tables may have unblocked their children
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                del running[future]
+                finished(*future.result())
+
+    return {plan.name: counts[plan.name] for plan in plans}, seed
@@ -0,0 +1,136 @@
+"""Deterministic row-range sharding of a generation run."""
+
+from __future__ import annotations
+
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from pathlib import Path
+from typing import Any
+
+from .config import SchemaConfig
+from .core import DEFAULT_CHUNK_SIZE, RNG_BLOCK_ROWS, iter_table_batches, plan_tables
+from .writers import write_table
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    """Parse ``"i/N"`` into ``(i, N)`` with ``0 <= i < N``."""
+
+    try:
+        index_text, count_text = value.split("/")
+        shard, shards = int(index_text), int(count_text)
+    except ValueError as exc:
+        raise ValueError(f"Invalid shard {value!r}; expected i/N, e.g. 0/4") from exc
+    if shards < 1 or not 0 <= shard < shards:
+        raise ValueError(f"Invalid shard {value!r}; need 0 <= i < N")
+    return shard, shards
+
+
+def shard_range(row_count: int, shard: int, shards: int) -> tuple[int, int]:
+    """Return the rows ``[start, end)`` of ``shard`` out of ``shards``.
+
+    Tables are split on RNG block boundaries, so a shard's rows do not depend on how
+    many shards there are and consecutive shards concatenate to the full table.
+    """
+
+    blocks = -(-row_count // RNG_BLOCK_ROWS)
+    first, last = blocks * shard // shards, blocks * (shard + 1) // shards
+    return min(first * RNG_BLOCK_ROWS, row_count), min(last * RNG_BLOCK_ROWS, row_count)
+
+
+def part_path(output_dir: str | Path, table_name: str, shard: int, shards: int) -> Path:
+    return Path(output_dir) / f"{table_name}.part-{shard:05d}-of-{shards:05d}.csv"
+
+
+def generate_shard(
+    schema: SchemaConfig,
+    output_dir: str | Path,
+    shard: int,
+    shards: int,
+    *,
+    rows_override: int | None = None,
+    seed_override: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    backend: str = "python",
+) -> tuple[dict[str, int], int]:
+    """Write one shard of every table as ``<table>.part-<i>-of-<N>.csv``.
+
+    Only shard 0 carries the CSV header, so concatenating the parts of a table in shard
+    order reproduces the unsharded file byte for byte. Shards can run on different
+    machines. Parent tables are still generated in full by every shard because child
+    foreign keys are drawn from the whole parent. ``unique`` columns that are checked
+    against earlier rows (types not unique by construction) span the whole table, so a
+    table with one raises ``SchemaError`` instead of being sharded. Monotonic constraints
+    are only checked within the shard's own rows.
+    """
+
+    out = Path(output_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    plans, seed = plan_tables(schema, rows_override, seed_override)
+    relationships = schema.raw.get("relationships", [])
+    context: dict[str, Any] = {}
+    counts: dict[str, int] = {}
+    for plan in plans:
+        batches = iter_table_batches(
+            plan.name,
+            plan.spec,
+            plan.rows,
+            plan.seed,
+            context,
+            relationships,
+            chunk_size=chunk_size,
+            backend=backend,
+            row_range=shard_range(plan.rows, shard, shards),
+        )
+        path = part_path(out, plan.name, shard, shards)
+        counts[plan.name] = write_table(path, chain.from_iterable(batches), plan.columns, header=shard == 0)
+    return counts, seed
+
+
+def generate_sharded(
+    schema: SchemaConfig,
+    output_dir: str | Path,
+    shards: int,
+    *,
+    rows_override: int | None = None,
+    seed_override: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    backend: str = "python",
+    workers: int = 1,
+) -> tuple[dict[str, int], int]:
+    """Generate ``shards`` shards on up to ``workers`` processes and merge the parts.
+
+    The merged ``<table>.csv`` files are identical to a single-shard run.
+    """
+
+    if shards < 1:
+        raise ValueError("shards must be >= 1")
+    if workers < 1:
+        raise ValueError("workers must be >= 1")
+
+    out = Path(output_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    options = {
+        "rows_override": rows_override,
+        "seed_override": seed_override,
+        "chunk_size": chunk_size,
+        "backend": backend,
+    }
+    if workers == 1:
+        results = [generate_shard(schema, out, shard, shards, **options) for shard in range(shards)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(generate_shard, schema, out, shard, shards, **options) for shard in range(shards)]
+            results = [future.result() for future in futures]
+
+    counts = {name: sum(result[0][name] for result in results) for name in results[0][0]}
+    for table_name in counts:
+        target = out / f"{table_name}.csv"
+        target.unlink(missing_ok=True)  # never truncate a file hard-linked from a TableCache
+        with target.open("wb") as merged:
+            for shard in range(shards):
+                part = part_path(out, table_name, shard, shards)
+                with part.open("rb") as handle:
+                    shutil.copyfileobj(handle, merged)
+                part.unlink()
+    return counts, results[0][1]
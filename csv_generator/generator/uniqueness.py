@@ -0,0 +1,91 @@
+"""Constructive generators for ``unique``/``primary_key`` columns.
+
+Instead of drawing a value and rejecting it against a set of every value seen so far,
+unique columns get their uniqueness from the row index:
+
+- ``id`` and ``string_pattern`` columns are unique by construction (``uuid`` ids are
+  128 random bits);
+- ``integer`` columns with ``min``/``max`` map the row index through a keyed
+  permutation of ``[min, max]`` (``shared.io.rng.IndexPermutation``);
+- ``email`` columns keep the faker value and append the row number to its local part.
+
+Only the remaining types are checked against every value seen in the table, held in a
+``shared.constraints.unique.UniqueTracker`` (an exact set, then a Bloom filter sized
+to the row count); such tables are generated block after block and cannot be sharded.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from shared.io.rng import IndexPermutation
+
+from .config import SchemaError
+
+UNIQUE_BY_CONSTRUCTION = frozenset({"id", "string_pattern"})
+
+
+def is_unique(column: dict[str, Any]) -> bool:
+    constraints = column.get("constraints", {})
+    return bool(constraints.get("unique") or constraints.get("primary_key"))
+
+
+class UniqueIntegers:
+    """Distinct integers in ``[min, max]`` in keyed random order, one per row index."""
+
+    def __init__(self, table_name: str, column: dict[str, Any], seed: int, row_count: int) -> None:
+        self.low, high = int(column["min"]), int(column["max"])
+        size = high - self.low + 1
+        if row_count > size:
+            raise SchemaError(
+                f"Cannot draw {row_count} unique values for {table_name}.{column['name']} from [{self.low}, {high}]"
+            )
+        self.permutation = IndexPermutation(max(size, 1), seed, table_name, column["name"], "unique")
+
+    def value(self, row_idx: int, drawn: Any) -> int:
+        return self.low + self.permutation[row_idx]
+
+    def values(self, start: int, drawn: list[Any]) -> list[int]:
+        import numpy as np
+
+        return (self.permutation.array(np.arange(start, start + len(drawn))) + self.low).tolist()
+
+
+class UniqueEmails:
+    """Faker emails made distinct by a ``.<row number>`` suffix on the local part.
+
+    The suffix follows the last dot of the local part and differs for every row, so
+    two rows can never produce the same address.
+    """
+
+    def value(self, row_idx: int, drawn: Any) -> str:
+        local, _, domain = str(drawn).rpartition("@")
+        return f"{local}.{row_idx + 1}@{domain}"
+
+    def values(self, start: int, drawn: list[Any]) -> list[str]:
+        return [self.value(row_idx, value) for row_idx, value in enumerate(drawn, start)]
+
+
+def unique_generators(
+    table_name: str,
+    columns: list[dict[str, Any]],
+    seed: int,
+    row_count: int,
+) -> dict[str, UniqueIntegers | UniqueEmails]:
+    """Constructive uniqueness for the table's unique ``integer`` and ``email`` columns."""
+
+    generators: dict[str, UniqueIntegers | UniqueEmails] = {}
+    for column in columns:
+        if not is_unique(column) or column.get("computed"):
+            continue
+        if column.get("type") == "integer" and "min" in column and "max" in column:
+            generators[column["name"]] = UniqueIntegers(table_name, column, seed, row_count)
+        elif column.get("type") == "email":
+            generators[column["name"]] = UniqueEmails()
+    return generators
+
+
+def needs_tracking(column: dict[str, Any], generators: dict[str, Any]) -> bool:
+    """Whether a unique column still needs a seen-value set."""
+
+    return is_unique(column) and column.get("type") not in UNIQUE_BY_CONSTRUCTION and column["name"] not in generators
@@ -2,9 +2,17 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable, Iterator, Mapping, Sized
 from dataclasses import dataclass
+from itertools import islice
 from typing import Any
 
+from shared.constraints.foreign_keys import DEFAULT_MEMORY_KEYS
+from shared.constraints.streaming import DEFAULT_SAMPLE_SIZE, StreamingValidator, parents_first
+from shared.io.columnar import ColumnBatch
+
+from .core import DEFAULT_CHUNK_SIZE
+
 
 @dataclass
 class ValidationResult:
@@ -18,73 +26,40 @@ class ValidationResult:
         return {"valid": self.valid, "errors": self.errors, "summary": self.summary}
 
 
-def _has_type(value: Any, expected: str) -> bool:
-    if value is None:
-        return True
-    type_map = {
-        "id": (int, str),
-        "integer": (int,),
-        "float": (int, float),
-        "categorical": (str, int, float, bool),
-        "boolean": (bool,),
-        "date": (str,),
-        "datetime": (str,),
-        "string_pattern": (str,),
-        "name": (str,),
-        "email": (str,),
-        "city": (str,),
-        "state": (str,),
-        "constant": (str, int, float, bool),
-    }
-    if expected not in type_map:
-        return True
-    return isinstance(value, type_map[expected])
-
-
-def validate_tables(schema: dict[str, Any], tables: dict[str, list[dict[str, Any]]]) -> ValidationResult:
-    """Validate generated tables for schema constraints and relationships."""
-
-    errors: list[str] = []
-    summary: dict[str, Any] = {"table_rows": {name: len(rows) for name, rows in tables.items()}}
-
-    for table_name, table_spec in schema["tables"].items():
-        rows = tables.get(table_name, [])
-        columns = table_spec.get("columns", [])
-
-        for column in columns:
-            name = column["name"]
-            constraints = column.get("constraints", {})
-            seen: set[Any] = set()
-
-            for idx, row in enumerate(rows):
-                value = row.get(name)
-                if constraints.get("not_null") and value in (None, ""):
-                    errors.append(f"{table_name}.{name}[{idx}] violates not_null")
-                if constraints.get("unique") or constraints.get("primary_key"):
-                    if value in seen:
-                        errors.append(f"{table_name}.{name}[{idx}] violates uniqueness")
-                    seen.add(value)
-                if "min" in constraints and value is not None and value < constraints["min"]:
-                    errors.append(f"{table_name}.{name}[{idx}] below min")
-                if "max" in constraints and value is not None and value > constraints["max"]:
-                    errors.append(f"{table_name}.{name}[{idx}] above max")
-                if "type" in column and not _has_type(value, column["type"]):
-                    errors.append(
-                        f"{table_name}.{name}[{idx}] has invalid type {type(value).__name__} for {column['type']}"
-                    )
-
-    for rel in schema.get("relationships", []):
-        parent_rows = tables.get(rel["parent_table"], [])
-        child_rows = tables.get(rel["child_table"], [])
-        parent_key = rel["parent_key"]
-        child_key = rel["child_key"]
-        parent_values = {row[parent_key] for row in parent_rows}
-
-        for idx, row in enumerate(child_rows):
-            if row.get(child_key) not in parent_values:
-                errors.append(
-                    f"Relationship violation {rel['child_table']}.{child_key}[{idx}] not found in "
-                    f"{rel['parent_table']}.{parent_key}"
-                )
-
-    return ValidationResult(valid=not errors, errors=errors, summary=summary)
+def _batches(rows: Iterable[dict[str, Any]], batch_size: int) -> Iterator[ColumnBatch]:
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, batch_size)):
+        yield ColumnBatch.from_rows(chunk)
+
+
+def validate_tables(
+    schema: dict[str, Any],
+    tables: Mapping[str, Iterable[dict[str, Any]]],
+    *,
+    uniqueness: str = "exact",
+    sample_size: int = DEFAULT_SAMPLE_SIZE,
+    batch_size: int = DEFAULT_CHUNK_SIZE,
+    memory_keys: int = DEFAULT_MEMORY_KEYS,
+    scratch_dir: str | None = None,
+) -> ValidationResult:
+    """Validate generated tables for schema constraints and relationships.
+
+    Rows are read once, ``batch_size`` at a time, as column batches checked by
+    ``StreamingValidator``; tables may be lists or the lazy iterators of
+    ``stream_dataset``. Each failing rule yields one error with its violation count and
+    up to ``sample_size`` row numbers, and ``summary["violations"]`` maps rules to
+    counts. ``uniqueness="bloom"`` or ``"hll"`` bounds the memory of unique-column
+    checks, and parent keys beyond ``memory_keys`` per foreign key are spilled to a
+    scratch SQLite index under ``scratch_dir`` (see ``StreamingValidator``).
+    """
+
+    capacity = {name: len(rows) for name, rows in tables.items() if isinstance(rows, Sized)}
+    validator = StreamingValidator(schema, sample_size, uniqueness, capacity, memory_keys, scratch_dir)
+    try:
+        for table_name in parents_first(schema["tables"], schema.get("relationships", [])):
+            validator.check_table(table_name, _batches(tables.get(table_name, []), batch_size))
+    finally:
+        validator.close()
+    result = validator.result()
+    summary: dict[str, Any] = {"table_rows": result.row_counts, "violations": result.violations}
+    return ValidationResult(valid=result.valid, errors=result.errors, summary=summary)
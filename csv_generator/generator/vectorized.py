@@ -0,0 +1,180 @@
+"""NumPy column kernels for the columnar (``numpy``) generation backend.
+
+A kernel turns one column spec into ``draw(generator, start, count)``, which returns the
+values of rows ``start .. start + count - 1`` as plain Python objects.
+
+Seeding contract: every column owns independent PCG64 streams per RNG block derived
+from ``SeedSequence(table_seed, spawn_key=(column_position, stream, block))`` (stream 0
+for values, stream 1 for constraint retries, 2+ for computed-expression call sites) and
+kernels consume a fixed number of draws per row. Values therefore depend only on the
+seed, the table, the column position and the row index, never on the chunk size or
+shard layout. They intentionally differ from the ``random.Random`` (``python``) backend.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Any, Callable
+
+from .distributions import _coerce_date, _coerce_datetime
+from .vocabulary import VOCABULARY_TYPES, Vocabulary
+
+BACKENDS = ("python", "numpy")
+VECTORIZED_TYPES = frozenset(
+    {
+        "id",
+        "integer",
+        "float",
+        "categorical",
+        "boolean",
+        "date",
+        "datetime",
+        "string_pattern",
+        *VOCABULARY_TYPES,
+    }
+)
+
+Kernel = Callable[[Any, int, int], list[Any]]
+
+
+def require_numpy() -> Any:
+    try:
+        import numpy as np
+    except ImportError as exc:
+        raise ValueError(
+            "The numpy backend requires numpy. "
+            "Install dependencies with: pip install -r csv_generator/requirements.txt"
+        ) from exc
+    return np
+
+
+def column_generator(table_seed: int, position: int, stream: int = 0, block: int = 0) -> Any:
+    """Return the PCG64 generator owning ``stream`` of a column within one RNG block."""
+
+    np = require_numpy()
+    sequence = np.random.SeedSequence(abs(table_seed), spawn_key=(position, stream, block))
+    return np.random.Generator(np.random.PCG64(sequence))
+
+
+def column_random(table_seed: int, position: int, stream: int = 0, block: int = 0) -> random.Random:
+    """Return a ``random.Random`` for per-row fallbacks, seeded from the column stream."""
+
+    np = require_numpy()
+    sequence = np.random.SeedSequence(abs(table_seed), spawn_key=(position, stream, block))
+    return random.Random(int(sequence.generate_state(1, np.uint64)[0]))
+
+
+def is_vectorized(column: dict[str, Any]) -> bool:
+    if column.get("type") == "id":
+        return column.get("id_mode", "int") == "int"
+    return column.get("type") in VECTORIZED_TYPES
+
+
+def _numeric(np: Any, generator: Any, spec: dict[str, Any], count: int) -> Any:
+    dist = spec.get("distribution", "uniform")
+    if dist == "uniform":
+        low, high = float(spec.get("min", 0)), float(spec.get("max", 1))
+        return low + (high - low) * generator.random(count)
+    if dist == "normal":
+        return float(spec.get("mean", 0)) + float(spec.get("std", 1)) * generator.standard_normal(count)
+    if dist == "lognormal":
+        return np.exp(float(spec.get("mean", 0)) + float(spec.get("sigma", 1)) * generator.standard_normal(count))
+    if dist == "poisson":
+        return generator.poisson(float(spec.get("lambda", 5)), count).astype(np.float64)
+    raise ValueError(f"Unsupported distribution: {dist}")
+
+
+def _clip(np: Any, values: Any, column: dict[str, Any], cast: Callable[[Any], Any]) -> Any:
+    if "max" in column:
+        values = np.minimum(values, cast(column["max"]))
+    if "min" in column:
+        values = np.maximum(values, cast(column["min"]))
+    return values
+
+
+def column_kernel(column: dict[str, Any], vocabulary: Vocabulary | None = None) -> Kernel:
+    """Build the batch kernel for a column whose type is in ``VECTORIZED_TYPES``.
+
+    name/email/city/state columns need the table's ``vocabulary``.
+    """
+
+    np = require_numpy()
+    col_type = column.get("type")
+
+    if col_type in VOCABULARY_TYPES:
+        if vocabulary is None:
+            raise ValueError(f"Column type {col_type!r} needs a vocabulary")
+        return lambda generator, start, count: vocabulary.batch(col_type, generator, count)
+
+    if col_type == "id":
+        first = int(column.get("start", 1))
+        return lambda generator, start, count: list(range(first + start, first + start + count))
+
+    if col_type == "integer":
+
+        def draw_integer(generator: Any, start: int, count: int) -> list[Any]:
+            values = np.rint(_numeric(np, generator, column, count)).astype(np.int64)
+            return _clip(np, values, column, int).tolist()
+
+        return draw_integer
+
+    if col_type == "float":
+        digits = int(column.get("round", 2))
+
+        def draw_float(generator: Any, start: int, count: int) -> list[Any]:
+            values = _clip(np, _numeric(np, generator, column, count), column, float)
+            return np.round(values, digits).tolist()
+
+        return draw_float
+
+    if col_type == "categorical":
+        categories = list(column.get("categories", []))
+        weights = column.get("weights", [1] * len(categories))
+        if len(categories) != len(weights):
+            raise ValueError("values and weights must have the same length")
+        cumulative = np.cumsum(np.asarray(weights, dtype=np.float64))
+        last = len(categories) - 1
+
+        def draw_categorical(generator: Any, start: int, count: int) -> list[Any]:
+            picks = np.searchsorted(cumulative, generator.random(count) * cumulative[-1], side="right")
+            return [categories[idx] for idx in np.minimum(picks, last).tolist()]
+
+        return draw_categorical
+
+    if col_type == "boolean":
+        probability = float(column.get("true_probability", 0.5))
+        return lambda generator, start, count: (generator.random(count) < probability).tolist()
+
+    if col_type == "date":
+        start_date = _coerce_date(column["start"])
+        span = max((_coerce_date(column["end"]) - start_date).days, 0) + 1
+        origin = np.datetime64(start_date.isoformat(), "D")
+
+        def draw_date(generator: Any, start: int, count: int) -> list[Any]:
+            offsets = np.floor(generator.random(count) * span).astype(np.int64)
+            return np.datetime_as_string(origin + offsets, unit="D").tolist()
+
+        return draw_date
+
+    if col_type == "datetime":
+        start_dt = _coerce_datetime(column["start"])
+        span = max(int((_coerce_datetime(column["end"]) - start_dt).total_seconds()), 0) + 1
+        naive = start_dt.replace(tzinfo=None)
+        suffix = start_dt.isoformat()[len(naive.isoformat()) :]
+        unit = "us" if naive.microsecond else "s"
+        origin = np.datetime64(naive.isoformat(), unit)
+        scale = 1_000_000 if unit == "us" else 1
+
+        def draw_datetime(generator: Any, start: int, count: int) -> list[Any]:
+            offsets = np.floor(generator.random(count) * span).astype(np.int64) * scale
+            values = np.datetime_as_string(origin + offsets, unit=unit).tolist()
+            return [value + suffix for value in values] if suffix else values
+
+        return draw_datetime
+
+    if col_type == "string_pattern":
+        prefix = column.get("prefix", "item")
+        width = int(column.get("width", 5))
+        return lambda generator, start, count: [f"{prefix}{idx + 1:0{width}d}" for idx in range(start, start + count)]
+
+    raise ValueError(f"Column type {col_type!r} has no vectorized kernel")
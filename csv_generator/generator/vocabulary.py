@@ -0,0 +1,244 @@
+"""Seeded value vocabularies for ``name``/``email``/``city``/``state`` columns.
+
+Calling Faker once per cell is the slowest part of generation. Instead, each
+(locale, seed) pair samples Faker once into a ``Vocabulary`` of first/last names, user
+names, email domains, cities and states (sampling keeps Faker's frequency weighting)
+and caches it as JSON under ``$DATAGEN_CACHE_DIR`` (default ``~/.cache/datagen``).
+Values are then composed by index lookups, per cell with ``VocabularyFaker`` or per
+batch with NumPy (``Vocabulary.batch``). Without Faker a small built-in English
+vocabulary is used for every locale.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+DEFAULT_LOCALE = "en_US"
+VOCABULARY_TYPES = frozenset({"name", "email", "city", "state"})
+SAMPLE_SIZES = {
+    "first_names": 4000,
+    "last_names": 4000,
+    "user_names": 4000,
+    "domains": 200,
+    "cities": 2000,
+    "states": 500,
+}
+CACHE_FORMAT = 1
+
+_FALLBACK = {
+    "first_names": (
+        "James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "David", "Elizabeth",
+        "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Charles", "Karen",
+        "Daniel", "Lisa", "Matthew", "Nancy", "Anthony", "Betty", "Mark", "Sandra", "Steven", "Ashley",
+    ),
+    "last_names": (
+        "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+        "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin",
+        "Lee", "Perez", "Thompson", "White", "Harris", "Sanchez", "Clark", "Ramirez", "Lewis", "Robinson",
+    ),
+    "domains": ("example.com", "example.org", "example.net", "mail.example.com"),
+    "cities": (
+        "Austin", "Seattle", "Miami", "Denver", "Boston", "Chicago", "Portland", "Atlanta", "Phoenix", "Dallas",
+        "San Diego", "Nashville", "Columbus", "Charlotte", "Detroit", "Memphis", "Baltimore", "Milwaukee",
+        "Albuquerque", "Tucson", "Fresno", "Sacramento", "Omaha", "Raleigh", "Minneapolis", "Tampa",
+    ),
+    "states": (
+        "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "FL", "GA", "HI", "ID", "IL", "IN", "IA", "KS", "KY",
+        "LA", "ME", "MD", "MA", "MI", "MN", "MS", "MO", "MT", "NE", "NV", "NH", "NJ", "NM", "NY", "NC", "ND",
+        "OH", "OK", "OR", "PA", "RI", "SC", "SD", "TN", "TX", "UT", "VT", "VA", "WA", "WV", "WI", "WY",
+    ),
+}
+
+
+@dataclass(frozen=True)
+class Vocabulary:
+    """Sampled value lists for one locale and seed."""
+
+    locale: str
+    seed: int
+    source: str
+    first_names: tuple[str, ...]
+    last_names: tuple[str, ...]
+    user_names: tuple[str, ...]
+    domains: tuple[str, ...]
+    cities: tuple[str, ...]
+    states: tuple[str, ...]
+    last_name_first: bool = False
+    name_separator: str = " "
+
+    def compose_name(self, first: str, last: str) -> str:
+        if self.last_name_first:
+            return f"{last}{self.name_separator}{first}"
+        return f"{first}{self.name_separator}{last}"
+
+    def batch(self, kind: str, generator: Any, count: int) -> list[str]:
+        """Draw ``count`` values of column type ``kind`` from a NumPy generator.
+
+        Every value consumes a fixed number of consecutive uniform draws (one row of a
+        ``(count, 2)`` draw for names and emails, one draw otherwise), so row ``i`` of a
+        batch always uses the same draws and batches concatenate exactly.
+        """
+
+        import numpy as np
+
+        def pick(values: tuple[str, ...], uniforms: Any) -> Any:
+            indices = np.floor(uniforms * len(values)).astype(np.int64)
+            return np.asarray(values, dtype=object)[indices]
+
+        if kind in ("name", "email"):
+            uniforms = generator.random((count, 2))
+            if kind == "email":
+                return (pick(self.user_names, uniforms[:, 0]) + "@" + pick(self.domains, uniforms[:, 1])).tolist()
+            first, last = pick(self.first_names, uniforms[:, 0]), pick(self.last_names, uniforms[:, 1])
+            if self.last_name_first:
+                first, last = last, first
+            return (first + self.name_separator + last).tolist()
+        if kind == "city":
+            return pick(self.cities, generator.random(count)).tolist()
+        if kind == "state":
+            return pick(self.states, generator.random(count)).tolist()
+        raise ValueError(f"Column type {kind!r} has no vocabulary")
+
+
+class VocabularyFaker:
+    """Faker-compatible ``name``/``email``/``city``/``state`` drawing from a vocabulary."""
+
+    def __init__(self, vocabulary: Vocabulary, rng: random.Random) -> None:
+        self.vocabulary = vocabulary
+        self.rng = rng
+
+    def _pick(self, values: tuple[str, ...]) -> str:
+        return values[int(self.rng.random() * len(values))]
+
+    def name(self) -> str:
+        first = self._pick(self.vocabulary.first_names)
+        return self.vocabulary.compose_name(first, self._pick(self.vocabulary.last_names))
+
+    def email(self) -> str:
+        user = self._pick(self.vocabulary.user_names)
+        return f"{user}@{self._pick(self.vocabulary.domains)}"
+
+    def city(self) -> str:
+        return self._pick(self.vocabulary.cities)
+
+    def state(self) -> str:
+        return self._pick(self.vocabulary.states)
+
+
+def cache_dir() -> Path:
+    configured = os.getenv("DATAGEN_CACHE_DIR")
+    base = Path(configured).expanduser() if configured else Path.home() / ".cache" / "datagen"
+    return base / "vocabularies"
+
+
+def _fallback_vocabulary(locale: str, seed: int) -> Vocabulary:
+    user_names = tuple(
+        f"{first.lower()}.{last.lower()}" for first in _FALLBACK["first_names"] for last in _FALLBACK["last_names"]
+    )
+    return Vocabulary(
+        locale=locale,
+        seed=seed,
+        source="builtin",
+        first_names=_FALLBACK["first_names"],
+        last_names=_FALLBACK["last_names"],
+        user_names=user_names,
+        domains=_FALLBACK["domains"],
+        cities=_FALLBACK["cities"],
+        states=_FALLBACK["states"],
+    )
+
+
+def _person_format(fake: Any) -> tuple[bool, str]:
+    """Whether the locale writes the last name first, and the name separator."""
+
+    for provider in fake.factories[0].get_providers():
+        if type(provider).__module__.startswith("faker.providers.person"):
+            formats = list(getattr(provider, "formats", ()) or ())
+            if formats:
+                first_format = str(formats[0])
+                separator = "" if "}}{{" in first_format else " "
+                return first_format.startswith("{{last_name"), separator
+    return False, " "
+
+
+def _sample_faker(faker_cls: Any, locale: str, seed: int) -> Vocabulary:
+    fake = faker_cls(locale)
+    fake.seed_instance(seed)
+    state_method = next(
+        (getattr(fake, name) for name in ("state", "administrative_unit", "prefecture", "region") if hasattr(fake, name)),
+        None,
+    )
+
+    def sample(method: Any, key: str) -> tuple[str, ...]:
+        return tuple(str(method()) for _ in range(SAMPLE_SIZES[key]))
+
+    last_name_first, separator = _person_format(fake)
+    return Vocabulary(
+        locale=locale,
+        seed=seed,
+        source=f"faker-{_faker_version()}",
+        first_names=sample(fake.first_name, "first_names"),
+        last_names=sample(fake.last_name, "last_names"),
+        user_names=sample(fake.user_name, "user_names"),
+        domains=sample(fake.free_email_domain, "domains"),
+        cities=sample(fake.city, "cities"),
+        states=sample(state_method, "states") if state_method is not None else _FALLBACK["states"],
+        last_name_first=last_name_first,
+        name_separator=separator,
+    )
+
+
+def _faker_version() -> str:
+    from faker import VERSION
+
+    return str(VERSION)
+
+
+def _read_cache(path: Path) -> Vocabulary | None:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    fields = {key: tuple(value) if isinstance(value, list) else value for key, value in data.items()}
+    try:
+        return Vocabulary(**fields)
+    except TypeError:
+        return None
+
+
+def _write_cache(path: Path, vocabulary: Vocabulary) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(asdict(vocabulary), ensure_ascii=False), encoding="utf-8")
+        tmp.replace(path)
+    except OSError:
+        # Caching is an optimization; read-only homes still generate correctly.
+        pass
+
+
+@lru_cache(maxsize=32)
+def load_vocabulary(locale: str = DEFAULT_LOCALE, seed: int = 0) -> Vocabulary:
+    """Return the vocabulary for ``locale``/``seed``, sampling and caching it on first use."""
+
+    try:
+        from faker import Faker
+    except ImportError:
+        return _fallback_vocabulary(locale, seed)
+
+    path = cache_dir() / f"{locale}-{seed}-faker{_faker_version()}-v{CACHE_FORMAT}.json"
+    cached = _read_cache(path)
+    if cached is not None:
+        return cached
+    try:
+        vocabulary = _sample_faker(Faker, locale, seed)
+    except AttributeError as exc:
+        raise ValueError(f"Faker locale {locale!r} is not supported: {exc}") from exc
+    _write_cache(path, vocabulary)
+    return vocabulary
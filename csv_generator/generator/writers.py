@@ -4,19 +4,56 @@ from __future__ import annotations
 
 import csv
 from pathlib import Path
+from typing import Iterable, Mapping
 
+from shared.io.columnar import ColumnBatch
 
-def write_tables(output_dir: str | Path, tables: dict[str, list[dict[str, object]]], column_order: dict[str, list[str]]) -> None:
-    """Write one CSV file per table with deterministic column order."""
+
+def write_tables(
+    output_dir: str | Path,
+    tables: Mapping[str, Iterable[dict[str, object]]],
+    column_order: dict[str, list[str]],
+) -> dict[str, int]:
+    """Write one CSV file per table with deterministic column order.
+
+    Tables may be in-memory row lists or the lazy row iterators returned by
+    ``stream_dataset``; rows are written as they are produced. Returns the number of
+    rows written per table.
+    """
 
     out = Path(output_dir)
     out.mkdir(parents=True, exist_ok=True)
 
-    for table_name, rows in tables.items():
-        path = out / f"{table_name}.csv"
-        fields = column_order[table_name]
-        with path.open("w", newline="", encoding="utf-8") as handle:
-            writer = csv.DictWriter(handle, fieldnames=fields)
+    return {
+        table_name: write_table(out / f"{table_name}.csv", rows, column_order[table_name])
+        for table_name, rows in tables.items()
+    }
+
+
+def write_table(
+    path: str | Path,
+    rows: Iterable[dict[str, object]] | ColumnBatch,
+    fields: list[str],
+    header: bool = True,
+) -> int:
+    """Write a single table to ``path`` and return the number of rows written.
+
+    ``header=False`` omits the header line (used for shard parts after the first).
+    A ``ColumnBatch`` is written column-wise without building row dicts. A file
+    hard-linked elsewhere (e.g. restored from ``TableCache``) is replaced, not truncated.
+    """
+
+    path = Path(path)
+    if path.is_file() and path.stat().st_nlink > 1:
+        path.unlink()
+    count = 0
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        if isinstance(rows, ColumnBatch):
+            return rows.write_csv(handle, fields, header)
+        writer = csv.DictWriter(handle, fieldnames=fields, restval="", extrasaction="ignore")
+        if header:
             writer.writeheader()
-            for row in rows:
-                writer.writerow({field: row.get(field, "") for field in fields})
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from typing import Iterator
+
+import pytest
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _vocabulary_cache(tmp_path_factory: pytest.TempPathFactory) -> Iterator[None]:
+    """Keep sampled vocabularies out of the user's cache directory during tests."""
+
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setenv("DATAGEN_CACHE_DIR", str(tmp_path_factory.mktemp("datagen-cache")))
+        yield
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import copy
+from pathlib import Path
+
+from csv_generator.generator.cache import TableCache
+from csv_generator.generator.config import SchemaConfig, load_schema
+from csv_generator.generator.scheduler import generate_to_directory
+from csv_generator.generator.writers import write_table
+
+
+def _schema(customer_rows: int = 30) -> SchemaConfig:
+    schema = load_schema("csv_generator/schemas/retail_basic.yaml")
+    raw = copy.deepcopy(schema.raw)
+    for spec in raw["tables"].values():
+        spec["rows"] = 30
+    raw["tables"]["customers"]["rows"] = customer_rows
+    return SchemaConfig(raw, schema.path)
+
+
+def _files(directory: Path) -> dict[str, bytes]:
+    return {path.name: path.read_bytes() for path in sorted(directory.glob("*.csv"))}
+
+
+def test_only_changed_tables_and_descendants_are_regenerated(tmp_path: Path) -> None:
+    out = tmp_path / "out"
+    first = TableCache(tmp_path / "cache")
+    generate_to_directory(_schema(), out, seed_override=3, cache=first)
+    assert first.hits == []
+
+    again = TableCache(tmp_path / "cache")
+    counts, _ = generate_to_directory(_schema(), out, seed_override=3, cache=again)
+    assert again.hits == list(counts)
+    generate_to_directory(_schema(), tmp_path / "fresh", seed_override=3)
+    assert _files(out) == _files(tmp_path / "fresh")
+
+    changed = TableCache(tmp_path / "cache")
+    generate_to_directory(_schema(customer_rows=40), out, seed_override=3, workers=2, cache=changed)
+    assert changed.hits == ["products"]
+    assert sorted(changed.misses) == ["customers", "order_items", "orders"]
+    generate_to_directory(_schema(customer_rows=40), tmp_path / "fresh", seed_override=3)
+    assert _files(out) == _files(tmp_path / "fresh")
+
+
+def test_restored_files_are_replaced_not_rewritten(tmp_path: Path) -> None:
+    out = tmp_path / "out"
+    generate_to_directory(_schema(), out, seed_override=3, cache=TableCache(tmp_path / "cache"))
+    cached = _files(tmp_path / "cache")
+
+    write_table(out / "products.csv", [{"product_id": 1}], ["product_id"])
+
+    assert _files(tmp_path / "cache") == cached
+    assert (out / "products.csv").read_text() == "product_id\n1\n"
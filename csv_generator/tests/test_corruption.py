@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import random
+
+from csv_generator.generator.corruption import (
+    CellEdits,
+    CorruptionPlan,
+    apply_corruption,
+    draw_cell_edits,
+    skip_positions,
+)
+
+SPEC = {
+    "columns": [
+        {"name": "id", "type": "id", "constraints": {"primary_key": True}},
+        {"name": "amount", "type": "float"},
+        {"name": "channel", "type": "categorical"},
+    ],
+    "corruption": {
+        "missing_rate": 0.05,
+        "missing_by_column": {"channel": 0.1},
+        "outlier_rate": 0.02,
+        "type_noise": {"amount": {"rate": 0.03, "value": "oops"}},
+        "duplicate_rate": 0.1,
+    },
+}
+
+
+def test_skip_positions_hit_rate_and_bounds() -> None:
+    positions = skip_positions(0.01, 1000, 201_000, random.Random(3))
+
+    assert positions == sorted(set(positions))
+    assert all(1000 <= idx < 201_000 for idx in positions)
+    assert 1800 < len(positions) < 2200
+    assert skip_positions(0.0, 0, 100, random.Random(3)) == []
+    assert skip_positions(1.0, 5, 9, random.Random(3)) == [5, 6, 7, 8]
+
+
+def test_cell_edits_apply_per_chunk_matches_whole_range() -> None:
+    plan = CorruptionPlan.from_spec(SPEC)
+    edits = draw_cell_edits(plan, 100, 400, random.Random(9))
+
+    def rows() -> list[dict]:
+        return [{"id": idx, "amount": 10.0, "channel": "web"} for idx in range(100, 400)]
+
+    whole = rows()
+    edits.apply(whole, 100)
+    chunked = rows()
+    for start in range(0, 300, 7):
+        edits.apply(chunked[start : start + 7], 100 + start)
+
+    assert whole == chunked
+    assert all(row["id"] == idx for idx, row in enumerate(whole, 100))
+    assert any(row["channel"] == "" for row in whole)
+
+
+def test_type_noise_wins_over_missing_on_the_same_cell() -> None:
+    edits = CellEdits([0, 0, 0], [("amount", "", False), ("amount", 5.0, True), ("amount", "N/A", False)])
+    row = {"amount": 2.0}
+
+    edits.apply([row], 0)
+
+    assert row == {"amount": "N/A"}
+
+
+def test_apply_corruption_edits_in_place_and_references_duplicates() -> None:
+    rows = [{"id": idx, "amount": float(idx), "channel": "web"} for idx in range(200)]
+    originals = list(rows)
+
+    result = apply_corruption(rows, SPEC, random.Random(1))
+
+    assert len(result) == 220
+    assert all(a is b for a, b in zip(result, originals))
+    assert all(any(dup is row for row in originals) for dup in result[200:])
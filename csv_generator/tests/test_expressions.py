@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from csv_generator.generator.config import SchemaConfig, SchemaError
+from csv_generator.generator.core import generate_dataset
+from csv_generator.generator.expressions import compile_expression, expression_scope
+
+
+def test_compile_rejects_unknown_names() -> None:
+    with pytest.raises(ValueError, match="unknown name 'price'"):
+        compile_expression("round(price * 2, 2)", {"units"})
+
+
+def test_invalid_expression_fails_before_generation(tmp_path) -> None:
+    raw = {
+        "dataset": "bad",
+        "tables": {"t": {"rows": 3, "columns": [{"name": "a", "type": "integer"}, {"name": "b", "computed": "a +"}]}},
+        "relationships": [],
+    }
+    with pytest.raises(SchemaError, match="t.b"):
+        generate_dataset(SchemaConfig(raw=raw, path=tmp_path / "bad.yaml"))
+
+
+def test_row_evaluation_matches_eval() -> None:
+    expression = compile_expression("max(units, 3) * 2 if kind == 'a' else -units", {"units", "kind"})
+    scope = expression_scope(random.Random(1))
+
+    assert expression.vectorizable
+    assert expression.evaluate({"units": 5, "kind": "a"}, scope) == 10
+    assert expression.evaluate({"units": 5, "kind": "b"}, scope) == -5
+
+
+def test_batch_evaluation_matches_rows() -> None:
+    pytest.importorskip("numpy")
+    expression = compile_expression(
+        "round(units * unit_price, 2) if units > 2 else (0 if flag else int(unit_price))",
+        {"units", "unit_price", "flag"},
+    )
+    columns = {"units": [1, 3, 2, 5], "unit_price": [2.5, 1.25, 9.9, 4.0], "flag": [True, False, False, True]}
+    rows = [dict(zip(columns, values)) for values in zip(*columns.values())]
+    scope = expression_scope(random.Random(0))
+
+    batch = expression.evaluate_batch(columns, 4, lambda site: None)
+
+    assert batch == [expression.evaluate(row, scope) for row in rows]
+    assert [type(value) for value in batch] == [type(expression.evaluate(row, scope)) for row in rows]
+
+
+def test_attribute_calls_fall_back_to_row_evaluation() -> None:
+    expression = compile_expression("signup_date.replace('-', '')", {"signup_date"})
+
+    assert not expression.vectorizable
+    assert expression.evaluate({"signup_date": "2024-01-02"}, expression_scope(random.Random(0))) == "20240102"
@@ -1,7 +1,14 @@
 from __future__ import annotations
 
+import random
+from array import array
+from collections import Counter
+
+import pytest
+
 from csv_generator.generator.config import load_schema
 from csv_generator.generator.core import generate_dataset
+from csv_generator.generator.relationships import CompactColumnBuilder, ForeignKeySampler
 
 
 def test_foreign_keys_reference_existing_parents() -> None:
@@ -14,3 +21,47 @@ def test_foreign_keys_reference_existing_parents() -> None:
     for row in tables["orders"]:
         assert row["customer_id"] in customer_ids
         assert row["product_id"] in product_ids
+
+
+def _relationship(**extra: object) -> dict:
+    return {"parent_key": "id", "child_key": "parent_id", **extra}
+
+
+def test_sampler_follows_sampled_child_counts() -> None:
+    parents = {"id": array("q", range(1, 11))}
+    sampler = ForeignKeySampler(_relationship(min_children=0, max_children=5), parents, 1000, random.Random(3))
+    weights = [sampler.cumulative[0]] + [b - a for a, b in zip(sampler.cumulative, sampler.cumulative[1:])]
+
+    rng = random.Random(4)
+    counts = Counter(sampler.index(rng.random()) for _ in range(20_000))
+    for parent_idx, weight in enumerate(weights):
+        if weight == 0:
+            assert counts[parent_idx] == 0
+        else:
+            assert abs(counts[parent_idx] / 20_000 - weight / sampler.total) < 0.02
+
+
+def test_sampler_falls_back_to_uniform_and_copies_lookups_by_position() -> None:
+    parents = {"id": [7, 7, 9], "price": [1.5, 2.5, 3.5]}
+    relationship = _relationship(min_children=0, max_children=0, lookup_columns={"price": "unit_price"})
+    sampler = ForeignKeySampler(relationship, parents, 10, random.Random(1))
+    assert sampler.total == 3
+
+    row: dict = {}
+    sampler.assign(row, 1)
+    assert row == {"parent_id": 7, "unit_price": 2.5}
+
+
+def test_vectorized_indices_match_scalar_indices() -> None:
+    np = pytest.importorskip("numpy")
+    sampler = ForeignKeySampler(_relationship(), {"id": array("q", range(500))}, 2000, random.Random(8))
+    uniforms = np.random.default_rng(1).random(1000)
+    assert sampler.indices(uniforms).tolist() == [sampler.index(u) for u in uniforms.tolist()]
+
+
+def test_compact_column_builder_falls_back_to_list() -> None:
+    builder = CompactColumnBuilder()
+    builder.extend([1, 2])
+    assert builder.values == array("q", [1, 2])
+    builder.extend([3.5, ""])
+    assert builder.values == [1, 2, 3.5, ""]
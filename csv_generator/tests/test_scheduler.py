@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from array import array
+from pathlib import Path
+
+import pytest
+
+from csv_generator.generator.config import load_schema
+from csv_generator.generator.core import stream_dataset
+from csv_generator.generator.scheduler import compact_column, generate_to_directory
+from csv_generator.generator.writers import write_tables
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_worker_count_does_not_change_output(tmp_path: Path, workers: int) -> None:
+    schema = load_schema("csv_generator/schemas/retail_basic.yaml")
+    streams, order, _ = stream_dataset(schema, rows_override=40, seed_override=21)
+    expected_counts = write_tables(tmp_path / "serial", streams, order)
+
+    counts, seed = generate_to_directory(
+        schema, tmp_path / "pool", rows_override=40, seed_override=21, chunk_size=16, workers=workers
+    )
+
+    assert seed == 21
+    assert counts == expected_counts
+    assert list(counts) == list(order)
+    for table_name in order:
+        expected = (tmp_path / "serial" / f"{table_name}.csv").read_bytes()
+        assert (tmp_path / "pool" / f"{table_name}.csv").read_bytes() == expected
+
+
+def test_compact_column_packs_integer_keys() -> None:
+    assert compact_column([1, 2, 3]) == array("q", [1, 2, 3])
+    assert compact_column([1, "", 3]) == [1, "", 3]
+    assert compact_column([True, False]) == [True, False]
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from csv_generator.generator.cli import main
+from csv_generator.generator.config import load_schema
+from csv_generator.generator.core import RNG_BLOCK_ROWS
+from csv_generator.generator.scheduler import generate_to_directory
+from csv_generator.generator.sharding import generate_sharded, parse_shard, shard_range
+
+ROWS = 2 * RNG_BLOCK_ROWS + 100
+
+
+@pytest.mark.parametrize(("backend", "shards"), [("python", 2), ("python", 4), ("numpy", 3)])
+def test_merged_shards_match_unsharded_output(tmp_path: Path, backend: str, shards: int) -> None:
+    if backend == "numpy":
+        pytest.importorskip("numpy")
+    schema = load_schema("csv_generator/schemas/web_events.yaml")
+    expected_counts, _ = generate_to_directory(
+        schema, tmp_path / "full", rows_override=ROWS, seed_override=5, chunk_size=1000, backend=backend
+    )
+
+    counts, seed = generate_sharded(
+        schema, tmp_path / "sharded", shards, rows_override=ROWS, seed_override=5, chunk_size=333, backend=backend
+    )
+
+    assert seed == 5
+    assert counts == expected_counts
+    assert sorted(path.name for path in (tmp_path / "sharded").iterdir()) == sorted(
+        f"{name}.csv" for name in counts
+    )
+    for table_name in counts:
+        expected = (tmp_path / "full" / f"{table_name}.csv").read_bytes()
+        assert (tmp_path / "sharded" / f"{table_name}.csv").read_bytes() == expected
+
+
+def test_cli_shard_writes_headerless_parts_after_the_first(tmp_path: Path) -> None:
+    schema = "csv_generator/schemas/single_table_10_rows.yaml"
+    for shard in ("0/2", "1/2"):
+        code = main(["generate", "--schema", schema, "--rows", str(ROWS), "--out", str(tmp_path), "--shard", shard])
+        assert code == 0
+
+    parts = sorted(tmp_path.glob("*.part-*.csv"))
+    assert [path.name.split(".", 1)[1] for path in parts] == ["part-00000-of-00002.csv", "part-00001-of-00002.csv"]
+    first, second = (path.read_text(encoding="utf-8").splitlines() for path in parts)
+    assert len(first) - 1 + len(second) == ROWS
+    assert first[0].startswith("user_id,")
+    assert second[0].split(",")[0] == str(shard_range(ROWS, 1, 2)[0] + 1)
+
+
+def test_shard_ranges_are_block_aligned_and_cover_the_table() -> None:
+    for shards in (1, 2, 3, 7):
+        ranges = [shard_range(ROWS, shard, shards) for shard in range(shards)]
+        assert ranges[0][0] == 0 and ranges[-1][1] == ROWS
+        assert all(prev[1] == cur[0] for prev, cur in zip(ranges, ranges[1:]))
+        assert all(start % RNG_BLOCK_ROWS == 0 for start, _ in ranges)
+
+
+@pytest.mark.parametrize("value", ["3", "2/2", "-1/4", "a/b"])
+def test_parse_shard_rejects_bad_values(value: str) -> None:
+    with pytest.raises(ValueError, match="Invalid shard"):
+        parse_shard(value)
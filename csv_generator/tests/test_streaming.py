@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from csv_generator.generator.config import load_schema
+from csv_generator.generator.core import generate_dataset, stream_dataset
+from csv_generator.generator.writers import write_tables
+
+
+@pytest.mark.parametrize(
+    "schema_path",
+    ["csv_generator/schemas/retail_basic.yaml", "csv_generator/schemas/corruption_minimal.yaml"],
+)
+@pytest.mark.parametrize("chunk_size", [1, 7, 10_000])
+def test_streaming_matches_in_memory(tmp_path: Path, schema_path: str, chunk_size: int) -> None:
+    schema = load_schema(schema_path)
+
+    tables, order, _ = generate_dataset(schema, rows_override=60, seed_override=5)
+    write_tables(tmp_path / "memory", tables, order)
+
+    streams, stream_order, _ = stream_dataset(schema, rows_override=60, seed_override=5, chunk_size=chunk_size)
+    counts = write_tables(tmp_path / "stream", streams, stream_order)
+
+    assert counts == {name: len(rows) for name, rows in tables.items()}
+    for table_name in tables:
+        expected = (tmp_path / "memory" / f"{table_name}.csv").read_bytes()
+        assert (tmp_path / "stream" / f"{table_name}.csv").read_bytes() == expected
+
+
+def test_streaming_requires_generation_order() -> None:
+    schema = load_schema("csv_generator/schemas/retail_basic.yaml")
+    streams, _, _ = stream_dataset(schema, rows_override=5, seed_override=1)
+
+    with pytest.raises(ValueError, match="must be generated before"):
+        next(streams["orders"])
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from csv_generator.generator.config import SchemaConfig, SchemaError
+from csv_generator.generator.core import RNG_BLOCK_ROWS, generate_dataset
+from csv_generator.generator.sharding import generate_shard
+
+
+def _schema(tmp_path: Path, rows: int, columns: list[dict]) -> SchemaConfig:
+    raw = {"dataset": "unique", "seed": 4, "tables": {"t": {"rows": rows, "columns": columns}}, "relationships": []}
+    return SchemaConfig(raw=raw, path=tmp_path / "unique.yaml")
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_unique_integers_fill_a_tight_range(tmp_path: Path, backend: str) -> None:
+    if backend == "numpy":
+        pytest.importorskip("numpy")
+    column = {"name": "code", "type": "integer", "min": 1000, "max": 1499, "constraints": {"unique": True}}
+    tables, _, _ = generate_dataset(_schema(tmp_path, 500, [column]), backend=backend)
+
+    codes = [row["code"] for row in tables["t"]]
+    assert sorted(codes) == list(range(1000, 1500))
+    assert codes != sorted(codes)
+
+
+def test_unique_integer_range_too_small_is_a_schema_error(tmp_path: Path) -> None:
+    column = {"name": "code", "type": "integer", "min": 1, "max": 10, "constraints": {"unique": True}}
+    with pytest.raises(SchemaError, match="Cannot draw 11 unique values"):
+        generate_dataset(_schema(tmp_path, 11, [column]))
+
+
+def test_unique_emails_hold_across_rng_blocks(tmp_path: Path) -> None:
+    columns = [
+        {"name": "id", "type": "id", "constraints": {"primary_key": True}},
+        {"name": "email", "type": "email", "constraints": {"unique": True}},
+    ]
+    rows = RNG_BLOCK_ROWS + 500
+    tables, _, _ = generate_dataset(_schema(tmp_path, rows, columns))
+
+    emails = [row["email"] for row in tables["t"]]
+    assert len(set(emails)) == rows
+    assert all(email.count("@") == 1 for email in emails)
+
+
+UNIQUE_DATETIME = {
+    "name": "seen_at",
+    "type": "datetime",
+    "start": "2024-01-01T00:00:00",
+    "end": "2024-01-02T00:00:00",
+    "constraints": {"unique": True},
+}
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_tracked_unique_columns_hold_across_rng_blocks(tmp_path: Path, backend: str) -> None:
+    if backend == "numpy":
+        pytest.importorskip("numpy")
+    rows = 2 * RNG_BLOCK_ROWS + 808
+    tables, _, _ = generate_dataset(_schema(tmp_path, rows, [UNIQUE_DATETIME]), backend=backend)
+
+    assert len({row["seen_at"] for row in tables["t"]}) == rows
+
+
+def test_tracked_unique_columns_cannot_be_sharded(tmp_path: Path) -> None:
+    schema = _schema(tmp_path, 2 * RNG_BLOCK_ROWS, [UNIQUE_DATETIME])
+
+    with pytest.raises(SchemaError, match=r"t\.seen_at .* cannot be sharded"):
+        generate_shard(schema, tmp_path / "out", 1, 2)
+
+
+def test_tracked_unique_columns_stay_unique_past_the_exact_limit(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from csv_generator.generator import core
+    from shared.constraints.unique import UniqueTracker
+
+    trackers: list[UniqueTracker] = []
+
+    def small_tracker(capacity: int) -> UniqueTracker:
+        trackers.append(UniqueTracker(capacity, exact_limit=500))
+        return trackers[-1]
+
+    monkeypatch.setattr(core, "UniqueTracker", small_tracker)
+    rows = RNG_BLOCK_ROWS + 500
+    tables, _, _ = generate_dataset(_schema(tmp_path, rows, [UNIQUE_DATETIME]))
+
+    assert len({row["seen_at"] for row in tables["t"]}) == rows
+    assert trackers[0].capacity == rows and trackers[0].bloom is not None
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import pytest
+
+from csv_generator.generator.config import load_schema
+from csv_generator.generator.core import generate_dataset, stream_dataset
+from csv_generator.generator.validation import validate_tables
+from shared.constraints import streaming
+
+SCHEMA = {
+    "tables": {
+        "users": {
+            "columns": [
+                {"name": "user_id", "type": "id", "constraints": {"primary_key": True}},
+                {"name": "age", "type": "integer", "constraints": {"min": 18, "max": 99, "not_null": True}},
+            ]
+        }
+    }
+}
+
+
+def _users(count: int) -> list[dict]:
+    rows = [{"user_id": idx, "age": 20 + idx % 50} for idx in range(count)]
+    for idx in range(0, count, 10):
+        rows[idx]["age"] = 5
+    rows[7]["age"] = None
+    rows[-1]["user_id"] = 3
+    return rows
+
+
+def test_errors_are_one_per_rule_with_counts_and_samples() -> None:
+    result = validate_tables(SCHEMA, {"users": _users(10_000)}, batch_size=999)
+
+    assert not result.valid
+    assert result.summary["violations"] == {
+        "users.age violates not_null": 1,
+        "users.age below min": 1000,
+        "users.user_id violates uniqueness": 1,
+    }
+    assert "users.age below min in 1000 row(s) (rows 0, 10, 20, 30, 40, ...)" in result.errors
+    assert len(result.errors) == 3
+
+
+def test_numpy_and_python_checks_agree(monkeypatch: pytest.MonkeyPatch) -> None:
+    schema = load_schema("csv_generator/schemas/web_events_tiny.yaml")
+    tables, _, _ = generate_dataset(schema, rows_override=3000)
+    vectorized = validate_tables(schema.raw, tables)
+
+    monkeypatch.setattr(streaming, "_numpy", lambda: None)
+    assert validate_tables(schema.raw, tables).to_dict() == vectorized.to_dict()
+
+
+def test_streamed_tables_validate_like_lists() -> None:
+    schema = load_schema("csv_generator/schemas/two_tables_fk_minimal.yaml")
+    tables, _, _ = generate_dataset(schema, seed_override=3)
+    streams, _, _ = stream_dataset(schema, seed_override=3)
+
+    assert validate_tables(schema.raw, streams).to_dict() == validate_tables(schema.raw, tables).to_dict()
+
+
+def test_probabilistic_uniqueness_modes() -> None:
+    rows = [{"user_id": idx % 40_000, "age": 30} for idx in range(50_000)]
+
+    bloom = validate_tables(SCHEMA, {"users": rows}, uniqueness="bloom").summary["violations"]
+    assert bloom["users.user_id violates uniqueness (probable)"] >= 10_000
+    sketch = validate_tables(SCHEMA, {"users": rows}, uniqueness="hll").summary["violations"]
+    assert sketch["users.user_id violates uniqueness (estimated)"] == pytest.approx(10_000, abs=2_000)
+    assert validate_tables(SCHEMA, {"users": rows[:40_000]}, uniqueness="hll").valid
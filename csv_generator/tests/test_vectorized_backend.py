@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from copy import deepcopy
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from csv_generator.generator.config import SchemaConfig, load_schema
+from csv_generator.generator.core import generate_dataset, stream_dataset
+from csv_generator.generator.validation import validate_tables
+from csv_generator.generator.writers import write_tables
+
+
+@pytest.mark.parametrize(
+    "schema_path", ["csv_generator/schemas/web_events.yaml", "csv_generator/schemas/retail_basic.yaml"]
+)
+def test_numpy_backend_output_is_independent_of_chunk_size(tmp_path: Path, schema_path: str) -> None:
+    schema = load_schema(schema_path)
+    if "customers" in schema.raw["tables"]:
+        # Names and emails draw two uniforms per row.
+        raw = deepcopy(schema.raw)
+        raw["tables"]["customers"]["columns"].append({"name": "full_name", "type": "name"})
+        schema = SchemaConfig(raw=raw, path=schema.path)
+
+    tables, order, _ = generate_dataset(schema, rows_override=80, seed_override=3, backend="numpy")
+    write_tables(tmp_path / "memory", tables, order)
+
+    for chunk_size in (7, 9, 50):
+        streams, stream_order, _ = stream_dataset(
+            schema, rows_override=80, seed_override=3, chunk_size=chunk_size, backend="numpy"
+        )
+        write_tables(tmp_path / f"stream{chunk_size}", streams, stream_order)
+
+        for table_name in tables:
+            expected = (tmp_path / "memory" / f"{table_name}.csv").read_bytes()
+            assert (tmp_path / f"stream{chunk_size}" / f"{table_name}.csv").read_bytes() == expected
+
+
+def test_numpy_backend_respects_schema_constraints() -> None:
+    loaded = load_schema("csv_generator/schemas/retail_basic.yaml")
+    raw = deepcopy(loaded.raw)
+    for table in raw["tables"].values():
+        table.pop("corruption", None)
+    schema = SchemaConfig(raw=raw, path=loaded.path)
+    tables, _, _ = generate_dataset(schema, rows_override=120, seed_override=8, backend="numpy")
+
+    assert validate_tables(schema.raw, tables).valid
+    ages = [row["age"] for row in tables["customers"]]
+    assert all(isinstance(age, int) and 18 <= age <= 85 for age in ages)
+    assert {row["region"] for row in tables["customers"]} <= {"north", "south", "east", "west"}
+
+
+def test_unknown_backend_is_rejected() -> None:
+    schema = load_schema("csv_generator/schemas/single_table_10_rows.yaml")
+
+    with pytest.raises(ValueError, match="Unknown backend"):
+        generate_dataset(schema, backend="gpu")
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from csv_generator.generator.config import SchemaConfig
+from csv_generator.generator.core import generate_dataset
+from csv_generator.generator.vocabulary import _fallback_vocabulary, cache_dir, load_vocabulary
+
+
+@pytest.fixture
+def fresh_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    monkeypatch.setenv("DATAGEN_CACHE_DIR", str(tmp_path))
+    load_vocabulary.cache_clear()
+    yield tmp_path
+    load_vocabulary.cache_clear()
+
+
+def test_vocabulary_is_sampled_once_and_cached_per_locale_and_seed(fresh_cache: Path) -> None:
+    pytest.importorskip("faker")
+    vocabulary = load_vocabulary("en_US", 3)
+    files = list(cache_dir().glob("en_US-3-*.json"))
+    assert len(files) == 1
+
+    load_vocabulary.cache_clear()
+    assert load_vocabulary("en_US", 3) == vocabulary
+    assert load_vocabulary("en_US", 4) != vocabulary
+
+
+def test_locale_controls_vocabulary_and_name_order(fresh_cache: Path) -> None:
+    pytest.importorskip("faker")
+    japanese = load_vocabulary("ja_JP", 0)
+    assert japanese.last_name_first
+    assert japanese.compose_name("太郎", "山田") == "山田 太郎"
+    assert not load_vocabulary("de_DE", 0).last_name_first
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_schema_locale_reaches_generated_values(tmp_path: Path, backend: str) -> None:
+    pytest.importorskip("faker")
+    if backend == "numpy":
+        pytest.importorskip("numpy")
+    raw = {
+        "dataset": "people",
+        "seed": 2,
+        "locale": "de_DE",
+        "tables": {
+            "people": {
+                "rows": 300,
+                "columns": [
+                    {"name": "name", "type": "name"},
+                    {"name": "email", "type": "email"},
+                    {"name": "city", "type": "city"},
+                    {"name": "state", "type": "state"},
+                ],
+            }
+        },
+        "relationships": [],
+    }
+    tables, _, _ = generate_dataset(SchemaConfig(raw=raw, path=tmp_path / "people.yaml"), backend=backend)
+
+    vocabulary = load_vocabulary("de_DE", 0)
+    rows = tables["people"]
+    assert {row["city"] for row in rows} <= set(vocabulary.cities)
+    assert {row["state"] for row in rows} <= set(vocabulary.states)
+    assert all(row["email"].split("@")[1] in vocabulary.domains for row in rows)
+    assert len({row["name"] for row in rows}) > 250
+
+
+def test_builtin_fallback_has_a_usable_vocabulary() -> None:
+    vocabulary = _fallback_vocabulary("en_US", 0)
+    assert len(vocabulary.cities) > 20 and len(vocabulary.states) == 50
+    assert len(set(vocabulary.user_names)) == len(vocabulary.first_names) * len(vocabulary.last_names)
@@ -1,21 +1,21 @@
 from __future__ import annotations
 
 import argparse
-import csv
 from pathlib import Path
 
 from csv_generator.generator.config import load_schema
-from csv_generator.generator.core import generate_dataset
+from csv_generator.generator.core import stream_dataset
 from csv_generator.generator.writers import write_tables
 from shared.cli.common import build_parser, command_main, ensure_path_exists, write_validation_report
-from shared.constraints.rules import validate_dataset
+from shared.constraints.streaming import expected_row_counts, validate_stream
+from shared.io.readers import iter_csv_batches
 
 GENERATOR_NAME = "csv_generator_wrapper"
 
 
 def _cmd_generate(args: argparse.Namespace) -> int:
     schema = load_schema(args.schema)
-    tables, order, seed = generate_dataset(schema, rows_override=args.rows, seed_override=args.seed)
+    tables, order, seed = stream_dataset(schema, rows_override=args.rows, seed_override=args.seed)
     write_tables(args.out, tables, order)
     print(f"Generated dataset '{schema.raw['dataset']}' with seed={seed} at {Path(args.out).resolve()}")
     return 0
@@ -31,26 +31,26 @@ def _cmd_describe(args: argparse.Namespace) -> int:
 
 def _cmd_validate(args: argparse.Namespace) -> int:
     schema = load_schema(args.schema)
-    tables, _, seed = generate_dataset(schema, rows_override=args.rows, seed_override=args.seed)
-    errors: list[str] = []
-    checks: list[dict] = []
-
-    dataset_errors = validate_dataset(tables, schema.raw)
-    checks.append({"name": "schema_constraints", "ok": not dataset_errors, "details": {"errors": dataset_errors}})
-    errors.extend(dataset_errors)
+    seed = int(args.seed if args.seed is not None else schema.raw.get("seed", 0))
+    specs = schema.raw["tables"]
+    paths = {table_name: Path(args.out) / f"{table_name}.csv" for table_name in specs}
+    for table_name, table_path in paths.items():
+        ensure_path_exists(table_path, description=f"CSV output for {table_name}")
+    result = validate_stream(
+        schema.raw,
+        {name: iter_csv_batches(path, specs[name].get("columns", [])) for name, path in paths.items()},
+    )
+    errors: list[str] = list(result.errors)
+    checks: list[dict] = [{"name": "schema_constraints", "ok": result.valid, "details": {"errors": result.errors}}]
 
     table_counts: dict[str, int] = {}
-    for table_name, expected_rows in {k: len(v) for k, v in tables.items()}.items():
-        table_path = Path(args.out) / f"{table_name}.csv"
-        ensure_path_exists(table_path, description=f"CSV output for {table_name}")
-        with table_path.open(newline="", encoding="utf-8") as handle:
-            reader = csv.DictReader(handle)
-            rows = list(reader)
-        table_counts[table_name] = len(rows)
-        row_ok = len(rows) == expected_rows
-        checks.append({"name": f"{table_name}_row_count", "ok": row_ok, "details": {"expected": expected_rows, "actual": len(rows)}})
+    for table_name, expected_rows in expected_row_counts(schema.raw, args.rows).items():
+        actual_rows = result.row_counts[table_name]
+        table_counts[table_name] = actual_rows
+        row_ok = actual_rows == expected_rows
+        checks.append({"name": f"{table_name}_row_count", "ok": row_ok, "details": {"expected": expected_rows, "actual": actual_rows}})
         if not row_ok:
-            errors.append(f"Row count mismatch for {table_name}: expected {expected_rows}, got {len(rows)}")
+            errors.append(f"Row count mismatch for {table_name}: expected {expected_rows}, got {actual_rows}")
 
     report = write_validation_report(
         args.out,
@@ -60,7 +60,7 @@ def _cmd_validate(args: argparse.Namespace) -> int:
         seed=seed,
         checks=checks,
         errors=errors,
-        stats={"table_counts": table_counts},
+        stats={"table_counts": table_counts, "violations": result.violations},
     )
     print(f"Validation report: {report}")
     return 1 if errors else 0
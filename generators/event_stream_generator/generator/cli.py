@@ -1,15 +1,30 @@
 from __future__ import annotations
 
 import argparse
+import io
 import json
-from datetime import datetime
+import sys
+from datetime import datetime, timedelta
+from itertools import islice
 from pathlib import Path
+from random import Random
 
 from shared.cli.common import build_parser, command_main, ensure_path_exists, write_validation_report
+from shared.io.digest import (
+    DEFAULT_DIGEST_CHUNK_ROWS,
+    TableDigest,
+    compare_digests,
+    fingerprint,
+    read_manifest,
+    write_manifest,
+)
+from shared.io.json_stream import COMPRESSIONS, compressed_path, open_binary
 from shared.schema_dsl.parser import load_schema
 
+from .follow import DEFAULT_RATE, RotatingSink, StreamSink, follow
 from .ndjson_writer import write_ndjson
-from .stream import generate_stream
+from .disorder import WATERMARK_KEY
+from .stream import StreamConfig, iter_events
 
 GENERATOR_NAME = "event_stream_generator"
 REQUIRED_EVENT_KEYS = ["event_id", "event_time", "user_id", "session_id", "event_type", "metadata", "source"]
@@ -23,16 +38,56 @@ def _resolve_rows(schema_raw: dict, rows: int | None) -> int:
     return rows if rows is not None else int(schema_raw.get("rows", 100))
 
 
-def _output_path(out_dir: str | Path) -> Path:
-    return Path(out_dir) / "events.ndjson"
+def _manifest_params(schema_raw: dict, seed: int, rows: int) -> dict:
+    return {"seed": seed, "rows": rows, "schema": fingerprint(schema_raw)}
+
+
+def _regenerate_chunk(seed: int, config: StreamConfig, rows: int, expected: dict) -> tuple[int, str] | None:
+    """Digest of one sampled chunk of the manifest entry ``expected``, regenerated.
+
+    Returns the chunk index and its digest, or ``None`` for an empty stream. The chunk is
+    picked from the recorded table digest, so a given output always samples the same one.
+    The stream is sequential (one RNG, the disorder buffer and per-user session state),
+    so every event up to the end of the chunk is regenerated and only the chunk is
+    digested: half the stream on average, the whole stream at worst.
+    """
+
+    chunks = expected.get("chunks", [])
+    if not chunks:
+        return None
+    chunk_rows = expected.get("chunk_rows", DEFAULT_DIGEST_CHUNK_ROWS)
+    chunk = Random(expected.get("digest")).randrange(len(chunks))
+    start = chunk * chunk_rows
+    digest = TableDigest(chunk_rows)
+    for record in islice(iter_events(seed, config, rows), start, start + chunk_rows):
+        digest.add(record)
+    return chunk, digest.to_dict()["chunks"][0] if digest.rows else ""
+
+
+def _output_path(out_dir: str | Path, compression: str | None = None) -> Path:
+    return compressed_path(Path(out_dir) / "events.ndjson", compression)
 
 
 def _cmd_generate(args: argparse.Namespace) -> int:
     schema = load_schema(args.schema)
     seed = _resolve_seed(schema.raw, args.seed)
+    config = StreamConfig.from_schema(schema.raw)
+    if args.follow:
+        # Unbounded unless --rows is given; the schema's row count only applies to batch output.
+        events = iter_events(seed, config, args.rows)
+        if args.rotate_events:
+            sink = RotatingSink(args.out, args.rotate_events, compression=args.compression)
+        else:
+            sink = StreamSink.open(args.sink)
+        written = follow(events, sink, args.rate, args.duration)
+        print(f"Followed event stream: {written} events", file=sys.stderr)
+        return 0
     rows = _resolve_rows(schema.raw, args.rows)
-    late = bool(schema.raw.get("late_events", False))
-    out_file = write_ndjson(_output_path(args.out), generate_stream(rows, seed, late_events=late))
+    digest = TableDigest()
+    events = digest.tap(iter_events(seed, config, rows))
+    out_file = write_ndjson(_output_path(args.out, args.compression), events, args.compression)
+    params = _manifest_params(schema.raw, seed, rows)
+    write_manifest(args.out, generator=GENERATOR_NAME, params=params, tables={"events": digest})
     print(f"Generated event stream at {out_file}")
     return 0
 
@@ -47,58 +102,120 @@ def _cmd_validate(args: argparse.Namespace) -> int:
     schema = load_schema(args.schema)
     seed = _resolve_seed(schema.raw, args.seed)
     rows = _resolve_rows(schema.raw, args.rows)
-    late = bool(schema.raw.get("late_events", False))
-    path = _output_path(args.out)
+    config = StreamConfig.from_schema(schema.raw)
+    bound = timedelta(seconds=config.disorder.max_lateness_seconds if config.disorder else 0)
+    path = _output_path(args.out, args.compression)
     ensure_path_exists(path, description="NDJSON output")
 
     checks: list[dict] = []
     errors: list[str] = []
-    parsed_events: list[dict] = []
-    with path.open(encoding="utf-8") as handle:
+    # One pass over the file, digested for the manifest's integrity check. Determinism is
+    # checked by regenerating the stream up to the end of one sampled manifest chunk and
+    # digesting that chunk or, without a manifest, record by record against the whole
+    # regenerated stream.
+    manifest = read_manifest(args.out)
+    expected_events = iter_events(seed, config, rows) if manifest is None else iter(())
+    expected_digest = manifest["tables"].get("events", {}) if manifest is not None else {}
+    digest = TableDigest(expected_digest.get("chunk_rows", DEFAULT_DIGEST_CHUNK_ROWS))
+    seen_ids: set[str] = set()
+    event_count = repeated = late_count = watermark_count = 0
+    bound_violations = watermark_violations = missing_key_count = 0
+    deterministic_ok = True
+    latest = watermark = None
+    with open_binary(path, "rb") as raw, io.TextIOWrapper(raw, encoding="utf-8") as handle:
         for line_no, line in enumerate(handle, 1):
             line = line.strip()
             if not line:
                 continue
             try:
-                parsed_events.append(json.loads(line))
+                record = json.loads(line)
             except json.JSONDecodeError as exc:
                 errors.append(f"Line {line_no} is invalid JSON: {exc}")
+                continue
+            if manifest is not None:
+                digest.add(record)
+            elif deterministic_ok and record != next(expected_events, None):
+                deterministic_ok = False
+            if WATERMARK_KEY in record:
+                watermark_count += 1
+                watermark = datetime.fromisoformat(record[WATERMARK_KEY])
+                continue
+            if any(req not in record for req in REQUIRED_EVENT_KEYS):
+                missing_key_count += 1
+            if record.get("event_id") in seen_ids:
+                # Duplicates and replays: only the first delivery is held to the bound.
+                repeated += 1
+                continue
+            seen_ids.add(record.get("event_id"))
+            event_count += 1
+            if "event_time" not in record:
+                continue
+            event_time = datetime.fromisoformat(record["event_time"])
+            if latest is not None and event_time < latest:
+                late_count += 1
+                if event_time < latest - bound:
+                    bound_violations += 1
+            if watermark is not None and event_time < watermark:
+                watermark_violations += 1
+            latest = event_time if latest is None else max(latest, event_time)
+    determinism = {"seed": seed, "method": "regenerated"}
+    integrity: list[str] | None = None
+    if manifest is not None:
+        expected_params = _manifest_params(schema.raw, seed, rows)
+        mismatches = [
+            f"manifest {name} is {manifest['params'].get(name)!r}, expected {value!r}"
+            for name, value in expected_params.items()
+            if manifest["params"].get(name) != value
+        ]
+        sampled = None if mismatches else _regenerate_chunk(seed, config, rows, expected_digest)
+        sampled_rows = None
+        if sampled is not None:
+            chunk, chunk_digest = sampled
+            first = chunk * digest.chunk_rows + 1
+            last = min(first + digest.chunk_rows - 1, expected_digest.get("rows", 0))
+            sampled_rows = f"{first}-{last}"
+            if chunk_digest != expected_digest["chunks"][chunk]:
+                mismatches.append(f"regenerated events differ from the manifest in rows {sampled_rows}")
+        deterministic_ok = not mismatches
+        determinism.update(method="manifest_sample", sampled_rows=sampled_rows, mismatches=mismatches)
+        integrity = compare_digests("events", expected_digest, digest)
+    elif next(expected_events, None) is not None:
+        deterministic_ok = False
 
-    checks.append({"name": "output_parseable", "ok": not errors, "details": {"path": str(path), "rows": len(parsed_events)}})
+    checks.append({"name": "output_parseable", "ok": not errors, "details": {"path": str(path), "rows": event_count}})
 
-    non_decreasing = 0
-    for i in range(1, len(parsed_events)):
-        if datetime.fromisoformat(parsed_events[i]["event_time"]) >= datetime.fromisoformat(parsed_events[i - 1]["event_time"]):
-            non_decreasing += 1
-    ratio = non_decreasing / max(1, len(parsed_events) - 1)
-    ordered_ok = ratio == 1.0 if not late else ratio >= 0.9
-    checks.append({"name": "event_order", "ok": ordered_ok, "details": {"ratio": ratio, "late_events": late}})
+    ordered_ok = not bound_violations and not watermark_violations
+    order_details = {
+        "max_lateness_seconds": bound.total_seconds(),
+        "late_events": late_count,
+        "bound_violations": bound_violations,
+        "watermarks": watermark_count,
+        "watermark_violations": watermark_violations,
+        "repeated_deliveries": repeated,
+    }
+    checks.append({"name": "event_order", "ok": ordered_ok, "details": order_details})
     if not ordered_ok:
         errors.append("Event ordering check failed")
 
-    missing_key_count = 0
-    for event in parsed_events:
-        for req in REQUIRED_EVENT_KEYS:
-            if req not in event:
-                missing_key_count += 1
-                break
     keys_ok = missing_key_count == 0
     checks.append({"name": "required_keys", "ok": keys_ok, "details": {"missing_events": missing_key_count}})
     if not keys_ok:
         errors.append("Some events are missing required keys")
 
-    row_ok = len(parsed_events) == rows
-    checks.append({"name": "row_count_match", "ok": row_ok, "details": {"expected": rows, "actual": len(parsed_events)}})
+    row_ok = event_count == rows
+    checks.append({"name": "row_count_match", "ok": row_ok, "details": {"expected": rows, "actual": event_count}})
     if not row_ok:
-        errors.append(f"Row count mismatch: expected {rows}, got {len(parsed_events)}")
+        errors.append(f"Row count mismatch: expected {rows}, got {event_count}")
 
-    # deterministic generation check
-    expected_events = generate_stream(rows, seed, late_events=late)
-    deterministic_ok = parsed_events == expected_events
-    checks.append({"name": "deterministic_seed", "ok": deterministic_ok, "details": {"seed": seed}})
+    checks.append({"name": "deterministic_seed", "ok": deterministic_ok, "details": determinism})
     if not deterministic_ok:
         errors.append("Output does not match deterministic generation for schema+seed")
 
+    if integrity is not None:
+        checks.append({"name": "manifest_integrity", "ok": not integrity, "details": {"mismatches": integrity}})
+        if integrity:
+            errors.append("Output file does not match the digests in its manifest")
+
     report = write_validation_report(
         args.out,
         generator=GENERATOR_NAME,
@@ -107,19 +224,39 @@ def _cmd_validate(args: argparse.Namespace) -> int:
         seed=seed,
         checks=checks,
         errors=errors,
-        stats={"event_count": len(parsed_events)},
+        stats={"event_count": event_count},
     )
     print(f"Validation report: {report}")
     return 1 if errors else 0
 
 
-def main() -> None:
-    command_main(
-        build_parser(
-            "Event stream generator",
-            {"describe": _cmd_describe, "generate": _cmd_generate, "validate": _cmd_validate},
-        )
+def build_cli_parser() -> argparse.ArgumentParser:
+    parser = build_parser(
+        "Event stream generator",
+        {"describe": _cmd_describe, "generate": _cmd_generate, "validate": _cmd_validate},
+    )
+    for cmd in parser._subparsers._group_actions[0].choices.values():
+        cmd.add_argument("--compression", choices=COMPRESSIONS, default=None, help="Compress the output file")
+    generate = parser._subparsers._group_actions[0].choices["generate"]
+    generate.add_argument(
+        "--follow",
+        action="store_true",
+        help="Emit events continuously (unbounded unless --rows) instead of writing events.ndjson",
     )
+    generate.add_argument("--rate", type=float, default=DEFAULT_RATE, help="Target events/sec for --follow (0 = unthrottled)")
+    generate.add_argument("--duration", type=float, default=None, help="Stop --follow after this many seconds")
+    generate.add_argument("--sink", default="-", help="--follow target: '-' for stdout, or a file/FIFO path")
+    generate.add_argument(
+        "--rotate-events",
+        type=int,
+        default=None,
+        help="With --follow, write rotating events-NNNNN.ndjson files of this many events into --out",
+    )
+    return parser
+
+
+def main() -> None:
+    command_main(build_cli_parser())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import heapq
+from collections import deque
+from dataclasses import dataclass, fields
+from random import Random
+from typing import Any, Callable, Iterable, Iterator
+
+LATENESS_DISTRIBUTIONS = ("uniform", "exponential")
+WATERMARK_KEY = "watermark"
+
+
+@dataclass(frozen=True)
+class DisorderConfig:
+    """How a time-ordered stream is delivered out of order.
+
+    A ``late_rate`` share of events arrives late by 1..``max_lateness_seconds`` seconds
+    of event time (``uniform``, or ``exponential`` with mean ``mean_lateness_seconds``,
+    capped at the maximum). ``duplicate_rate`` of events are delivered a second time
+    within the same bound. ``replay_rate`` re-delivers an event from up to
+    ``replay_window`` events back; replays are the one thing allowed to break the bound.
+    With ``watermark_interval_seconds``, watermark records are emitted (see
+    ``apply_disorder``).
+    """
+
+    late_rate: float = 0.05
+    max_lateness_seconds: int = 30
+    lateness_distribution: str = "uniform"
+    mean_lateness_seconds: float = 10.0
+    duplicate_rate: float = 0.0
+    replay_rate: float = 0.0
+    replay_window: int = 1000
+    watermark_interval_seconds: int = 0
+
+    def __post_init__(self) -> None:
+        for name in ("late_rate", "duplicate_rate", "replay_rate"):
+            if not 0.0 <= getattr(self, name) <= 1.0:
+                raise ValueError(f"{name} must be between 0 and 1")
+        if self.max_lateness_seconds < 1 or self.replay_window < 1 or self.watermark_interval_seconds < 0:
+            raise ValueError("max_lateness_seconds and replay_window must be >= 1, watermark_interval_seconds >= 0")
+        if self.lateness_distribution not in LATENESS_DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown lateness distribution {self.lateness_distribution!r}; "
+                f"expected one of {', '.join(LATENESS_DISTRIBUTIONS)}"
+            )
+        if self.mean_lateness_seconds <= 0:
+            raise ValueError("mean_lateness_seconds must be > 0")
+
+    @classmethod
+    def from_schema(cls, raw: dict[str, Any]) -> "DisorderConfig":
+        unknown = sorted(set(raw) - {field.name for field in fields(cls)})
+        if unknown:
+            raise ValueError(f"Unknown disorder settings: {', '.join(unknown)}")
+        return cls(**raw)
+
+    def lateness(self, rng: Random) -> int:
+        if self.lateness_distribution == "exponential":
+            return min(self.max_lateness_seconds, 1 + int(rng.expovariate(1.0 / self.mean_lateness_seconds)))
+        return rng.randint(1, self.max_lateness_seconds)
+
+
+def apply_disorder(
+    events: Iterable[tuple[int, dict]],
+    config: DisorderConfig,
+    rng: Random,
+    watermark: Callable[[int], dict] = lambda seconds: {WATERMARK_KEY: seconds},
+) -> Iterator[tuple[int, dict]]:
+    """Deliver ``(event_seconds, event)`` pairs, given in event-time order, in arrival order.
+
+    Every delivery arrives ``lateness`` seconds after its event time (``0`` when on
+    time) and is held in a heap until the input clock reaches its arrival, so at most
+    ``max_lateness_seconds`` worth of events is buffered. Event timestamps are never
+    changed: the input order is the ground truth.
+
+    Except for replays, each delivered event satisfies ``event_time >= (latest event
+    time delivered so far) - max_lateness_seconds``. When ``watermark_interval_seconds``
+    is set, ``(W, watermark(W))`` records are yielded for watermark times ``W``
+    (seconds) at multiples of the interval as soon as no event with ``event_time < W`` can
+    still arrive (replays aside).
+    """
+
+    pending: list[tuple[int, int, int, dict]] = []
+    recent: deque[tuple[int, dict]] = deque(maxlen=config.replay_window)
+    interval = config.watermark_interval_seconds
+    bound = config.max_lateness_seconds
+    next_watermark = None
+    order = 0
+
+    def deliver(until: int | None) -> Iterator[tuple[int, dict]]:
+        nonlocal next_watermark
+        while pending and (until is None or pending[0][0] <= until):
+            _, _, seconds, event = heapq.heappop(pending)
+            yield seconds, event
+        if interval and until is not None:
+            if next_watermark is None:
+                next_watermark = max(0, (until - bound) // interval * interval)
+            while next_watermark + bound <= until:
+                yield next_watermark, watermark(next_watermark)
+                next_watermark += interval
+
+    for seconds, event in events:
+        yield from deliver(seconds)
+        copies = [0]
+        if rng.random() < config.late_rate:
+            copies[0] = config.lateness(rng)
+        if config.duplicate_rate and rng.random() < config.duplicate_rate:
+            copies.append(rng.randint(0, bound))
+        for delay in copies:
+            order += 1
+            heapq.heappush(pending, (seconds + delay, order, seconds, event))
+        if config.replay_rate and recent and rng.random() < config.replay_rate:
+            order += 1
+            replayed_seconds, replayed = recent[rng.randrange(len(recent))]
+            heapq.heappush(pending, (seconds, order, replayed_seconds, replayed))
+        recent.append((seconds, event))
+        yield from deliver(seconds)
+    yield from deliver(None)
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterable
+
+from shared.io.json_stream import JsonRowWriter, compressed_path, json_encoder
+
+DEFAULT_RATE = 100.0
+DEFAULT_FLUSH_EVENTS = 1000
+
+
+class RateLimiter:
+    """Pace a loop to ``rate`` iterations per second (``0`` = unthrottled).
+
+    Sleeps are scheduled against the start time rather than the previous event, so
+    short stalls are caught up instead of accumulating drift. ``on_idle`` runs before
+    each sleep, e.g. to flush buffered output while ahead of schedule.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if rate < 0:
+            raise ValueError("rate must be >= 0")
+        self.rate = rate
+        self.clock = clock
+        self.sleep = sleep
+        self.started = clock()
+        self.count = 0
+
+    def wait(self, on_idle: Callable[[], None] | None = None) -> None:
+        self.count += 1
+        if not self.rate:
+            return
+        delay = self.started + self.count / self.rate - self.clock()
+        if delay > 0:
+            if on_idle is not None:
+                on_idle()
+            self.sleep(delay)
+
+
+class StreamSink:
+    """NDJSON lines to a binary stream (stdout or a FIFO), flushed every ``flush_events``
+    events and whenever ``follow`` is ahead of its rate."""
+
+    def __init__(self, handle: BinaryIO, flush_events: int = DEFAULT_FLUSH_EVENTS, close: bool = False) -> None:
+        self.handle = handle
+        self.flush_events = flush_events
+        self.close_handle = close
+        self.pending = 0
+        self._encode = json_encoder()
+
+    @classmethod
+    def open(cls, target: str, flush_events: int = DEFAULT_FLUSH_EVENTS) -> "StreamSink":
+        """``"-"`` for stdout, otherwise a file or FIFO path (opening a FIFO waits for a reader)."""
+
+        if target == "-":
+            return cls(sys.stdout.buffer, flush_events)
+        return cls(open(target, "ab"), flush_events, close=True)
+
+    def write(self, event: dict) -> None:
+        self.handle.write(self._encode(event) + b"\n")
+        self.pending += 1
+        if self.pending >= self.flush_events:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.pending:
+            self.handle.flush()
+            self.pending = 0
+
+    def close(self) -> None:
+        self.handle.flush()
+        if self.close_handle:
+            self.handle.close()
+
+
+class RotatingSink:
+    """NDJSON files ``<prefix>-00000.ndjson``, ``-00001``... of at most ``max_events`` events each."""
+
+    def __init__(self, out_dir: str | Path, max_events: int, prefix: str = "events", compression: str | None = None) -> None:
+        if max_events < 1:
+            raise ValueError("max_events must be >= 1")
+        self.out_dir = Path(out_dir)
+        self.max_events = max_events
+        self.prefix = prefix
+        self.compression = compression
+        self.files = 0
+        self.writer: JsonRowWriter | None = None
+
+    def write(self, event: dict) -> None:
+        if self.writer is None or self.writer.rows >= self.max_events:
+            self.close()
+            path = compressed_path(self.out_dir / f"{self.prefix}-{self.files:05d}.ndjson", self.compression)
+            # Small chunks, so a slow stream still reaches the file regularly.
+            self.writer = JsonRowWriter(path, "ndjson", self.compression, buffer_size=1 << 16)
+            self.files += 1
+        self.writer.write(event)
+
+    def flush(self) -> None:
+        if self.writer is not None:
+            self.writer.flush()
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+def follow(
+    events: Iterable[dict],
+    sink: StreamSink | RotatingSink,
+    rate: float = DEFAULT_RATE,
+    duration: float | None = None,
+    limiter: RateLimiter | None = None,
+) -> int:
+    """Write ``events`` to ``sink`` at ``rate`` events/sec until they run out or ``duration``
+    seconds pass; returns the number written. The sink is closed on exit, including on
+    ``KeyboardInterrupt`` or a closed pipe.
+    """
+
+    limiter = limiter or RateLimiter(rate)
+    deadline = None if duration is None else limiter.started + duration
+    written = 0
+    try:
+        for event in events:
+            if deadline is not None and limiter.clock() >= deadline:
+                break
+            sink.write(event)
+            written += 1
+            limiter.wait(sink.flush)
+    except (KeyboardInterrupt, BrokenPipeError):
+        pass
+    finally:
+        try:
+            sink.close()
+        except BrokenPipeError:
+            pass
+    return written
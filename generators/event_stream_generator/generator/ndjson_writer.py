@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-import json
 from pathlib import Path
+from typing import Iterable
 
+from shared.io.json_stream import write_json_rows
 
-def write_ndjson(path: str, events: list[dict]) -> Path:
-    out = Path(path)
-    out.parent.mkdir(parents=True, exist_ok=True)
-    out.write_text("\n".join(json.dumps(e) for e in events) + "\n", encoding="utf-8")
-    return out
+
+def write_ndjson(path: str | Path, events: Iterable[dict], compression: str | None = None) -> Path:
+    write_json_rows(path, events, "ndjson", compression=compression)
+    return Path(path)
@@ -1,5 +1,169 @@
 from __future__ import annotations
 
+import heapq
+from array import array
+from bisect import bisect_right
+from itertools import accumulate
+from random import Random
+from typing import Iterator, Mapping, Sequence
+
+END = "end"
+_USER_BITS = 32
+_USER_MASK = (1 << _USER_BITS) - 1
+
 
 def session_id_for(user_id: int, bucket: int) -> str:
     return f"s_{user_id}_{bucket}"
+
+
+def default_transitions(states: Sequence[str], end_probability: float = 0.0) -> dict[str, dict[str, float]]:
+    """Sticky transitions: end with ``end_probability``, otherwise stay or move uniformly."""
+
+    rows: dict[str, dict[str, float]] = {}
+    go_on = 1.0 - end_probability
+    for state in states:
+        others = [other for other in states if other != state]
+        row = {state: go_on / 2 if others else go_on}
+        row.update({other: go_on / 2 / len(others) for other in others})
+        if end_probability:
+            row[END] = end_probability
+        rows[state] = row
+    return rows
+
+
+class MarkovChain:
+    """Transitions between ``states`` sampled with one ``random()`` and a bisect.
+
+    ``transitions[state]`` maps next states (and optionally ``"end"``) to weights, which
+    are normalized per row. ``step`` returns the index of the next state, or
+    ``len(states)`` when the chain ends.
+    """
+
+    __slots__ = ("states", "start", "rows", "can_end")
+
+    def __init__(
+        self,
+        states: Sequence[str],
+        transitions: Mapping[str, Mapping[str, float]],
+        start: Mapping[str, float] | None = None,
+    ) -> None:
+        self.states = tuple(states)
+        targets = [*self.states, END]
+        self.start = self._cumulative([(start or {}).get(state, 1.0) for state in self.states])
+        self.rows = []
+        for state in self.states:
+            weights = transitions.get(state)
+            if weights is None:
+                raise ValueError(f"Missing transitions for state {state!r}")
+            unknown = sorted(set(weights) - set(targets))
+            if unknown:
+                raise ValueError(f"Transitions of {state!r} name unknown states: {', '.join(unknown)}")
+            self.rows.append(self._cumulative([float(weights.get(target, 0.0)) for target in targets]))
+        self.can_end = any(row[-2] < 1.0 for row in self.rows)
+
+    @staticmethod
+    def _cumulative(weights: list[float]) -> array:
+        total = sum(weights)
+        if total <= 0 or min(weights) < 0:
+            raise ValueError("Transition weights must be >= 0 and not all zero")
+        cumulative = array("d", accumulate(weight / total for weight in weights))
+        cumulative[-1] = 1.0
+        return cumulative
+
+    def first(self, rng: Random) -> int:
+        return bisect_right(self.start, rng.random())
+
+    def step(self, state: int, rng: Random) -> int:
+        return bisect_right(self.rows[state], rng.random())
+
+
+class SessionSimulator:
+    """Interleave the sessions of ``users`` concurrent users in time order.
+
+    Each user is a small state machine: while a session is active, events follow each
+    other after 1..``max_gap_seconds`` seconds, with event types and pages drawn from
+    their Markov chains. The session ends when the event-type chain reaches ``"end"``;
+    the user then idles for ``session_timeout_seconds`` plus an exponential wait of mean
+    ``mean_idle_seconds`` before the next session starts (so any gap of at least the
+    timeout separates sessions). Users wait in a heap keyed by their next event time.
+
+    Per-user state lives in typed arrays and heap entries are single ints
+    (``time << 32 | user``), about 50 bytes per user, so millions of users fit. ``run``
+    yields ``(seconds, user_id, session, event_type, page, source)`` tuples
+    with offsets in seconds and vocabulary indexes.
+    """
+
+    __slots__ = (
+        "users",
+        "event_types",
+        "pages",
+        "sources",
+        "max_gap_seconds",
+        "session_timeout_seconds",
+        "mean_idle_seconds",
+    )
+
+    def __init__(
+        self,
+        users: int,
+        event_types: MarkovChain,
+        pages: MarkovChain,
+        sources: int,
+        max_gap_seconds: int,
+        session_timeout_seconds: int,
+        mean_idle_seconds: float,
+    ) -> None:
+        if not 1 <= users <= _USER_MASK:
+            raise ValueError(f"users must be between 1 and {_USER_MASK}")
+        if mean_idle_seconds <= 0:
+            raise ValueError("mean_idle_seconds must be > 0")
+        if max_gap_seconds >= session_timeout_seconds:
+            raise ValueError("max_gap_seconds must be below session_timeout_seconds")
+        if pages.can_end:
+            raise ValueError("Page transitions cannot end a session")
+        if len(event_types.states) > 255 or len(pages.states) > 255 or sources > 255:
+            raise ValueError("At most 255 event types, pages and sources are supported")
+        self.users = users
+        self.event_types = event_types
+        self.pages = pages
+        self.sources = sources
+        self.max_gap_seconds = max_gap_seconds
+        self.session_timeout_seconds = session_timeout_seconds
+        self.mean_idle_seconds = mean_idle_seconds
+
+    def run(self, rng: Random) -> Iterator[tuple[int, int, int, int, int, int]]:
+        users = self.users
+        event_chain, page_chain = self.event_types, self.pages
+        end = len(event_chain.states)
+        sessions = array("L", [0]) * (users + 1)
+        event_type = array("B", bytes(users + 1))
+        page = array("B", bytes(users + 1))
+        source = array("B", bytes(users + 1))
+        idle_rate = 1.0 / self.mean_idle_seconds
+        heap = []
+        for user in range(1, users + 1):
+            event_type[user] = event_chain.first(rng)
+            page[user] = page_chain.first(rng)
+            source[user] = rng.randrange(self.sources)
+            heap.append((int(rng.expovariate(idle_rate)) << _USER_BITS) | user)
+        heapq.heapify(heap)
+        heappush, heappop = heapq.heappush, heapq.heappop
+        max_gap, timeout = self.max_gap_seconds, self.session_timeout_seconds
+
+        while True:
+            key = heappop(heap)
+            user = key & _USER_MASK
+            now = key >> _USER_BITS
+            yield now, user, sessions[user], event_type[user], page[user], source[user]
+            following = event_chain.step(event_type[user], rng)
+            if following == end:
+                sessions[user] += 1
+                event_type[user] = event_chain.first(rng)
+                page[user] = page_chain.first(rng)
+                source[user] = rng.randrange(self.sources)
+                now += timeout + int(rng.expovariate(idle_rate))
+            else:
+                event_type[user] = following
+                page[user] = page_chain.step(page[user], rng)
+                now += rng.randint(1, max_gap)
+            heappush(heap, (now << _USER_BITS) | user)
@@ -1,31 +1,159 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from itertools import count, islice
 from random import Random
+from typing import Any, Iterator, Mapping
 
-from .sessionization import session_id_for
-
-
-def generate_stream(rows: int, seed: int, late_events: bool = False) -> list[dict]:
-    rng = Random(seed)
-    start = datetime(2024, 1, 1, 0, 0, 0)
-    events = []
-    current = start
-    for i in range(rows):
-        user_id = rng.randint(1, 50)
-        current += timedelta(seconds=rng.randint(1, 20))
-        event_time = current
-        if late_events and rng.random() < 0.05:
-            event_time = current - timedelta(seconds=rng.randint(1, 30))
-        events.append(
-            {
-                "event_id": f"e_{i+1}",
-                "event_time": event_time.isoformat(),
-                "user_id": user_id,
-                "session_id": session_id_for(user_id, i // 5),
-                "event_type": rng.choice(["view", "click", "purchase"]),
-                "metadata": {"page": rng.choice(["/", "/pricing", "/docs"])},
-                "source": rng.choice(["web", "mobile"]),
-            }
+from .disorder import WATERMARK_KEY, DisorderConfig, apply_disorder
+from .sessionization import MarkovChain, SessionSimulator, default_transitions, session_id_for
+
+SESSION_MODELS = ("bucket", "state_machine")
+
+
+@dataclass(frozen=True)
+class StreamConfig:
+    """Event population and vocabularies of a stream, read from the schema.
+
+    ``session_model="bucket"`` starts a new session id every ``session_events`` events.
+    ``session_model="state_machine"`` simulates users with ``SessionSimulator``: event
+    types follow ``transitions`` (next type or ``"end"`` -> weight, per type; by default
+    sticky with ``session_end_rate``), pages follow ``page_transitions``, and sessions are
+    separated by at least ``session_timeout_seconds`` of inactivity.
+
+    ``disorder`` delivers the stream out of order (see ``DisorderConfig``); in the schema
+    it is a ``disorder`` mapping, or ``late_events: true`` for the default model.
+    """
+
+    users: int = 50
+    start_time: datetime = datetime(2024, 1, 1, 0, 0, 0)
+    max_gap_seconds: int = 20
+    event_types: tuple[str, ...] = ("view", "click", "purchase")
+    pages: tuple[str, ...] = ("/", "/pricing", "/docs")
+    sources: tuple[str, ...] = ("web", "mobile")
+    session_model: str = "bucket"
+    session_events: int = 5
+    session_timeout_seconds: int = 1800
+    mean_idle_seconds: float = 600.0
+    session_end_rate: float = 0.2
+    transitions: Mapping[str, Mapping[str, float]] | None = None
+    page_transitions: Mapping[str, Mapping[str, float]] | None = None
+    disorder: DisorderConfig | None = None
+
+    def __post_init__(self) -> None:
+        if self.users < 1 or self.max_gap_seconds < 1 or self.session_events < 1:
+            raise ValueError("users, max_gap_seconds and session_events must be >= 1")
+        if not (self.event_types and self.pages and self.sources):
+            raise ValueError("event_types, pages and sources must not be empty")
+        if self.session_model not in SESSION_MODELS:
+            raise ValueError(f"Unknown session model {self.session_model!r}; expected one of {', '.join(SESSION_MODELS)}")
+
+    @classmethod
+    def from_schema(cls, raw: dict[str, Any]) -> "StreamConfig":
+        values: dict[str, Any] = {}
+        for name in ("users", "max_gap_seconds", "session_events", "session_timeout_seconds"):
+            if name in raw:
+                values[name] = int(raw[name])
+        for name in ("event_types", "pages", "sources"):
+            if name in raw:
+                values[name] = tuple(raw[name])
+        if "start_time" in raw:
+            values["start_time"] = datetime.fromisoformat(str(raw["start_time"]))
+        if "session_model" in raw:
+            values["session_model"] = str(raw["session_model"])
+        if raw.get("disorder") is not None:
+            values["disorder"] = DisorderConfig.from_schema(dict(raw["disorder"]))
+        elif raw.get("late_events"):
+            values["disorder"] = DisorderConfig()
+        for name in ("mean_idle_seconds", "session_end_rate"):
+            if name in raw:
+                values[name] = float(raw[name])
+        for name in ("transitions", "page_transitions"):
+            if name in raw:
+                values[name] = dict(raw[name])
+        return cls(**values)
+
+    def simulator(self) -> SessionSimulator:
+        event_types = MarkovChain(
+            self.event_types, self.transitions or default_transitions(self.event_types, self.session_end_rate)
         )
-    return events
+        pages = MarkovChain(self.pages, self.page_transitions or default_transitions(self.pages))
+        return SessionSimulator(
+            self.users,
+            event_types,
+            pages,
+            len(self.sources),
+            self.max_gap_seconds,
+            self.session_timeout_seconds,
+            self.mean_idle_seconds,
+        )
+
+
+def iter_events(seed: int, config: StreamConfig | None = None, rows: int | None = None) -> Iterator[dict]:
+    """Yield events one at a time in delivery order; ``rows=None`` yields an unbounded stream.
+
+    ``rows`` counts generated events: with ``disorder``, duplicates, replays and
+    ``{"watermark": <time>}`` records come on top. Only the simulated clock (plus, for
+    ``state_machine``, a few bytes of session state per user and, with ``disorder``, the
+    events inside the lateness bound) is kept, so memory stays flat however long the
+    stream runs.
+    """
+
+    config = config or StreamConfig()
+    timed = _timed_events(Random(seed), config, rows)
+    if config.disorder is not None:
+        start = config.start_time
+
+        def watermark(seconds: int) -> dict:
+            return {WATERMARK_KEY: (start + timedelta(seconds=seconds)).isoformat()}
+
+        timed = apply_disorder(timed, config.disorder, Random(f"{seed}:disorder"), watermark)
+    for _, event in timed:
+        yield event
+
+
+def _timed_events(rng: Random, config: StreamConfig, rows: int | None) -> Iterator[tuple[int, dict]]:
+    """``(seconds since start_time, event)`` pairs in event-time order."""
+
+    if config.session_model == "state_machine":
+        yield from _simulated_events(rng, config, rows)
+        return
+    start = config.start_time
+    clock = 0
+    indexes = count() if rows is None else range(rows)
+    for i in indexes:
+        user_id = rng.randint(1, config.users)
+        clock += rng.randint(1, config.max_gap_seconds)
+        yield clock, {
+            "event_id": f"e_{i+1}",
+            "event_time": (start + timedelta(seconds=clock)).isoformat(),
+            "user_id": user_id,
+            "session_id": session_id_for(user_id, i // config.session_events),
+            "event_type": rng.choice(config.event_types),
+            "metadata": {"page": rng.choice(config.pages)},
+            "source": rng.choice(config.sources),
+        }
+
+
+def _simulated_events(rng: Random, config: StreamConfig, rows: int | None) -> Iterator[tuple[int, dict]]:
+    sessions = config.simulator().run(rng)
+    if rows is not None:
+        sessions = islice(sessions, rows)
+    start = config.start_time
+    event_types, pages, sources = config.event_types, config.pages, config.sources
+    for i, (seconds, user_id, session, event_type, page, source) in enumerate(sessions):
+        yield seconds, {
+            "event_id": f"e_{i+1}",
+            "event_time": (start + timedelta(seconds=seconds)).isoformat(),
+            "user_id": user_id,
+            "session_id": session_id_for(user_id, session),
+            "event_type": event_types[event_type],
+            "metadata": {"page": pages[page]},
+            "source": sources[source],
+        }
+
+
+def generate_stream(rows: int, seed: int, late_events: bool = False, config: StreamConfig | None = None) -> list[dict]:
+    config = config or StreamConfig(disorder=DisorderConfig() if late_events else None)
+    return list(iter_events(seed, config, rows))
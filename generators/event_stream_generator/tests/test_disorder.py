@@ -0,0 +1,94 @@
+import json
+from datetime import datetime, timedelta
+from random import Random
+
+import pytest
+
+from generators.event_stream_generator.generator.cli import main
+from generators.event_stream_generator.generator.disorder import WATERMARK_KEY, DisorderConfig, apply_disorder
+
+DISORDER = {
+    "late_rate": 0.2,
+    "max_lateness_seconds": 40,
+    "lateness_distribution": "exponential",
+    "duplicate_rate": 0.05,
+    "replay_rate": 0.02,
+    "replay_window": 50,
+    "watermark_interval_seconds": 60,
+}
+
+
+def _ordered(count):
+    rng = Random(1)
+    seconds = 0
+    for i in range(count):
+        seconds += rng.randint(0, 6)
+        yield seconds, {"event_id": i}
+
+
+def test_disorder_is_bounded_and_watermarks_are_correct():
+    config = DisorderConfig(**DISORDER)
+    delivered = list(apply_disorder(_ordered(3000), config, Random(5)))
+
+    seen = set()
+    latest = watermark = -1
+    late = repeats = 0
+    for seconds, record in delivered:
+        if WATERMARK_KEY in record:
+            assert seconds > watermark
+            watermark = seconds
+            continue
+        if record["event_id"] in seen:
+            repeats += 1
+            continue
+        seen.add(record["event_id"])
+        assert seconds >= latest - 40
+        assert seconds >= watermark
+        late += seconds < latest
+        latest = max(latest, seconds)
+    assert seen == set(range(3000))
+    assert late > 100 and repeats > 100
+
+
+def test_exponential_lateness_is_capped():
+    config = DisorderConfig(lateness_distribution="exponential", mean_lateness_seconds=50, max_lateness_seconds=20)
+    rng = Random(2)
+    samples = [config.lateness(rng) for _ in range(2000)]
+    assert min(samples) >= 1 and max(samples) == 20
+
+
+def test_invalid_settings_are_rejected():
+    with pytest.raises(ValueError, match="Unknown disorder settings"):
+        DisorderConfig.from_schema({"late_rate": 0.1, "jitter": 3})
+    with pytest.raises(ValueError, match="late_rate"):
+        DisorderConfig(late_rate=1.5)
+
+
+def test_cli_validates_bound_and_watermarks(tmp_path, monkeypatch):
+    schema = tmp_path / "late.yaml"
+    schema.write_text(json.dumps({"dataset": "late", "seed": 9, "rows": 400, "disorder": DISORDER}))
+    out = tmp_path / "out"
+
+    def run(command):
+        monkeypatch.setattr("sys.argv", ["prog", command, "--schema", str(schema), "--out", str(out)])
+        try:
+            main()
+        except SystemExit as exc:
+            assert exc.code == 1
+        return json.loads((out / "validation_report.json").read_text()) if command == "validate" else None
+
+    run("generate")
+    report = run("validate")
+    order = next(check for check in report["checks"] if check["name"] == "event_order")
+    assert report["ok"] is True
+    assert order["details"]["watermarks"] > 0 and order["details"]["late_events"] > 0
+
+    lines = (out / "events.ndjson").read_text().splitlines()
+    event = json.loads(lines[-1])
+    event["event_id"] = "e_new"
+    event["event_time"] = (datetime.fromisoformat(event["event_time"]) - timedelta(hours=1)).isoformat()
+    (out / "events.ndjson").write_text("\n".join([*lines, json.dumps(event)]) + "\n")
+    report = run("validate")
+    order = next(check for check in report["checks"] if check["name"] == "event_order")
+    assert order["ok"] is False
+    assert order["details"]["bound_violations"] == 1
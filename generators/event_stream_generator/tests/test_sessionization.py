@@ -0,0 +1,81 @@
+import json
+from datetime import datetime
+from random import Random
+
+import pytest
+
+from generators.event_stream_generator.generator.cli import main
+from generators.event_stream_generator.generator.sessionization import MarkovChain, SessionSimulator, default_transitions
+from generators.event_stream_generator.generator.stream import StreamConfig, iter_events
+
+
+def test_sessions_follow_timeouts_and_stay_time_ordered():
+    config = StreamConfig(session_model="state_machine", users=40, max_gap_seconds=30, session_timeout_seconds=600)
+    events = list(iter_events(11, config, 5000))
+    times = [datetime.fromisoformat(event["event_time"]) for event in events]
+    assert times == sorted(times)
+
+    last: dict[int, tuple[datetime, str]] = {}
+    new_sessions = 0
+    for event, time in zip(events, times):
+        previous = last.get(event["user_id"])
+        if previous is not None:
+            gap = (time - previous[0]).total_seconds()
+            if event["session_id"] == previous[1]:
+                assert 1 <= gap <= 30
+            else:
+                assert gap >= 600
+                new_sessions += 1
+        last[event["user_id"]] = (time, event["session_id"])
+    assert new_sessions > 50
+
+
+def test_markov_chain_follows_the_transitions():
+    chain = MarkovChain(
+        ["land", "browse", "buy"],
+        {"land": {"browse": 1}, "browse": {"browse": 1, "buy": 1}, "buy": {"end": 1}},
+        start={"land": 1, "browse": 0, "buy": 0},
+    )
+    rng = Random(3)
+    for _ in range(200):
+        state = chain.first(rng)
+        path = [state]
+        while state != 3:
+            state = chain.step(state, rng)
+            path.append(state)
+        assert path[0] == 0 and path[1] == 1 and path[-2:] == [2, 3]
+
+
+def test_schema_transitions_drive_event_types():
+    config = StreamConfig.from_schema(
+        {
+            "session_model": "state_machine",
+            "users": 5,
+            "event_types": ["view", "purchase"],
+            "transitions": {"view": {"view": 3, "purchase": 1}, "purchase": {"end": 1}},
+        }
+    )
+    events = list(iter_events(2, config, 2000))
+    by_session: dict[str, list[str]] = {}
+    for event in events:
+        by_session.setdefault(event["session_id"], []).append(event["event_type"])
+    assert len(by_session) > 5
+    assert all("purchase" not in types[:-1] for types in by_session.values())
+
+
+def test_invalid_models_are_rejected():
+    with pytest.raises(ValueError, match="unknown states"):
+        MarkovChain(["a"], {"a": {"b": 1}})
+    pages = MarkovChain(["/"], {"/": {"/": 1, "end": 1}})
+    with pytest.raises(ValueError, match="Page transitions"):
+        SessionSimulator(3, MarkovChain(["a"], default_transitions(["a"], 0.5)), pages, 1, 10, 60, 30.0)
+
+
+def test_cli_state_machine_stream_validates(tmp_path, monkeypatch):
+    schema = tmp_path / "sessions.yaml"
+    schema.write_text(json.dumps({"dataset": "sessions", "seed": 4, "rows": 300, "users": 20, "session_model": "state_machine"}))
+    for command in ("generate", "validate"):
+        monkeypatch.setattr("sys.argv", ["prog", command, "--schema", str(schema), "--out", str(tmp_path / "out")])
+        main()
+    report = json.loads((tmp_path / "out" / "validation_report.json").read_text())
+    assert report["ok"] is True
@@ -0,0 +1,63 @@
+import json
+from itertools import islice
+
+from generators.event_stream_generator.generator.cli import main
+from generators.event_stream_generator.generator.follow import RateLimiter, RotatingSink, follow
+from generators.event_stream_generator.generator.stream import StreamConfig, generate_stream, iter_events
+
+SCHEMA = "generators/event_stream_generator/schemas/clickstream_stream.yaml"
+
+
+def test_unbounded_stream_is_lazy_and_matches_bounded_output():
+    assert list(islice(iter_events(7), 40)) == generate_stream(40, 7)
+
+
+def test_schema_configures_population_and_vocabularies():
+    config = StreamConfig.from_schema(
+        {"users": 3, "event_types": ["open", "close"], "pages": ["/a"], "start_time": "2025-06-01T12:00:00"}
+    )
+    events = list(iter_events(1, config, 200))
+
+    assert {event["user_id"] for event in events} <= {1, 2, 3}
+    assert {event["event_type"] for event in events} <= {"open", "close"}
+    assert {event["metadata"]["page"] for event in events} == {"/a"}
+    assert events[0]["event_time"].startswith("2025-06-01T12:00")
+
+
+def test_rate_limiter_paces_against_the_start_time():
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(round(seconds, 6))
+        now[0] += seconds
+
+    limiter = RateLimiter(10, clock=lambda: now[0], sleep=sleep)
+    limiter.wait()
+    now[0] += 0.25  # a stall longer than two intervals
+    limiter.wait()
+    limiter.wait()
+    limiter.wait()
+
+    assert sleeps == [0.1, 0.05]
+
+
+def test_follow_rotates_files(tmp_path):
+    written = follow(iter_events(3, rows=25), RotatingSink(tmp_path, 10), rate=0)
+
+    files = sorted(tmp_path.iterdir())
+    assert written == 25
+    assert [path.name for path in files] == ["events-00000.ndjson", "events-00001.ndjson", "events-00002.ndjson"]
+    events = [json.loads(line) for path in files for line in path.read_text().splitlines()]
+    assert events == generate_stream(25, 3)
+
+
+def test_cli_follow_writes_to_a_sink(tmp_path, monkeypatch):
+    sink = tmp_path / "events.fifo.ndjson"
+    argv = ["prog", "generate", "--schema", SCHEMA, "--out", str(tmp_path), "--seed", "5", "--follow"]
+    monkeypatch.setattr("sys.argv", [*argv, "--rows", "12", "--rate", "0", "--sink", str(sink)])
+    main()
+
+    lines = sink.read_text().splitlines()
+    assert len(lines) == 12
+    assert json.loads(lines[0])["event_id"] == "e_1"
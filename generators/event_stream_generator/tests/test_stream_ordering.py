@@ -30,3 +30,58 @@ def test_stream_deterministic_seed(tmp_path, monkeypatch):
     h1 = hashlib.sha256((out1 / "events.ndjson").read_bytes()).hexdigest()
     h2 = hashlib.sha256((out2 / "events.ndjson").read_bytes()).hexdigest()
     assert h1 == h2
+
+
+def test_stream_validate_compares_manifest_digests(tmp_path, monkeypatch):
+    from generators.event_stream_generator.generator import cli
+
+    out = tmp_path / "stream"
+    schema = "generators/event_stream_generator/schemas/clickstream_stream.yaml"
+    args = ["--schema", schema, "--out", str(out), "--rows", "50", "--seed", "5"]
+    monkeypatch.setattr("sys.argv", ["prog", "generate", *args])
+    main()
+    manifest = json.loads((out / "manifest.json").read_text())
+    assert manifest["params"]["seed"] == 5 and manifest["tables"]["events"]["rows"] == 50
+
+    def checks(*extra):
+        monkeypatch.setattr("sys.argv", ["prog", "validate", *args, *extra])
+        try:
+            main()
+        except SystemExit:
+            pass
+        report = json.loads((out / "validation_report.json").read_text())
+        return {check["name"]: check for check in report["checks"]}
+
+    report = checks()
+    assert report["deterministic_seed"]["ok"] is True and report["manifest_integrity"]["ok"] is True
+    assert report["deterministic_seed"]["details"]["sampled_rows"] == "1-50"
+    assert checks("--seed", "6")["deterministic_seed"]["details"]["mismatches"] == ["manifest seed is 5, expected 6"]
+
+    # A stream that no longer regenerates the same events fails determinism, not integrity.
+    iter_events = cli.iter_events
+
+    def drifted(*call_args, **kwargs):
+        for record in iter_events(*call_args, **kwargs):
+            yield {**record, "source": "drifted"}
+
+    monkeypatch.setattr(cli, "iter_events", drifted)
+    report = checks()
+    assert report["deterministic_seed"]["details"]["mismatches"] == [
+        "regenerated events differ from the manifest in rows 1-50"
+    ]
+    assert report["manifest_integrity"]["ok"] is True
+    monkeypatch.setattr(cli, "iter_events", iter_events)
+
+    # A file changed after generation fails integrity, while the seed still regenerates the manifest.
+    lines = (out / "events.ndjson").read_text().splitlines()
+    event = json.loads(lines[20])
+    event["source"] = "tampered"
+    lines[20] = json.dumps(event)
+    (out / "events.ndjson").write_text("\n".join(lines) + "\n")
+    report = checks()
+    assert report["deterministic_seed"]["ok"] is True
+    assert report["manifest_integrity"] == {
+        "name": "manifest_integrity",
+        "ok": False,
+        "details": {"mismatches": ["events differs from the manifest in rows 1-50"]},
+    }
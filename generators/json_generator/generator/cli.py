@@ -3,6 +3,7 @@ from __future__ import annotations
 import argparse
 import json
 from pathlib import Path
+from typing import Iterator
 
 from shared.cli.common import (
     build_parser,
@@ -11,8 +12,11 @@ from shared.cli.common import (
     optional_dependency_error,
     write_validation_report,
 )
-from shared.constraints.rules import validate_dataset
-from shared.schema_dsl.engine import generate_tables
+from shared.constraints.streaming import expected_row_counts, validate_stream
+from shared.io.columnar import ColumnBatch
+from shared.io.json_stream import COMPRESSIONS, compressed_path
+from shared.io.readers import iter_json_batches
+from shared.schema_dsl.engine import stream_batches
 from shared.schema_dsl.parser import describe_schema, load_schema
 
 from .json_writer import write_json
@@ -28,18 +32,32 @@ def _resolve_mode(schema_raw: dict, mode: str | None) -> str:
     return mode or schema_raw.get("output_mode", "ndjson")
 
 
-def _table_output_path(out_dir: Path, table_name: str, mode: str) -> Path:
-    return out_dir / f"{table_name}.{'ndjson' if mode == 'ndjson' else 'json'}"
+def _table_output_path(out_dir: Path, table_name: str, mode: str, compression: str | None = None) -> Path:
+    return compressed_path(out_dir / f"{table_name}.{'ndjson' if mode == 'ndjson' else 'json'}", compression)
+
+
+def _resolve_tables(schema_raw: dict, tables: str | None) -> list[str]:
+    names = list(schema_raw.get("tables", {}))
+    if not tables:
+        return names
+    selected = [name.strip() for name in tables.split(",") if name.strip()]
+    unknown = [name for name in selected if name not in names]
+    if unknown:
+        raise ValueError(f"Unknown tables: {', '.join(unknown)}")
+    return selected
 
 
 def _cmd_generate(args: argparse.Namespace) -> int:
     schema = load_schema(args.schema)
     seed = _resolve_seed(schema.raw, args.seed)
-    tables = generate_tables(schema.raw, seed, args.rows, args.profile)
-    table_name = next(iter(tables))
     mode = _resolve_mode(schema.raw, args.output_mode)
-    out = write_json(_table_output_path(Path(args.out), table_name, mode), tables[table_name], mode)
-    print(f"Generated {GENERATOR_NAME} output at {out}")
+    tables = _resolve_tables(schema.raw, args.tables)
+    # Each table is written while it is generated, so only its current batch is held.
+    streams = stream_batches(schema.raw, seed, args.rows, args.profile, tables=tables)
+    for table_name, batches in streams.items():
+        out_path = _table_output_path(Path(args.out), table_name, mode, args.compression)
+        out = write_json(out_path, batches, mode, args.compression)
+        print(f"Generated {GENERATOR_NAME} output at {out}")
     return 0
 
 
@@ -51,50 +69,66 @@ def _cmd_describe(args: argparse.Namespace) -> int:
 def _cmd_validate(args: argparse.Namespace) -> int:
     schema = load_schema(args.schema)
     seed = _resolve_seed(schema.raw, args.seed)
-    table_name = next(iter(schema.raw.get("tables", {})))
     mode = _resolve_mode(schema.raw, args.output_mode)
-    out_path = _table_output_path(Path(args.out), table_name, mode)
     checks: list[dict] = []
     errors: list[str] = []
 
-    ensure_path_exists(out_path, description="Output file")
-    checks.append({"name": "output_exists", "ok": True, "details": {"path": str(out_path)}})
-
-    tables = generate_tables(schema.raw, seed, args.rows, args.profile)
-    dataset_errors = validate_dataset(tables, schema.raw)
-    checks.append({"name": "schema_constraints", "ok": not dataset_errors, "details": {"errors": dataset_errors}})
-    errors.extend(dataset_errors)
-
-    try:
-        if mode == "json":
-            parsed = json.loads(out_path.read_text(encoding="utf-8"))
-            ok = isinstance(parsed, list)
+    out_paths = {
+        name: _table_output_path(Path(args.out), name, mode, args.compression)
+        for name in _resolve_tables(schema.raw, args.tables)
+    }
+    for out_path in out_paths.values():
+        ensure_path_exists(out_path, description="Output file")
+    checks.append({"name": "output_exists", "ok": True, "details": {"paths": [str(p) for p in out_paths.values()]}})
+
+    parse_errors: dict[str, str] = {}
+
+    def batches(table_name: str) -> Iterator[ColumnBatch]:
+        try:
+            yield from iter_json_batches(out_paths[table_name], mode)
+        except json.JSONDecodeError as exc:
+            parse_errors[table_name] = str(exc)
+
+    # Foreign keys are checked among the validated tables only.
+    selected = {
+        **schema.raw,
+        "tables": {name: spec for name, spec in schema.raw.get("tables", {}).items() if name in out_paths},
+        "relationships": [
+            rel
+            for rel in schema.raw.get("relationships", [])
+            if rel["parent_table"] in out_paths and rel["child_table"] in out_paths
+        ],
+    }
+    result = validate_stream(selected, {name: batches(name) for name in out_paths})
+    checks.append({"name": "schema_constraints", "ok": result.valid, "details": {"errors": result.errors}})
+    errors.extend(result.errors)
+
+    expected = expected_row_counts(schema.raw, args.rows, args.profile)
+    for table_name, out_path in out_paths.items():
+        actual_rows = result.row_counts[table_name]
+        if table_name in parse_errors:
+            errors.append(f"JSON parse error in {out_path}: {parse_errors[table_name]}")
+            checks.append({"name": f"{table_name}_parseable", "ok": False, "details": {"mode": mode, "error": parse_errors[table_name]}})
         else:
-            with out_path.open(encoding="utf-8") as handle:
-                parsed = [json.loads(line) for line in handle if line.strip()]
-            ok = True
-        checks.append({"name": "output_parseable", "ok": ok, "details": {"mode": mode, "rows": len(parsed)}})
-    except json.JSONDecodeError as exc:
-        errors.append(f"JSON parse error: {exc}")
-        checks.append({"name": "output_parseable", "ok": False, "details": {"mode": mode, "error": str(exc)}})
-        parsed = []
-
-    expected_rows = len(tables.get(table_name, []))
-    actual_rows = len(parsed)
-    row_ok = expected_rows == actual_rows
-    checks.append({"name": "row_count_match", "ok": row_ok, "details": {"expected": expected_rows, "actual": actual_rows}})
-    if not row_ok:
-        errors.append(f"Row count mismatch for {table_name}: expected {expected_rows}, got {actual_rows}")
+            checks.append({"name": f"{table_name}_parseable", "ok": True, "details": {"mode": mode, "rows": actual_rows}})
+
+        expected_rows = expected[table_name]
+        row_ok = expected_rows == actual_rows
+        checks.append(
+            {"name": f"{table_name}_row_count_match", "ok": row_ok, "details": {"expected": expected_rows, "actual": actual_rows}}
+        )
+        if not row_ok:
+            errors.append(f"Row count mismatch for {table_name}: expected {expected_rows}, got {actual_rows}")
 
     report_path = write_validation_report(
         args.out,
         generator=GENERATOR_NAME,
         schema_path=schema.path,
-        output_path=out_path,
+        output_path=Path(args.out),
         seed=seed,
         checks=checks,
         errors=errors,
-        stats={"table_counts": {k: len(v) for k, v in tables.items()}},
+        stats={"table_counts": result.row_counts, "violations": result.violations},
     )
     print(f"Validation report: {report_path}")
     return 1 if errors else 0
@@ -107,6 +141,8 @@ def build_cli_parser() -> argparse.ArgumentParser:
     )
     for cmd in parser._subparsers._group_actions[0].choices.values():
         cmd.add_argument("--output-mode", choices=["json", "ndjson"], default=None)
+        cmd.add_argument("--compression", choices=COMPRESSIONS, default=None, help="Compress the output files")
+        cmd.add_argument("--tables", default=None, help="Comma-separated tables to write (default: all)")
     return parser
 
 
@@ -1,14 +1,26 @@
 from __future__ import annotations
 
-import json
 from pathlib import Path
+from typing import Iterable
 
+from shared.io.columnar import ColumnBatch, iter_rows
+from shared.io.json_stream import JsonRowWriter
 
-def write_json(out_path: str | Path, rows: list[dict], mode: str) -> Path:
-    out = Path(out_path)
-    out.parent.mkdir(parents=True, exist_ok=True)
-    if mode == "ndjson":
-        out.write_text("\n".join(json.dumps(r) for r in rows) + "\n", encoding="utf-8")
-    else:
-        out.write_text(json.dumps(rows, indent=2), encoding="utf-8")
-    return out
+
+def write_json(
+    out_path: str | Path,
+    rows: ColumnBatch | Iterable[ColumnBatch | dict],
+    mode: str,
+    compression: str | None = None,
+) -> Path:
+    """Stream ``rows`` (a batch, batches or row dicts) to ``out_path`` as NDJSON or a JSON array."""
+
+    with JsonRowWriter(out_path, mode, compression) as writer:
+        if isinstance(rows, ColumnBatch):
+            rows = [rows]
+        for item in rows:
+            if isinstance(item, ColumnBatch):
+                writer.write_rows(iter_rows(item))
+            else:
+                writer.write(item)
+    return writer.path
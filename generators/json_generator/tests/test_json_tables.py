@@ -0,0 +1,33 @@
+import json
+
+from generators.json_generator.generator.cli import main
+
+SCHEMA = "generators/parquet_generator/schemas/retail_basic_parquet.yaml"
+
+
+def _run(monkeypatch, *argv):
+    monkeypatch.setattr("sys.argv", ["prog", *argv, "--schema", SCHEMA, "--rows", "25", "--seed", "5"])
+    main()
+
+
+def test_generate_writes_every_table(tmp_path, monkeypatch):
+    out = tmp_path / "all"
+    _run(monkeypatch, "generate", "--out", str(out), "--output-mode", "json")
+
+    customers = json.loads((out / "customers.json").read_text())
+    orders = json.loads((out / "orders.json").read_text())
+    assert len(customers) == len(orders) == 25
+    assert {row["customer_id"] for row in orders} <= {row["customer_id"] for row in customers}
+
+    _run(monkeypatch, "validate", "--out", str(out), "--output-mode", "json")
+    report = json.loads((out / "validation_report.json").read_text())
+    assert report["ok"] is True
+    assert {"customers_row_count_match", "orders_row_count_match"} <= {check["name"] for check in report["checks"]}
+
+
+def test_selected_tables_match_the_full_run(tmp_path, monkeypatch):
+    _run(monkeypatch, "generate", "--out", str(tmp_path / "all"))
+    _run(monkeypatch, "generate", "--out", str(tmp_path / "some"), "--tables", "orders")
+
+    assert sorted(path.name for path in (tmp_path / "some").iterdir()) == ["orders.ndjson"]
+    assert (tmp_path / "some" / "orders.ndjson").read_bytes() == (tmp_path / "all" / "orders.ndjson").read_bytes()
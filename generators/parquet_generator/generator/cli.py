@@ -2,13 +2,24 @@ from __future__ import annotations
 
 import argparse
 from pathlib import Path
+from typing import Iterator
 
 from shared.cli.common import build_parser, command_main, ensure_path_exists, optional_dependency_error, write_validation_report
-from shared.constraints.rules import validate_dataset
-from shared.schema_dsl.engine import generate_tables
+from shared.constraints.streaming import expected_row_counts, validate_stream
+from shared.io.columnar import ColumnBatch
+from shared.io.readers import iter_parquet_batches
+from shared.schema_dsl.engine import DEFAULT_BATCH_SIZE, stream_batches
 from shared.schema_dsl.parser import describe_schema, load_schema
 
-from .parquet_writer import write_parquet_tables
+from .parquet_writer import (
+    DEFAULT_MAX_BUFFERED_ROWS,
+    DEFAULT_MAX_OPEN_FILES,
+    DEFAULT_ROW_GROUP_SIZE,
+    ParquetOptions,
+    arrow_schema,
+    dictionary_columns,
+    write_parquet_tables,
+)
 
 GENERATOR_NAME = "parquet_generator"
 
@@ -20,9 +31,22 @@ def _resolve_seed(schema_raw: dict, seed: int | None) -> int:
 def _cmd_generate(args: argparse.Namespace) -> int:
     schema = load_schema(args.schema)
     seed = _resolve_seed(schema.raw, args.seed)
-    tables = generate_tables(schema.raw, seed=seed, rows_override=args.rows, profile=args.profile)
-    parts = {n: s.get("partition_by", []) for n, s in schema.raw.get("tables", {}).items()}
-    write_parquet_tables(args.out, tables, parts)
+    tables = stream_batches(schema.raw, seed=seed, rows_override=args.rows, profile=args.profile, batch_size=args.batch_size)
+    specs = schema.raw.get("tables", {})
+    parts = {n: s.get("partition_by", []) for n, s in specs.items()}
+    options = {
+        name: ParquetOptions(
+            row_group_size=args.row_group_size,
+            compression=args.compression,
+            compression_level=args.compression_level,
+            dictionary=tuple(dictionary_columns(spec)),
+            max_open_files=args.max_open_files,
+            max_buffered_rows=args.max_buffered_rows,
+        )
+        for name, spec in specs.items()
+    }
+    schemas = {name: arrow_schema(name, schema.raw) for name in specs}
+    write_parquet_tables(args.out, tables, parts, schemas=schemas, options=options)
     print(f"Generated Parquet at {Path(args.out).resolve()}")
     return 0
 
@@ -33,33 +57,39 @@ def _cmd_describe(args: argparse.Namespace) -> int:
 
 
 def _cmd_validate(args: argparse.Namespace) -> int:
-    import pyarrow.parquet as pq
-
     schema = load_schema(args.schema)
     seed = _resolve_seed(schema.raw, args.seed)
-    tables = generate_tables(schema.raw, seed=seed, rows_override=args.rows, profile=args.profile)
+    specs = schema.raw.get("tables", {})
 
     checks: list[dict] = []
     errors: list[str] = []
-    dataset_errors = validate_dataset(tables, schema.raw)
-    checks.append({"name": "schema_constraints", "ok": not dataset_errors, "details": {"errors": dataset_errors}})
-    errors.extend(dataset_errors)
-
-    row_stats: dict[str, dict[str, int]] = {}
-    for table_name, expected_rows in {k: len(v) for k, v in tables.items()}.items():
+    locations: dict[str, Path] = {}
+    for table_name in specs:
         flat_file = Path(args.out) / f"{table_name}.parquet"
         partition_dir = Path(args.out) / table_name
         if flat_file.exists():
-            actual_rows = pq.read_table(flat_file).num_rows
-            location = flat_file
+            locations[table_name] = flat_file
         elif partition_dir.exists():
-            actual_rows = pq.read_table(partition_dir).num_rows
-            location = partition_dir
+            locations[table_name] = partition_dir
         else:
             ensure_path_exists(flat_file, description=f"Parquet output for {table_name}")
+
+    def batches(table_name: str) -> Iterator[ColumnBatch]:
+        columns = {col["name"]: col for col in specs[table_name].get("columns", [])}
+        partition_by = specs[table_name].get("partition_by", []) if locations[table_name].is_dir() else []
+        partition_columns = [columns.get(name, {"name": name}) for name in partition_by]
+        return iter_parquet_batches(locations[table_name], partition_columns)
+
+    result = validate_stream(schema.raw, {table_name: batches(table_name) for table_name in locations})
+    checks.append({"name": "schema_constraints", "ok": result.valid, "details": {"errors": result.errors}})
+    errors.extend(result.errors)
+
+    row_stats: dict[str, dict[str, int]] = {}
+    for table_name, expected_rows in expected_row_counts(schema.raw, args.rows, args.profile).items():
+        actual_rows = result.row_counts[table_name]
         row_ok = expected_rows == actual_rows
         row_stats[table_name] = {"expected": expected_rows, "actual": actual_rows}
-        checks.append({"name": f"{table_name}_parseable", "ok": True, "details": {"path": str(location)}})
+        checks.append({"name": f"{table_name}_parseable", "ok": True, "details": {"path": str(locations[table_name])}})
         checks.append({"name": f"{table_name}_row_count", "ok": row_ok, "details": row_stats[table_name]})
         if not row_ok:
             errors.append(f"Row count mismatch for {table_name}: expected {expected_rows}, got {actual_rows}")
@@ -72,19 +102,41 @@ def _cmd_validate(args: argparse.Namespace) -> int:
         seed=seed,
         checks=checks,
         errors=errors,
-        stats={"row_counts": row_stats},
+        stats={"row_counts": row_stats, "violations": result.violations},
     )
     print(f"Validation report: {report}")
     return 1 if errors else 0
 
 
-def main() -> None:
-    command_main(
-        build_parser(
-            "Parquet generator",
-            {"describe": _cmd_describe, "generate": _cmd_generate, "validate": _cmd_validate},
-        )
+def build_cli_parser() -> argparse.ArgumentParser:
+    parser = build_parser(
+        "Parquet generator",
+        {"describe": _cmd_describe, "generate": _cmd_generate, "validate": _cmd_validate},
+    )
+    generate = parser._subparsers._group_actions[0].choices["generate"]
+    generate.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows generated per batch")
+    generate.add_argument("--row-group-size", type=int, default=DEFAULT_ROW_GROUP_SIZE, help="Rows per Parquet row group")
+    generate.add_argument(
+        "--compression",
+        choices=["none", "snappy", "gzip", "brotli", "lz4", "zstd"],
+        default="snappy",
+        help="Parquet compression codec",
+    )
+    generate.add_argument("--compression-level", type=int, default=None, help="Codec-specific compression level")
+    generate.add_argument(
+        "--max-open-files", type=int, default=DEFAULT_MAX_OPEN_FILES, help="Open partition files per table"
     )
+    generate.add_argument(
+        "--max-buffered-rows",
+        type=int,
+        default=DEFAULT_MAX_BUFFERED_ROWS,
+        help="Rows buffered across partitions before the largest is flushed",
+    )
+    return parser
+
+
+def main() -> None:
+    command_main(build_cli_parser())
 
 
 if __name__ == "__main__":
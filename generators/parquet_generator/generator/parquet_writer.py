@@ -1,27 +1,320 @@
 from __future__ import annotations
 
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any, Iterable, Iterator, Mapping
+from urllib.parse import quote
 
+from shared.io.columnar import ColumnBatch, as_batch
 
-def write_parquet_tables(out_dir: str | Path, tables: dict[str, list[dict]], partition_by: dict[str, list[str]] | None = None) -> None:
+DEFAULT_ROW_GROUP_SIZE = 128 * 1024
+DEFAULT_MAX_OPEN_FILES = 64
+DEFAULT_MAX_BUFFERED_ROWS = 4 * DEFAULT_ROW_GROUP_SIZE
+
+TableInput = ColumnBatch | list[dict] | Iterable[ColumnBatch]
+
+
+@dataclass(frozen=True)
+class ParquetOptions:
+    """Row-group sizing and encoding for Parquet output.
+
+    ``dictionary`` lists the columns to dictionary-encode (see ``dictionary_columns``);
+    ``None`` keeps pyarrow's default of trying every column. ``max_open_files`` and
+    ``max_buffered_rows`` bound partitioned output (see ``PartitionedParquetWriter``).
+    """
+
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE
+    compression: str = "snappy"
+    compression_level: int | None = None
+    dictionary: tuple[str, ...] | None = None
+    max_open_files: int = DEFAULT_MAX_OPEN_FILES
+    max_buffered_rows: int = DEFAULT_MAX_BUFFERED_ROWS
+
+    def open_writer(self, path: str | Path, schema: Any) -> Any:
+        import pyarrow.parquet as pq
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        use_dictionary: bool | list[str] = True
+        if self.dictionary is not None:
+            use_dictionary = [name for name in self.dictionary if name in schema.names] or False
+        return pq.ParquetWriter(
+            str(path),
+            schema,
+            compression=self.compression,
+            compression_level=self.compression_level,
+            use_dictionary=use_dictionary,
+        )
+
+
+def _require_pyarrow() -> Any:
     try:
         import pyarrow as pa
-        import pyarrow.dataset as ds
-        import pyarrow.parquet as pq
     except ImportError as exc:
         raise RuntimeError(
             "Optional dependency 'pyarrow' is required. Install with: "
             "pip install -r generators/parquet_generator/requirements.txt"
         ) from exc
+    return pa
+
+
+def column_arrow_type(column: dict[str, Any]) -> Any:
+    """Arrow type of the values the shared engine generates for ``column``."""
+
+    pa = _require_pyarrow()
+    ctype = column.get("type", "string")
+    if ctype in {"id", "integer"}:
+        return pa.int64()
+    if ctype == "float":
+        return pa.float64()
+    if ctype == "boolean":
+        return pa.bool_()
+    if ctype == "categorical":
+        categories = column.get("categories", ["unknown"])
+        if all(type(value) is bool for value in categories):
+            return pa.bool_()
+        if all(type(value) is int for value in categories):
+            return pa.int64()
+        if all(type(value) in {int, float} for value in categories):
+            return pa.float64()
+        return pa.string()
+    if ctype == "object":
+        return pa.struct([pa.field(field["name"], column_arrow_type(field)) for field in column.get("fields", [])])
+    if ctype in {"string", "date", "datetime"}:
+        return pa.string()
+    return pa.scalar(column.get("value", "")).type
+
+
+def arrow_schema(table_name: str, raw_schema: dict[str, Any]) -> Any:
+    """Explicit Arrow schema of a shared-engine table, foreign keys included."""
+
+    pa = _require_pyarrow()
+    tables = raw_schema.get("tables", {})
+    columns = tables[table_name].get("columns", [])
+    fields = {col["name"]: pa.field(col["name"], column_arrow_type(col)) for col in columns}
+    for rel in raw_schema.get("relationships", []):
+        if rel["child_table"] == table_name and rel["child_key"] not in fields:
+            parent = next(
+                (col for col in tables[rel["parent_table"]].get("columns", []) if col["name"] == rel["parent_key"]),
+                {},
+            )
+            fields[rel["child_key"]] = pa.field(rel["child_key"], column_arrow_type(parent))
+    return pa.schema(list(fields.values()))
+
+
+def dictionary_columns(spec: dict[str, Any]) -> list[str]:
+    """``categorical`` columns unless they set ``dictionary: false``, plus ``dictionary: true`` ones."""
+
+    return [
+        col["name"]
+        for col in spec.get("columns", [])
+        if col.get("dictionary", col.get("type") == "categorical")
+    ]
+
+
+def _batches(table: TableInput) -> Iterator[ColumnBatch]:
+    if isinstance(table, ColumnBatch):
+        yield table
+    elif isinstance(table, list) and (not table or isinstance(table[0], dict)):
+        yield as_batch(table)
+    else:
+        for batch in table:
+            yield as_batch(batch)
+
+
+def write_parquet_table(
+    path: str | Path,
+    batches: TableInput,
+    schema: Any = None,
+    options: ParquetOptions | None = None,
+) -> int:
+    """Stream ``batches`` into one Parquet file with ``pq.ParquetWriter``.
+
+    Batches are buffered only until a full row group of ``options.row_group_size`` rows
+    is available, so memory is bounded by one row group plus one batch whatever the
+    table size. Without ``schema`` the first batch's inferred schema is used. Returns
+    the number of rows written.
+    """
+
+    pa = _require_pyarrow()
+
+    options = options or ParquetOptions()
+    if options.row_group_size < 1:
+        raise ValueError("row_group_size must be >= 1")
+    writer = None
+    pending: list[Any] = []
+    pending_rows = 0
+    written = 0
+
+    def flush(final: bool) -> None:
+        nonlocal pending, pending_rows, written
+        if not pending:
+            return
+        buffered = pa.concat_tables(pending)
+        full = len(buffered) if final else len(buffered) - len(buffered) % options.row_group_size
+        for offset in range(0, full, options.row_group_size):
+            group = buffered.slice(offset, min(options.row_group_size, full - offset))
+            writer.write_table(group, row_group_size=options.row_group_size)
+        written += full
+        rest = buffered.slice(full)
+        pending, pending_rows = ([rest] if len(rest) else []), len(rest)
+
+    try:
+        for batch in _batches(batches):
+            table = batch.to_arrow(schema)
+            if writer is None:
+                schema = table.schema
+                writer = options.open_writer(path, schema)
+            pending.append(table)
+            pending_rows += len(table)
+            if pending_rows >= options.row_group_size:
+                flush(final=False)
+        if writer is None:
+            schema = schema if schema is not None else pa.schema([])
+            writer = options.open_writer(path, schema)
+        flush(final=True)
+    finally:
+        if writer is not None:
+            writer.close()
+    return written
+
+
+class PartitionedParquetWriter:
+    """Route batches into a directory-partitioned dataset in a single pass.
+
+    Rows go to ``<base_dir>/<value of partition_by[0]>/<value of partition_by[1]>/...``
+    (the layout ``ds.write_dataset`` produces for a list of partition columns, without
+    the partition columns in the files). Each partition buffers its rows and is written
+    a full row group at a time. At most ``options.max_buffered_rows`` rows are buffered
+    over all partitions; beyond that the largest buffer is flushed early. At most
+    ``options.max_open_files`` files are open; the least recently used one is closed
+    and later rows of its partition go to the next ``part-<n>.parquet`` file.
+    """
+
+    def __init__(
+        self,
+        base_dir: str | Path,
+        schema: Any,
+        partition_by: list[str],
+        options: ParquetOptions | None = None,
+    ) -> None:
+        pa = _require_pyarrow()
+        self.options = options or ParquetOptions()
+        if self.options.max_open_files < 1:
+            raise ValueError("max_open_files must be >= 1")
+        self.base_dir = Path(base_dir)
+        self.schema = schema
+        self.partition_by = list(partition_by)
+        self.file_schema = None if schema is None else pa.schema([f for f in schema if f.name not in self.partition_by])
+        self.buffers: dict[tuple[Any, ...], list[Any]] = {}
+        self.buffered: dict[tuple[Any, ...], int] = {}
+        self.writers: OrderedDict[tuple[Any, ...], Any] = OrderedDict()
+        self.parts: dict[tuple[Any, ...], int] = {}
+        self.rows = 0
+
+    def _directory(self, key: tuple[Any, ...]) -> Path:
+        path = self.base_dir
+        for name, value in zip(self.partition_by, key):
+            if value is None:
+                raise ValueError(f"Partition column {name!r} is null; directory partitioning cannot represent nulls")
+            path = path / quote(str(value), safe="")
+        return path
+
+    def write(self, batch: ColumnBatch) -> None:
+        table = batch.to_arrow(self.schema)
+        if self.file_schema is None:
+            self.schema = table.schema
+            self.file_schema = table.drop_columns(self.partition_by).schema
+        groups: dict[tuple[Any, ...], list[int]] = {}
+        keys = zip(*(batch.column(name) for name in self.partition_by))
+        for row, key in enumerate(keys):
+            groups.setdefault(key, []).append(row)
+        table = table.drop_columns(self.partition_by)
+        for key, rows in groups.items():
+            self._directory(key)
+            self.buffers.setdefault(key, []).append(table.take(rows))
+            self.buffered[key] = self.buffered.get(key, 0) + len(rows)
+            if self.buffered[key] >= self.options.row_group_size:
+                self._flush(key, final=False)
+        while sum(self.buffered.values()) > self.options.max_buffered_rows:
+            self._flush(max(self.buffered, key=self.buffered.__getitem__), final=True)
+
+    def _writer(self, key: tuple[Any, ...]) -> Any:
+        writer = self.writers.get(key)
+        if writer is not None:
+            self.writers.move_to_end(key)
+            return writer
+        if len(self.writers) >= self.options.max_open_files:
+            _, oldest = self.writers.popitem(last=False)
+            oldest.close()
+        part = self.parts.get(key, 0)
+        self.parts[key] = part + 1
+        writer = self.options.open_writer(self._directory(key) / f"part-{part}.parquet", self.file_schema)
+        self.writers[key] = writer
+        return writer
+
+    def _flush(self, key: tuple[Any, ...], final: bool) -> None:
+        pa = _require_pyarrow()
+        size = self.options.row_group_size
+        buffered = pa.concat_tables(self.buffers.pop(key))
+        full = len(buffered) if final else len(buffered) - len(buffered) % size
+        if full:
+            writer = self._writer(key)
+            for offset in range(0, full, size):
+                writer.write_table(buffered.slice(offset, min(size, full - offset)), row_group_size=size)
+            self.rows += full
+        rest = buffered.slice(full)
+        if len(rest):
+            self.buffers[key], self.buffered[key] = [rest], len(rest)
+        else:
+            self.buffered.pop(key)
+
+    def close(self) -> int:
+        """Flush every buffer, close all files and return the number of rows written."""
+
+        try:
+            for key in list(self.buffered):
+                self._flush(key, final=True)
+        finally:
+            for writer in self.writers.values():
+                writer.close()
+            self.writers.clear()
+        return self.rows
+
+
+def write_parquet_tables(
+    out_dir: str | Path,
+    tables: Mapping[str, TableInput],
+    partition_by: dict[str, list[str]] | None = None,
+    *,
+    schemas: Mapping[str, Any] | None = None,
+    options: ParquetOptions | Mapping[str, ParquetOptions] | None = None,
+) -> dict[str, int]:
+    """Write each table to ``<table>.parquet``, or a partitioned ``<table>/`` dataset
+    (see ``PartitionedParquetWriter``).
+
+    ``tables`` values may be a ``ColumnBatch``, row dicts or an iterable of batches
+    (such as ``stream_batches`` output, consumed in order). ``options`` applies to every
+    table or maps table names to their own. Returns the rows written per table.
+    """
 
     out = Path(out_dir)
     out.mkdir(parents=True, exist_ok=True)
     partition_by = partition_by or {}
+    schemas = schemas or {}
+    counts: dict[str, int] = {}
     for table_name, rows in tables.items():
-        table = pa.Table.from_pylist(rows)
+        table_options = options.get(table_name) if isinstance(options, Mapping) else options
         target = out / table_name
         parts = partition_by.get(table_name)
+        schema = schemas.get(table_name)
         if parts:
-            ds.write_dataset(table, base_dir=str(target), format="parquet", partitioning=parts, existing_data_behavior="overwrite_or_ignore")
+            writer = PartitionedParquetWriter(target, schema, parts, table_options)
+            try:
+                for batch in _batches(rows):
+                    writer.write(batch)
+            finally:
+                counts[table_name] = writer.close()
         else:
-            pq.write_table(table, target.with_suffix(".parquet"))
+            counts[table_name] = write_parquet_table(target.with_suffix(".parquet"), rows, schema, table_options)
+    return counts
@@ -0,0 +1,96 @@
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from generators.parquet_generator.generator.parquet_writer import (
+    ParquetOptions,
+    PartitionedParquetWriter,
+    arrow_schema,
+    dictionary_columns,
+    write_parquet_table,
+)
+from shared.io.columnar import ColumnBatch
+from shared.schema_dsl.engine import generate_tables, stream_batches
+from shared.schema_dsl.parser import load_schema
+
+SCHEMA = "generators/parquet_generator/schemas/retail_basic_parquet.yaml"
+
+
+def test_streamed_file_matches_generated_rows(tmp_path):
+    raw = load_schema(SCHEMA).raw
+    streams = stream_batches(raw, seed=3, rows_override=250, profile="dirty", batch_size=40)
+    options = ParquetOptions(row_group_size=100, compression="zstd", compression_level=3)
+    for name, batches in streams.items():
+        assert write_parquet_table(tmp_path / f"{name}.parquet", batches, arrow_schema(name, raw), options) == 250
+
+    expected = generate_tables(raw, seed=3, rows_override=250, profile="dirty")
+    orders = pq.ParquetFile(tmp_path / "orders.parquet")
+    assert [orders.metadata.row_group(i).num_rows for i in range(orders.num_row_groups)] == [100, 100, 50]
+    assert orders.metadata.row_group(0).column(0).compression == "ZSTD"
+    assert orders.read().to_pylist() == expected["orders"]
+
+
+def test_explicit_schema_types_all_null_batches(tmp_path):
+    raw = load_schema(SCHEMA).raw
+    schema = arrow_schema("orders", raw)
+    assert schema.field("year").type == pa.int64()
+    assert schema.field("amount").type == pa.float64()
+
+    batches = [ColumnBatch.from_rows([{"order_id": 1, "year": None}]), ColumnBatch.from_rows([{"order_id": 2, "year": 2024}])]
+    write_parquet_table(tmp_path / "t.parquet", batches, schema)
+    table = pq.read_table(tmp_path / "t.parquet")
+    assert table.schema == schema
+    assert table.column("year").to_pylist() == [None, 2024]
+
+
+def test_dictionary_encoding_follows_column_settings(tmp_path):
+    spec = {
+        "columns": [
+            {"name": "region", "type": "categorical", "categories": ["n", "s"]},
+            {"name": "code", "type": "categorical", "categories": ["a", "b"], "dictionary": False},
+            {"name": "note", "type": "string", "dictionary": True},
+        ]
+    }
+    assert dictionary_columns(spec) == ["region", "note"]
+
+    batch = ColumnBatch.from_rows([{"region": "n", "code": "a", "note": "x"}] * 10)
+    write_parquet_table(tmp_path / "d.parquet", [batch], options=ParquetOptions(dictionary=("region",)))
+    group = pq.ParquetFile(tmp_path / "d.parquet").metadata.row_group(0)
+    encodings = {group.column(i).path_in_schema: group.column(i).encodings for i in range(3)}
+    assert any("DICTIONARY" in enc for enc in encodings["region"])
+    assert not any("DICTIONARY" in enc for enc in encodings["code"])
+
+
+def _partition_rows(path):
+    rows = []
+    for file in sorted(path.rglob("*.parquet")):
+        year, month = file.relative_to(path).parts[:2]
+        rows.extend({**row, "year": int(year), "month": int(month)} for row in pq.read_table(file).to_pylist())
+    return rows
+
+
+def test_partitioned_writer_caps_open_files_and_buffers(tmp_path):
+    raw = load_schema(SCHEMA).raw
+    options = ParquetOptions(row_group_size=8, max_open_files=2, max_buffered_rows=20)
+    writer = PartitionedParquetWriter(tmp_path / "orders", arrow_schema("orders", raw), ["year", "month"], options)
+    opened = 0
+    for batches in stream_batches(raw, seed=5, rows_override=300, profile="fast", batch_size=25).values():
+        for batch in batches:
+            if "year" in batch:
+                writer.write(batch)
+                opened = max(opened, len(writer.writers))
+                assert sum(writer.buffered.values()) <= 20
+    assert writer.close() == 300
+    assert opened <= 2
+
+    expected = generate_tables(raw, seed=5, rows_override=300, profile="fast")["orders"]
+    key = lambda row: (row["year"], row["month"], row["order_id"])
+    assert sorted(_partition_rows(tmp_path / "orders"), key=key) == sorted(expected, key=key)
+    assert len(list((tmp_path / "orders").rglob("part-1.parquet"))) > 0
+
+
+def test_partitioned_writer_rejects_null_partition_values(tmp_path):
+    writer = PartitionedParquetWriter(tmp_path / "t", None, ["region"])
+    with pytest.raises(ValueError, match="is null"):
+        writer.write(ColumnBatch.from_rows([{"region": None, "value": 1}]))
@@ -5,9 +5,11 @@ import sqlite3
 from pathlib import Path
 
 from shared.cli.common import build_parser, command_main, ensure_path_exists, write_validation_report
+from shared.constraints.streaming import expected_row_counts, validate_sqlite
+from shared.schema_dsl.engine import DEFAULT_BATCH_SIZE
 from shared.schema_dsl.parser import describe_schema, load_schema
 
-from .seeder import seed_database
+from .seeder import BULK_JOURNAL_MODES, DEFAULT_CACHE_SIZE_MB, DEFAULT_SHARD_ROWS, seed_database
 
 GENERATOR_NAME = "sqlite_seed"
 
@@ -19,7 +21,19 @@ def _resolve_seed(schema_raw: dict, seed: int | None) -> int:
 def _cmd_generate(args: argparse.Namespace) -> int:
     schema = load_schema(args.schema)
     seed = _resolve_seed(schema.raw, args.seed)
-    counts = seed_database(schema.raw, args.out, seed, args.rows, args.profile)
+    counts = seed_database(
+        schema.raw,
+        args.out,
+        seed,
+        args.rows,
+        args.profile,
+        bulk=args.bulk,
+        journal_mode=args.journal_mode,
+        cache_size_mb=args.cache_size_mb,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        shard_rows=args.shard_rows,
+    )
     print(f"Generated SQLite database at {Path(args.out).resolve()} with row counts {counts}")
     return 0
 
@@ -47,10 +61,13 @@ def _cmd_validate(args: argparse.Namespace) -> int:
     if violations:
         errors.append(f"Foreign key violations: {violations}")
 
-    for table_name, spec in schema.raw.get("tables", {}).items():
-        row_count = int(conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0])
+    result = validate_sqlite(conn, schema.raw)
+    checks.append({"name": "schema_constraints", "ok": result.valid, "details": {"errors": result.errors}})
+    errors.extend(result.errors)
+
+    for table_name, expected in expected_row_counts(schema.raw, args.rows, args.profile).items():
+        row_count = result.row_counts[table_name]
         counts[table_name] = row_count
-        expected = int(args.rows if args.rows is not None else spec.get("rows", 100))
         row_ok = row_count == expected
         checks.append({"name": f"{table_name}_row_count", "ok": row_ok, "details": {"expected": expected, "actual": row_count}})
         if not row_ok:
@@ -65,7 +82,7 @@ def _cmd_validate(args: argparse.Namespace) -> int:
         seed=seed,
         checks=checks,
         errors=errors,
-        stats={"table_counts": counts},
+        stats={"table_counts": counts, "violations": result.violations},
     )
     print(f"Validation report: {report}")
     if not errors:
@@ -73,13 +90,32 @@ def _cmd_validate(args: argparse.Namespace) -> int:
     return 1 if errors else 0
 
 
-def main() -> None:
-    command_main(
-        build_parser(
-            "SQLite seeder",
-            {"describe": _cmd_describe, "generate": _cmd_generate, "validate": _cmd_validate},
-        )
+def build_cli_parser() -> argparse.ArgumentParser:
+    parser = build_parser(
+        "SQLite seeder",
+        {"describe": _cmd_describe, "generate": _cmd_generate, "validate": _cmd_validate},
+    )
+    generate = parser._subparsers._group_actions[0].choices["generate"]
+    generate.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows generated and inserted per batch")
+    generate.add_argument(
+        "--bulk",
+        action="store_true",
+        help="Fast load: relaxed PRAGMAs, one transaction, indexes and FK check after the data",
     )
+    generate.add_argument("--journal-mode", choices=BULK_JOURNAL_MODES, default="OFF", help="Journal mode for --bulk")
+    generate.add_argument("--cache-size-mb", type=int, default=DEFAULT_CACHE_SIZE_MB, help="Page cache for --bulk")
+    generate.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes generating table shards into staging databases (implies --bulk)",
+    )
+    generate.add_argument("--shard-rows", type=int, default=DEFAULT_SHARD_ROWS, help="Rows per shard with --workers")
+    return parser
+
+
+def main() -> None:
+    command_main(build_cli_parser())
 
 
 if __name__ == "__main__":
@@ -15,3 +15,7 @@ def create_table_sql(name: str, spec: dict, relationships: list[dict]) -> str:
         if rel["child_table"] == name:
             cols.append(f"FOREIGN KEY ({rel['child_key']}) REFERENCES {rel['parent_table']}({rel['parent_key']})")
     return f"CREATE TABLE IF NOT EXISTS {name} ({', '.join(cols)});"
+
+
+def create_index_sql(name: str, column: str) -> str:
+    return f"CREATE INDEX IF NOT EXISTS idx_{name}_{column} ON {name}({column});"
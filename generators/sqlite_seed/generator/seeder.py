@@ -1,31 +1,250 @@
 from __future__ import annotations
 
 import sqlite3
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Any
 
-from shared.schema_dsl.engine import generate_tables
+from shared.corruption.profiles import PROFILE_DEFAULTS
+from shared.relationships.fk import generation_order
+from shared.schema_dsl.engine import (
+    DEFAULT_BATCH_SIZE,
+    iter_table_batches,
+    key_context,
+    stream_batches,
+    table_columns,
+    unique_trackers,
+)
 
+from .ddl import create_index_sql, create_table_sql
 
-def seed_database(schema: dict, out_file: str, seed: int, rows_override: int | None, profile: str) -> dict[str, int]:
-    tables = generate_tables(schema, seed, rows_override, profile)
-    Path(out_file).parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(out_file)
-    conn.execute("PRAGMA foreign_keys = ON;")
-    from .ddl import create_table_sql
+BULK_JOURNAL_MODES = ("OFF", "WAL", "MEMORY")
+DEFAULT_CACHE_SIZE_MB = 256
+DEFAULT_SHARD_ROWS = 250_000
+
+# Per-process state of parallel seeding workers, set by ``_init_worker``.
+_WORKER: dict[str, Any] = {}
 
+
+def _create_schema(conn: sqlite3.Connection, schema: dict, *, indexes: bool) -> None:
     relationships = schema.get("relationships", [])
     for tname, spec in schema.get("tables", {}).items():
         conn.execute(create_table_sql(tname, spec, relationships))
-        if spec.get("indexes"):
-            for idx in spec["indexes"]:
-                conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{tname}_{idx} ON {tname}({idx});")
-    for tname, rows in tables.items():
-        if not rows:
+        if indexes:
+            _create_indexes(conn, tname, spec)
+
+
+def _create_indexes(conn: sqlite3.Connection, tname: str, spec: dict) -> None:
+    for column in spec.get("indexes", []):
+        conn.execute(create_index_sql(tname, column))
+
+
+def _insert_batches(conn: sqlite3.Connection, tname: str, batches) -> int:
+    count = 0
+    for batch in batches:
+        if not len(batch):
             continue
-        cols = list(rows[0].keys())
+        cols = batch.names
         q = f"INSERT INTO {tname} ({','.join(cols)}) VALUES ({','.join('?' for _ in cols)})"
-        conn.executemany(q, [tuple(r.get(c) for c in cols) for r in rows])
-    conn.commit()
-    counts = {k: len(v) for k, v in tables.items()}
-    conn.close()
+        conn.executemany(q, batch.iter_tuples(cols))
+        count += len(batch)
+    return count
+
+
+def _bulk_pragmas(conn: sqlite3.Connection, journal_mode: str, cache_size_mb: int) -> None:
+    conn.execute("PRAGMA foreign_keys = OFF;")
+    conn.execute(f"PRAGMA journal_mode = {journal_mode};")
+    conn.execute("PRAGMA synchronous = OFF;")
+    conn.execute(f"PRAGMA cache_size = {-int(cache_size_mb) * 1024};")
+    conn.execute("PRAGMA temp_store = MEMORY;")
+
+
+def _row_count(spec: dict, rows_override: int | None) -> int:
+    return int(rows_override if rows_override is not None else spec.get("rows", 100))
+
+
+def _plan_shards(
+    schema: dict, rows_override: int | None, profile: str, shard_rows: int
+) -> list[tuple[str, list[tuple[int, int] | None]]]:
+    """Row ranges per table in generation order (``None`` = the whole table in one shard).
+
+    Tables whose ``unique`` columns are checked against seen values, and every table of a
+    profile with duplicates, are not split: their rows depend on all earlier rows.
+    """
+
+    tables = schema.get("tables", {})
+    splittable = PROFILE_DEFAULTS.get(profile, {}).get("duplicates", 0) <= 0
+    plan = []
+    for tname in generation_order(tables, schema.get("relationships", [])):
+        row_count = _row_count(tables[tname], rows_override)
+        if not splittable or unique_trackers(tables[tname], row_count) or row_count <= shard_rows:
+            plan.append((tname, [None]))
+        else:
+            plan.append((tname, [(start, min(start + shard_rows, row_count)) for start in range(0, row_count, shard_rows)]))
+    return plan
+
+
+def _init_worker(schema: dict, seed: int, rows_override: int | None, profile: str, batch_size: int) -> None:
+    _WORKER.clear()
+    _WORKER.update(schema=schema, seed=seed, rows_override=rows_override, profile=profile, batch_size=batch_size)
+    _WORKER["contexts"] = {}
+
+
+def _stage_shard(tname: str, row_range: tuple[int, int] | None, path: str) -> int:
+    """Write one shard of ``tname`` into a new staging database at ``path``."""
+
+    schema, seed, rows_override, profile, batch_size = (
+        _WORKER[key] for key in ("schema", "seed", "rows_override", "profile", "batch_size")
+    )
+    contexts = _WORKER["contexts"]
+    if tname not in contexts:
+        contexts[tname] = key_context(schema, seed, tname, rows_override, profile, batch_size)
+    spec = schema["tables"][tname]
+    relationships = schema.get("relationships", [])
+    batches = iter_table_batches(
+        tname,
+        spec,
+        seed,
+        _row_count(spec, rows_override),
+        relationships,
+        dict(contexts[tname]),
+        profile,
+        batch_size,
+        row_range=row_range,
+    )
+    conn = sqlite3.connect(path)
+    try:
+        _bulk_pragmas(conn, "OFF", DEFAULT_CACHE_SIZE_MB)
+        conn.execute(create_table_sql(tname, spec, relationships))
+        conn.execute("BEGIN;")
+        count = _insert_batches(conn, tname, batches)
+        conn.commit()
+        return count
+    finally:
+        conn.close()
+
+
+def _seed_parallel(
+    conn: sqlite3.Connection,
+    schema: dict,
+    staging_dir: str,
+    seed: int,
+    rows_override: int | None,
+    profile: str,
+    *,
+    workers: int,
+    shard_rows: int,
+    batch_size: int,
+) -> dict[str, int]:
+    """Generate shards into staging databases in worker processes, then merge them in order."""
+
+    relationships = schema.get("relationships", [])
+    plan = _plan_shards(schema, rows_override, profile, shard_rows)
+    counts: dict[str, int] = {}
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(schema, seed, rows_override, profile, batch_size),
+    ) as pool:
+        staged: list[tuple[str, list[tuple[str, Any]]]] = []
+        for tname, row_ranges in plan:
+            shards = []
+            for idx, row_range in enumerate(row_ranges):
+                path = str(Path(staging_dir) / f"{tname}.{idx}.db")
+                shards.append((path, pool.submit(_stage_shard, tname, row_range, path)))
+            staged.append((tname, shards))
+        for tname, shards in staged:
+            cols = ",".join(table_columns(tname, schema["tables"][tname], relationships))
+            counts[tname] = 0
+            for path, future in shards:
+                counts[tname] += future.result()
+                conn.execute("ATTACH DATABASE ? AS shard;", (path,))
+                conn.execute(f"INSERT INTO main.{tname} ({cols}) SELECT {cols} FROM shard.{tname} ORDER BY rowid;")
+                conn.commit()
+                conn.execute("DETACH DATABASE shard;")
+                Path(path).unlink()
     return counts
+
+
+def seed_database(
+    schema: dict,
+    out_file: str,
+    seed: int,
+    rows_override: int | None,
+    profile: str,
+    *,
+    bulk: bool = False,
+    journal_mode: str = "OFF",
+    cache_size_mb: int = DEFAULT_CACHE_SIZE_MB,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: int = 1,
+    shard_rows: int = DEFAULT_SHARD_ROWS,
+) -> dict[str, int]:
+    """Generate every table into the SQLite file ``out_file``; returns rows per table.
+
+    Rows are generated and inserted ``batch_size`` at a time. The default mode creates
+    indexes first and enforces foreign keys on every insert. ``bulk=True`` is the fast
+    path for large seeds:
+    - ``journal_mode`` (``OFF``, ``WAL`` or ``MEMORY``), ``synchronous=OFF`` and a cache
+      of ``cache_size_mb`` are set for the load;
+    - foreign keys are not enforced during the load;
+    - all rows go in one transaction;
+    - indexes are built after the data is in;
+    - ``PRAGMA foreign_key_check`` runs once at the end and raises
+      ``sqlite3.IntegrityError`` on violations.
+    With ``journal_mode=OFF`` a crash mid-load can leave the file corrupt; re-seed it.
+
+    ``workers > 1`` loads in bulk mode with tables split into shards of ``shard_rows``
+    rows. Worker processes generate the shards into staging databases next to
+    ``out_file``. The shards are then merged in generation order with ``ATTACH`` and
+    ``INSERT INTO ... SELECT``, so the file holds the same rows, in the same order, as a
+    serial seed.
+    """
+
+    journal_mode = journal_mode.upper()
+    if journal_mode not in BULK_JOURNAL_MODES:
+        raise ValueError(f"Unknown journal mode {journal_mode!r}; expected one of {', '.join(BULK_JOURNAL_MODES)}")
+    if workers < 1 or shard_rows < 1:
+        raise ValueError("workers and shard_rows must be >= 1")
+    Path(out_file).parent.mkdir(parents=True, exist_ok=True)
+    streams = stream_batches(schema, seed, rows_override, profile, batch_size)
+    conn = sqlite3.connect(out_file)
+    try:
+        if not bulk and workers == 1:
+            conn.execute("PRAGMA foreign_keys = ON;")
+            _create_schema(conn, schema, indexes=True)
+            counts = {tname: _insert_batches(conn, tname, batches) for tname, batches in streams.items()}
+            conn.commit()
+            return counts
+
+        _bulk_pragmas(conn, journal_mode, cache_size_mb)
+        _create_schema(conn, schema, indexes=False)
+        if workers > 1:
+            with tempfile.TemporaryDirectory(prefix=f"{Path(out_file).name}.", dir=Path(out_file).parent) as staging:
+                counts = _seed_parallel(
+                    conn,
+                    schema,
+                    staging,
+                    seed,
+                    rows_override,
+                    profile,
+                    workers=workers,
+                    shard_rows=shard_rows,
+                    batch_size=batch_size,
+                )
+        else:
+            conn.execute("BEGIN;")
+            counts = {tname: _insert_batches(conn, tname, batches) for tname, batches in streams.items()}
+        for tname, spec in schema.get("tables", {}).items():
+            _create_indexes(conn, tname, spec)
+        conn.commit()
+
+        violations = conn.execute("PRAGMA foreign_key_check;").fetchall()
+        if violations:
+            raise sqlite3.IntegrityError(f"Foreign key violations: {violations[:10]}")
+        if journal_mode != "WAL":
+            conn.execute("PRAGMA journal_mode = DELETE;")
+        return counts
+    finally:
+        conn.close()
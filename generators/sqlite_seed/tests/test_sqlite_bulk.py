@@ -0,0 +1,38 @@
+import sqlite3
+
+import pytest
+
+from generators.sqlite_seed.generator.seeder import seed_database
+from shared.schema_dsl.parser import load_schema
+
+SCHEMA = "generators/sqlite_seed/schemas/retail_basic_sqlite.yaml"
+
+
+def _dump(db_path):
+    conn = sqlite3.connect(db_path)
+    tables = {t: conn.execute(f"SELECT * FROM {t} ORDER BY rowid").fetchall() for t in ("customers", "orders")}
+    indexes = sorted(row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'"))
+    journal = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    conn.close()
+    return tables, indexes, journal
+
+
+@pytest.mark.parametrize("journal_mode", ["OFF", "WAL"])
+def test_bulk_load_matches_default_load(tmp_path, journal_mode):
+    raw = load_schema(SCHEMA).raw
+    default_counts = seed_database(raw, str(tmp_path / "a.db"), 9, 120, "fast", batch_size=50)
+    bulk_counts = seed_database(
+        raw, str(tmp_path / "b.db"), 9, 120, "fast", bulk=True, journal_mode=journal_mode, batch_size=7
+    )
+
+    assert bulk_counts == default_counts == {"customers": 120, "orders": 120}
+    expected, expected_indexes, _ = _dump(tmp_path / "a.db")
+    tables, indexes, journal = _dump(tmp_path / "b.db")
+    assert tables == expected
+    assert indexes == expected_indexes == ["idx_orders_customer_id"]
+    assert journal == ("wal" if journal_mode == "WAL" else "delete")
+
+
+def test_bulk_load_rejects_unknown_journal_mode(tmp_path):
+    with pytest.raises(ValueError, match="journal mode"):
+        seed_database(load_schema(SCHEMA).raw, str(tmp_path / "c.db"), 9, 5, "fast", bulk=True, journal_mode="TRUNCATE")
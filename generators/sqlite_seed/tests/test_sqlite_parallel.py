@@ -0,0 +1,59 @@
+import sqlite3
+
+import pytest
+
+from generators.sqlite_seed.generator.seeder import seed_database
+from shared.io.columnar import ColumnBatch
+from shared.io.rng import RNG_BLOCK_ROWS
+from shared.schema_dsl.engine import iter_table_batches, key_context, stream_batches
+from shared.schema_dsl.parser import load_schema
+
+SCHEMA = "generators/sqlite_seed/schemas/retail_basic_sqlite.yaml"
+
+
+def _dump(db_path):
+    conn = sqlite3.connect(db_path)
+    tables = {t: conn.execute(f"SELECT * FROM {t} ORDER BY rowid").fetchall() for t in ("customers", "orders")}
+    indexes = sorted(row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'"))
+    conn.close()
+    return tables, indexes
+
+
+@pytest.mark.parametrize("profile", ["fast", "realistic"])
+def test_row_ranges_replay_the_whole_table(profile):
+    raw = load_schema(SCHEMA).raw
+    whole = {
+        name: ColumnBatch.concat(list(batches)).to_rows()
+        for name, batches in stream_batches(raw, 5, 90, profile, batch_size=11).items()
+    }
+    context = key_context(raw, 5, "orders", 90, profile)
+    parts = [
+        iter_table_batches("orders", raw["tables"]["orders"], 5, 90, raw["relationships"], context, profile, 8, (start, stop))
+        for start, stop in [(0, 25), (25, 26), (26, 90)]
+    ]
+    assert [row for batches in parts for batch in batches for row in batch.iter_rows()] == whole["orders"]
+
+
+def test_row_ranges_start_inside_later_rng_blocks():
+    raw = load_schema(SCHEMA).raw
+    rows = 2 * RNG_BLOCK_ROWS + 40
+    whole = ColumnBatch.concat(list(stream_batches(raw, 5, rows, "dirty")["orders"])).to_rows()
+    context = key_context(raw, 5, "orders", rows, "dirty")
+    start = 2 * RNG_BLOCK_ROWS - 7
+    batches = iter_table_batches(
+        "orders", raw["tables"]["orders"], 5, rows, raw["relationships"], context, "dirty", 20, (start, rows)
+    )
+    assert [row for batch in batches for row in batch.iter_rows()] == whole[start:]
+
+
+@pytest.mark.parametrize("workers", [2, 3])
+def test_parallel_seed_matches_serial_seed(tmp_path, workers):
+    raw = load_schema(SCHEMA).raw
+    serial = seed_database(raw, str(tmp_path / "a.db"), 9, 120, "realistic", bulk=True)
+    parallel = seed_database(
+        raw, str(tmp_path / "b.db"), 9, 120, "realistic", workers=workers, shard_rows=35, batch_size=10
+    )
+
+    assert parallel == serial == {"customers": 120, "orders": 120}
+    assert _dump(tmp_path / "b.db") == _dump(tmp_path / "a.db")
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["a.db", "b.db"]
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import tempfile
+from pathlib import Path
+from typing import Any, Iterable
+
+DEFAULT_MEMORY_KEYS = 1_000_000
+DEFAULT_CACHE_KIB = 64 << 10
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
+
+def _storable(value: Any) -> Any:
+    """``value`` as an SQLite key comparing equal to what Python compares equal to it."""
+
+    if value is None or isinstance(value, (str, float, bytes)):
+        return value
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, int) and _INT64_MIN <= value <= _INT64_MAX:
+        return value
+    return f"{type(value).__name__}:{value!r}"
+
+
+class ParentKeyIndex:
+    """Parent key values of a foreign key, probed by child key batches.
+
+    Keys are kept in an exact ``set`` until ``memory_keys`` are held, then moved to an
+    indexed table in a scratch SQLite file under ``directory`` (the system temp
+    directory by default) with a page cache of ``cache_kib`` KiB, so memory stays
+    bounded for any number of parent rows. ``None`` is never a key. Call ``close`` (or
+    use as a context manager) to delete the scratch file.
+    """
+
+    def __init__(
+        self,
+        memory_keys: int = DEFAULT_MEMORY_KEYS,
+        directory: str | Path | None = None,
+        cache_kib: int = DEFAULT_CACHE_KIB,
+    ) -> None:
+        self.memory_keys = memory_keys
+        self.directory = directory
+        self.cache_kib = cache_kib
+        self.keys: set[Any] | None = set()
+        self.path: Path | None = None
+        self._conn: sqlite3.Connection | None = None
+
+    @property
+    def spilled(self) -> bool:
+        return self._conn is not None
+
+    def __enter__(self) -> "ParentKeyIndex":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _spill(self) -> sqlite3.Connection:
+        fd, name = tempfile.mkstemp(prefix="datagen-keys-", suffix=".db", dir=self.directory)
+        os.close(fd)
+        self.path = Path(name)
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute(f"PRAGMA cache_size = -{int(self.cache_kib)}")
+        conn.execute("CREATE TABLE keys (key PRIMARY KEY) WITHOUT ROWID")
+        conn.execute("CREATE TABLE probe (pos INTEGER, key)")
+        self._conn = conn
+        self._insert(self.keys or ())
+        self.keys = None
+        return conn
+
+    def _insert(self, values: Iterable[Any]) -> None:
+        assert self._conn is not None
+        values = list(values)
+        # NULL keys are dropped by the NOT NULL primary key, and re-running the insert
+        # after a value SQLite cannot bind is harmless.
+        try:
+            self._conn.executemany("INSERT OR IGNORE INTO keys VALUES (?)", zip(values))
+        except (OverflowError, sqlite3.ProgrammingError):
+            self._conn.executemany("INSERT OR IGNORE INTO keys VALUES (?)", ((_storable(value),) for value in values))
+
+    def update(self, values: Iterable[Any]) -> None:
+        if self.keys is not None:
+            self.keys.update(values)
+            self.keys.discard(None)
+            if len(self.keys) <= self.memory_keys:
+                return
+            self._spill()
+            return
+        self._insert(values)
+
+    def missing(self, values: list[Any]) -> list[int]:
+        """Positions of the non-null ``values`` that are not keys, in order."""
+
+        if self.keys is not None:
+            keys = self.keys
+            if keys.issuperset(value for value in values if value is not None):
+                return []
+            return [pos for pos, value in enumerate(values) if value is not None and value not in keys]
+        conn = self._conn
+        assert conn is not None
+        try:
+            conn.execute("DELETE FROM probe")
+            conn.executemany("INSERT INTO probe VALUES (?, ?)", enumerate(values))
+        except (OverflowError, sqlite3.ProgrammingError):
+            conn.execute("DELETE FROM probe")
+            storable = ((pos, _storable(value)) for pos, value in enumerate(values))
+            conn.executemany("INSERT INTO probe VALUES (?, ?)", storable)
+        orphans = (
+            "SELECT pos FROM probe WHERE key IS NOT NULL "
+            "AND NOT EXISTS (SELECT 1 FROM keys WHERE keys.key = probe.key) ORDER BY pos"
+        )
+        return [row[0] for row in conn.execute(orphans)]
+
+    def __len__(self) -> int:
+        if self.keys is not None:
+            return len(self.keys)
+        assert self._conn is not None
+        return int(self._conn.execute("SELECT COUNT(*) FROM keys").fetchone()[0])
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        if self.path is not None:
+            self.path.unlink(missing_ok=True)
+            self.path = None
+        self.keys = set()
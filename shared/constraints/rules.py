@@ -3,6 +3,8 @@ from __future__ import annotations
 import re
 from typing import Any
 
+from shared.io.columnar import ColumnBatch
+
 
 def validate_column_value(value: Any, column: dict, seen: set[Any] | None = None) -> bool:
     cons = column.get("constraints", {})
@@ -21,19 +23,30 @@ def validate_column_value(value: Any, column: dict, seen: set[Any] | None = None
     return True
 
 
-def validate_dataset(tables: dict[str, list[dict]], schema: dict) -> list[str]:
+def _column(table: ColumnBatch | list[dict], name: str) -> list[Any]:
+    if isinstance(table, ColumnBatch):
+        return table.column(name) if name in table else [None] * len(table)
+    return [row.get(name) for row in table]
+
+
+def validate_dataset(tables: dict[str, ColumnBatch | list[dict]], schema: dict) -> list[str]:
     errors: list[str] = []
     for tname, spec in schema.get("tables", {}).items():
         rows = tables.get(tname, [])
         required = [c["name"] for c in spec.get("columns", [])]
+        if isinstance(rows, ColumnBatch):
+            missing = [c for c in required if c not in rows]
+            if missing:
+                errors.extend(f"{tname}[{i}] missing {missing}" for i in range(len(rows)))
+            continue
         for i, row in enumerate(rows):
             missing = [c for c in required if c not in row]
             if missing:
                 errors.append(f"{tname}[{i}] missing {missing}")
     for rel in schema.get("relationships", []):
-        parent_keys = {r[rel['parent_key']] for r in tables.get(rel["parent_table"], [])}
-        for row in tables.get(rel["child_table"], []):
-            if row.get(rel["child_key"]) not in parent_keys:
+        parent_keys = set(_column(tables.get(rel["parent_table"], []), rel["parent_key"]))
+        for value in _column(tables.get(rel["child_table"], []), rel["child_key"]):
+            if value not in parent_keys:
                 errors.append(f"FK violation {rel['child_table']}.{rel['child_key']}")
                 break
     return errors
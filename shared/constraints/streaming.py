@@ -0,0 +1,471 @@
+from __future__ import annotations
+
+import re
+import sqlite3
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Mapping
+
+from shared.constraints.foreign_keys import DEFAULT_MEMORY_KEYS, ParentKeyIndex
+from shared.constraints.unique import DEFAULT_EXACT_LIMIT, BloomFilter, HyperLogLog, value_hashes
+from shared.corruption.profiles import PROFILE_DEFAULTS
+from shared.io.columnar import Column, ColumnBatch
+
+DEFAULT_SAMPLE_SIZE = 5
+_PACKED_DTYPES = {"int": "int64", "float": "float64", "bool": "int8"}
+_PACKED_TYPES = {"int": int, "float": float, "bool": bool}
+COLUMN_TYPES: dict[str, tuple[type, ...]] = {
+    "id": (int, str),
+    "integer": (int,),
+    "float": (int, float),
+    "categorical": (str, int, float, bool),
+    "boolean": (bool,),
+    "date": (str,),
+    "datetime": (str,),
+    "string": (str,),
+    "string_pattern": (str,),
+    "name": (str,),
+    "email": (str,),
+    "city": (str,),
+    "state": (str,),
+    "constant": (str, int, float, bool),
+    "object": (dict,),
+}
+
+
+def _numpy() -> Any:
+    try:
+        import numpy as np
+    except ImportError:
+        return None
+    return np
+
+
+def expected_row_counts(
+    raw_schema: dict[str, Any], rows_override: int | None = None, profile: str | None = None
+) -> dict[str, int]:
+    """Rows each table of ``raw_schema`` should have once written.
+
+    Counts include the duplicates appended by a table's ``corruption.duplicate_rate``
+    (csv_generator schemas) or by the shared engine's ``profile``.
+    """
+
+    duplicates = PROFILE_DEFAULTS.get(profile, {}).get("duplicates", 0.0) if profile else 0.0
+    counts: dict[str, int] = {}
+    for table_name, spec in raw_schema.get("tables", {}).items():
+        rows = int(rows_override if rows_override is not None else spec.get("rows", 100))
+        extra = int(rows * float(spec.get("corruption", {}).get("duplicate_rate", 0.0)))
+        if duplicates > 0 and rows > 2:
+            extra += max(1, int(rows * duplicates))
+        counts[table_name] = rows + extra
+    return counts
+
+
+def parents_first(tables: Iterable[str], relationships: list[dict[str, Any]]) -> list[str]:
+    """Table names in schema order, moved after their parent tables where needed."""
+
+    pending = list(tables)
+    order: list[str] = []
+    while pending:
+        ready = next(
+            (
+                name
+                for name in pending
+                if all(
+                    rel["parent_table"] in order or rel["parent_table"] not in pending or rel["parent_table"] == name
+                    for rel in relationships
+                    if rel["child_table"] == name
+                )
+            ),
+            pending[0],
+        )
+        pending.remove(ready)
+        order.append(ready)
+    return order
+
+
+@dataclass
+class StreamingResult:
+    """Outcome of ``validate_stream``: one error per failing rule, with row samples."""
+
+    errors: list[str]
+    row_counts: dict[str, int]
+    violations: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def valid(self) -> bool:
+        return not self.errors
+
+
+class _ExactKeys:
+    """Seen values of a unique column, in a ``set``."""
+
+    suffix = ""
+
+    def __init__(self, capacity: int) -> None:
+        self.seen: set[Any] = set()
+
+    def repeated(self, rows: list[int], values: list[Any]) -> list[int]:
+        batch = set(values)
+        if len(batch) == len(values) and self.seen.isdisjoint(batch):
+            self.seen |= batch
+            return []
+        repeated = []
+        for row, value in zip(rows, values):
+            if value in self.seen:
+                repeated.append(row)
+            else:
+                self.seen.add(value)
+        return repeated
+
+    def estimated_repeats(self) -> int:
+        return 0
+
+
+class _BloomKeys(_ExactKeys):
+    """Seen values in a ``BloomFilter``: fixed memory, rare false repeats."""
+
+    suffix = " (probable)"
+
+    def __init__(self, capacity: int) -> None:
+        self.bloom = BloomFilter(capacity)
+
+    def repeated(self, rows: list[int], values: list[Any]) -> list[int]:
+        check = self.bloom.check_and_add
+        return [row for row, value in zip(rows, values) if check(value)]
+
+
+class _SketchKeys(_ExactKeys):
+    """Distinct values estimated with a ``HyperLogLog``; repeats are counted, not located."""
+
+    suffix = " (estimated)"
+
+    def __init__(self, capacity: int) -> None:
+        self.sketch = HyperLogLog()
+        self.count = 0
+
+    def repeated(self, rows: list[int], values: list[Any]) -> list[int]:
+        self.sketch.add_hashes(value_hashes(values))
+        self.count += len(values)
+        return []
+
+    def estimated_repeats(self) -> int:
+        excess = self.count - self.sketch.estimate()
+        # Below three standard errors the excess is indistinguishable from estimation noise.
+        return round(excess) if excess > max(0.5, 3 * self.sketch.relative_error * self.count) else 0
+
+
+UNIQUENESS_MODES = {"exact": _ExactKeys, "bloom": _BloomKeys, "hll": _SketchKeys}
+
+
+class StreamingValidator:
+    """Check tables batch by batch against a schema without holding their rows.
+
+    Per column, ``constraints`` (``not_null``, ``unique``/``primary_key``, ``min``,
+    ``max``, ``allowed``, ``pattern``) and the column ``type`` are checked; nulls only
+    fail ``not_null``. Packed numeric columns (see ``Column``) are checked with NumPy
+    array operations when it is installed. Foreign keys are checked against the parent
+    key values, so parents must be checked before their children (``parents_first``).
+    Only unique-column state and parent keys still awaited by a child are kept; each
+    parent key column holds up to ``memory_keys`` values in memory and spills the rest
+    to a ``ParentKeyIndex`` scratch file under ``scratch_dir``.
+
+    ``uniqueness`` selects how unique columns remember values: ``exact`` (a set),
+    ``bloom`` (a ``BloomFilter`` sized for ``capacity`` rows; a few false repeats are
+    possible) or ``hll`` (a 16 KiB ``HyperLogLog`` per column; repeats are an estimate
+    without row samples). Violations are counted per rule with the first
+    ``sample_size`` row numbers, so the result stays small for any input.
+    """
+
+    def __init__(
+        self,
+        raw_schema: dict[str, Any],
+        sample_size: int = DEFAULT_SAMPLE_SIZE,
+        uniqueness: str = "exact",
+        capacity: Mapping[str, int] | None = None,
+        memory_keys: int = DEFAULT_MEMORY_KEYS,
+        scratch_dir: str | None = None,
+    ) -> None:
+        if uniqueness not in UNIQUENESS_MODES:
+            raise ValueError(f"Unknown uniqueness mode {uniqueness!r}; expected one of {', '.join(UNIQUENESS_MODES)}")
+        self.tables = raw_schema.get("tables", {})
+        self.relationships = raw_schema.get("relationships", [])
+        self.sample_size = sample_size
+        self.uniqueness = uniqueness
+        self.capacity = dict(capacity or {})
+        self.memory_keys = memory_keys
+        self.scratch_dir = scratch_dir
+        self.row_counts: dict[str, int] = {}
+        self.violations: dict[str, int] = {}
+        self.samples: dict[str, list[int]] = {}
+        self.errors: list[str] = []
+        self._parent_keys: dict[tuple[str, str], ParentKeyIndex] = {}
+
+    def _record(self, rule: str, base: int, rows: list[int], count: int | None = None) -> None:
+        count = len(rows) if count is None else count
+        if not count:
+            return
+        self.violations[rule] = self.violations.get(rule, 0) + count
+        samples = self.samples.setdefault(rule, [])
+        samples.extend(base + row for row in rows[: self.sample_size - len(samples)])
+
+    def _check_column(
+        self, table_name: str, column: dict[str, Any], data: Column, base: int, keys: _ExactKeys | None
+    ) -> None:
+        np = _numpy() if data.kind != "object" else None
+        if np is not None:
+            self._check_packed(np, table_name, column, data, base, keys)
+            return
+        prefix = f"{table_name}.{column['name']}"
+        cons = column.get("constraints", {})
+        values = data.to_pylist()
+        present = [(row, value) for row, value in enumerate(values) if value is not None and value != ""]
+        if cons.get("not_null") and len(present) < len(values):
+            nulls = [row for row, value in enumerate(values) if value is None or value == ""]
+            self._record(f"{prefix} violates not_null", base, nulls)
+        expected = COLUMN_TYPES.get(column.get("type", ""))
+        if expected is not None:
+            mistyped = [row for row, value in present if not isinstance(value, expected)]
+            self._record(f"{prefix} has invalid type for {column['type']}", base, mistyped)
+        if keys is not None and present:
+            rows, kept = zip(*present)
+            self._record(f"{prefix} violates uniqueness{keys.suffix}", base, keys.repeated(list(rows), list(kept)))
+        if "allowed" in cons:
+            allowed = cons["allowed"]
+            self._record(f"{prefix} not in allowed", base, [row for row, value in present if value not in allowed])
+        for rule, outside in (("min", lambda value, bound: value < bound), ("max", lambda value, bound: value > bound)):
+            if rule in cons:
+                bad = []
+                for row, value in present:
+                    try:
+                        if outside(value, cons[rule]):
+                            bad.append(row)
+                    except TypeError:
+                        pass  # reported by the type check
+                self._record(f"{prefix} {'below min' if rule == 'min' else 'above max'}", base, bad)
+        if cons.get("pattern"):
+            pattern = re.compile(cons["pattern"])
+            unmatched = [row for row, value in present if not pattern.match(str(value))]
+            self._record(f"{prefix} does not match pattern", base, unmatched)
+
+    def _check_packed(
+        self, np: Any, table_name: str, column: dict[str, Any], data: Column, base: int, keys: _ExactKeys | None
+    ) -> None:
+        """``_check_column`` for an ``int``/``float``/``bool`` column, on its buffer as an array."""
+
+        prefix = f"{table_name}.{column['name']}"
+        cons = column.get("constraints", {})
+        values = np.frombuffer(data.values, dtype=_PACKED_DTYPES[data.kind])
+        if data.valid is None:
+            rows = np.arange(len(values))
+            present = values
+        else:
+            valid = np.frombuffer(data.valid, dtype=np.bool_)
+            rows = np.flatnonzero(valid)
+            present = values[rows]
+            if cons.get("not_null"):
+                self._record(f"{prefix} violates not_null", base, np.flatnonzero(~valid).tolist())
+        expected = COLUMN_TYPES.get(column.get("type", ""))
+        if expected is not None and not issubclass(_PACKED_TYPES[data.kind], expected):
+            self._record(f"{prefix} has invalid type for {column['type']}", base, rows.tolist())
+        if keys is not None and len(present):
+            repeated = keys.repeated(rows.tolist(), present.tolist())
+            self._record(f"{prefix} violates uniqueness{keys.suffix}", base, repeated)
+        if "allowed" in cons:
+            allowed = [value for value in cons["allowed"] if isinstance(value, (int, float))]
+            self._record(f"{prefix} not in allowed", base, rows[~np.isin(present, allowed)].tolist())
+        for rule, label in (("min", "below min"), ("max", "above max")):
+            bound = cons.get(rule)
+            if isinstance(bound, (int, float)):
+                outside = present < bound if rule == "min" else present > bound
+                self._record(f"{prefix} {label}", base, rows[outside].tolist())
+        if cons.get("pattern"):
+            pattern = re.compile(cons["pattern"])
+            python_values = data.to_pylist()
+            unmatched = [row for row in rows.tolist() if not pattern.match(str(python_values[row]))]
+            self._record(f"{prefix} does not match pattern", base, unmatched)
+
+    def check_table(self, table_name: str, batches: Iterable[ColumnBatch]) -> int:
+        """Check one table's batches and return its row count."""
+
+        spec = self.tables.get(table_name, {})
+        columns = spec.get("columns", [])
+        outgoing = [rel for rel in self.relationships if rel["child_table"] == table_name]
+        for rel in outgoing:
+            if (rel["parent_table"], rel["parent_key"]) not in self._parent_keys:
+                raise ValueError(f"Parent table {rel['parent_table']} must be checked before {table_name}")
+        keys = {
+            rel["parent_key"]: ParentKeyIndex(self.memory_keys, self.scratch_dir)
+            for rel in self.relationships
+            if rel["parent_table"] == table_name
+        }
+        capacity = int(self.capacity.get(table_name, spec.get("rows", DEFAULT_EXACT_LIMIT)))
+        unique = {
+            col["name"]: UNIQUENESS_MODES[self.uniqueness](capacity)
+            for col in columns
+            if col.get("constraints", {}).get("unique") or col.get("constraints", {}).get("primary_key")
+        }
+        required = list(dict.fromkeys([*(col["name"] for col in columns), *(rel["child_key"] for rel in outgoing)]))
+        missing: set[str] = set()
+        base = 0
+        try:
+            for batch in batches:
+                missing.update(name for name in required if name not in batch)
+                for column in columns:
+                    if column["name"] in batch:
+                        data = batch.columns[column["name"]]
+                        self._check_column(table_name, column, data, base, unique.get(column["name"]))
+                for rel in outgoing:
+                    if rel["child_key"] in batch:
+                        parent, parent_key = rel["parent_table"], rel["parent_key"]
+                        orphans = self._parent_keys[(parent, parent_key)].missing(batch.column(rel["child_key"]))
+                        rule = f"FK violation {table_name}.{rel['child_key']} -> {parent}.{parent_key}"
+                        self._record(rule, base, orphans)
+                for name, index in keys.items():
+                    if name in batch:
+                        index.update(batch.column(name))
+                base += len(batch)
+        except BaseException:
+            for index in keys.values():
+                index.close()
+            raise
+        if missing:
+            self.errors.append(f"{table_name} missing columns {sorted(missing)}")
+        for name, tracker in unique.items():
+            rule = f"{table_name}.{name} violates uniqueness{tracker.suffix}"
+            self._record(rule, base, [], tracker.estimated_repeats())
+        self.row_counts[table_name] = base
+        for name, index in keys.items():
+            self._parent_keys[(table_name, name)] = index
+        self._release(table_name)
+        return base
+
+    def _release(self, table_name: str) -> None:
+        """Close parent key indexes no unchecked child table refers to any more."""
+
+        awaited = {
+            (rel["parent_table"], rel["parent_key"])
+            for rel in self.relationships
+            if rel["child_table"] not in self.row_counts
+        }
+        for key in [key for key in self._parent_keys if key not in awaited]:
+            self._parent_keys.pop(key).close()
+
+    def close(self) -> None:
+        """Delete the scratch files of the parent keys still held."""
+
+        for index in self._parent_keys.values():
+            index.close()
+        self._parent_keys.clear()
+
+    def result(self) -> StreamingResult:
+        return _result(self.errors, self.row_counts, self.violations, self.samples)
+
+
+def _result(
+    errors: list[str], row_counts: dict[str, int], violations: dict[str, int], samples: dict[str, list[int]]
+) -> StreamingResult:
+    errors = list(errors)
+    for rule, count in violations.items():
+        sampled = samples.get(rule, [])
+        rows = ", ".join(str(row) for row in sampled) + (", ..." if count > len(sampled) else "")
+        errors.append(f"{rule} in {count} row(s) (rows {rows})" if sampled else f"{rule} in {count} row(s)")
+    return StreamingResult(errors, dict(row_counts), dict(violations))
+
+
+def validate_stream(
+    raw_schema: dict[str, Any],
+    tables: Mapping[str, Iterable[ColumnBatch]],
+    sample_size: int = DEFAULT_SAMPLE_SIZE,
+    uniqueness: str = "exact",
+    capacity: Mapping[str, int] | None = None,
+    memory_keys: int = DEFAULT_MEMORY_KEYS,
+    scratch_dir: str | None = None,
+) -> StreamingResult:
+    """Validate tables given as lazy batch iterables (e.g. ``shared.io.readers``) in one pass each.
+
+    Tables are consumed parents first; tables of the schema absent from ``tables`` are
+    reported as missing. See ``StreamingValidator`` for the other arguments.
+    """
+
+    validator = StreamingValidator(raw_schema, sample_size, uniqueness, capacity, memory_keys, scratch_dir)
+    try:
+        for table_name in parents_first(raw_schema.get("tables", {}), raw_schema.get("relationships", [])):
+            if table_name in tables:
+                validator.check_table(table_name, tables[table_name])
+            else:
+                validator.errors.append(f"Missing output for table {table_name}")
+                validator.check_table(table_name, [])
+    finally:
+        validator.close()
+    return validator.result()
+
+
+def validate_sqlite(
+    conn: sqlite3.Connection, raw_schema: dict[str, Any], sample_size: int = DEFAULT_SAMPLE_SIZE
+) -> StreamingResult:
+    """``StreamingValidator``'s checks as SQL queries over a seeded database.
+
+    Column types are left to the table definitions; samples are ``rowid`` values.
+    """
+
+    conn.create_function("datagen_match", 2, lambda pattern, value: re.match(pattern, str(value)) is not None)
+    errors: list[str] = []
+    row_counts: dict[str, int] = {}
+    violations: dict[str, int] = {}
+    samples: dict[str, list[int]] = {}
+    found: set[str] = set()
+
+    def query(rule: str, sql: str, params: tuple[Any, ...] = ()) -> None:
+        count = conn.execute(f"SELECT COUNT(*) FROM ({sql})", params).fetchone()[0]
+        if count:
+            violations[rule] = count
+            samples[rule] = [row[0] for row in conn.execute(f"{sql} ORDER BY 1 LIMIT ?", (*params, sample_size))]
+
+    tables = raw_schema.get("tables", {})
+    for table_name, spec in tables.items():
+        present = {row[1] for row in conn.execute(f"PRAGMA table_info({table_name})")}
+        if not present:
+            errors.append(f"Missing output for table {table_name}")
+            row_counts[table_name] = 0
+            continue
+        found.add(table_name)
+        row_counts[table_name] = int(conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0])
+        columns = [col for col in spec.get("columns", []) if col["name"] in present]
+        missing = sorted(col["name"] for col in spec.get("columns", []) if col["name"] not in present)
+        if missing:
+            errors.append(f"{table_name} missing columns {missing}")
+        for column in columns:
+            name, cons = column["name"], column.get("constraints", {})
+            prefix = f"{table_name}.{name}"
+            rows = f"SELECT rowid FROM {table_name} WHERE {name} IS NOT NULL AND {name} != ''"
+            if cons.get("not_null"):
+                nulls = f"SELECT rowid FROM {table_name} WHERE {name} IS NULL OR {name} = ''"
+                query(f"{prefix} violates not_null", nulls)
+            if cons.get("unique") or cons.get("primary_key"):
+                ranked = (
+                    f"SELECT rowid, ROW_NUMBER() OVER (PARTITION BY {name} ORDER BY rowid) AS seen "
+                    f"FROM {table_name} WHERE {name} IS NOT NULL AND {name} != ''"
+                )
+                query(f"{prefix} violates uniqueness", f"SELECT rowid FROM ({ranked}) WHERE seen > 1")
+            if "allowed" in cons:
+                allowed = tuple(cons["allowed"])
+                marks = ",".join("?" for _ in allowed) or "NULL"
+                query(f"{prefix} not in allowed", f"{rows} AND {name} NOT IN ({marks})", allowed)
+            if "min" in cons:
+                query(f"{prefix} below min", f"{rows} AND {name} < ?", (cons["min"],))
+            if "max" in cons:
+                query(f"{prefix} above max", f"{rows} AND {name} > ?", (cons["max"],))
+            if cons.get("pattern"):
+                unmatched = f"{rows} AND NOT datagen_match(?, {name})"
+                query(f"{prefix} does not match pattern", unmatched, (cons["pattern"],))
+    for rel in raw_schema.get("relationships", []):
+        child, parent = rel["child_table"], rel["parent_table"]
+        child_key, parent_key = rel["child_key"], rel["parent_key"]
+        if child not in found or parent not in found:
+            continue
+        orphans = (
+            f"SELECT c.rowid FROM {child} AS c LEFT JOIN {parent} AS p ON c.{child_key} = p.{parent_key} "
+            f"WHERE c.{child_key} IS NOT NULL AND p.{parent_key} IS NULL"
+        )
+        query(f"FK violation {child}.{child_key} -> {parent}.{parent_key}", orphans)
+    return _result(errors, row_counts, violations, samples)
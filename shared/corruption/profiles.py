@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import random
 
+from shared.io.columnar import ColumnBatch
+
 
 PROFILE_DEFAULTS = {
     "fast": {"missingness": 0.0, "duplicates": 0.0, "outliers": 0.0},
@@ -23,3 +25,52 @@ def apply_profile(rows: list[dict], profile: str, rng: random.Random) -> list[di
         for _ in range(max(1, dup_count)):
             rows.append(dict(rng.choice(rows)))
     return rows
+
+
+def profile_missing(
+    batch: ColumnBatch,
+    profile: str,
+    rng: random.Random,
+    keys: list[str] | None = None,
+    rows: range | None = None,
+) -> None:
+    """Clear ``apply_profile``'s missing cells of ``batch`` in place, with the same draws.
+
+    Rows are drawn for in order from ``rng``, so profiling a table batch by batch with
+    one ``rng`` matches profiling it whole. ``rows`` limits the draws to those batch
+    positions (default: every row), e.g. the rows of one RNG block. ``keys`` are the
+    table's column names (default: the batch's); draws that pick a column the batch
+    does not hold are consumed without effect.
+    """
+
+    opts = PROFILE_DEFAULTS.get(profile, PROFILE_DEFAULTS["realistic"])
+    keys = batch.names if keys is None else keys
+    missingness = opts["missingness"]
+    for row in range(len(batch)) if rows is None else rows:
+        if rng.random() < missingness:
+            name = rng.choice(keys)
+            if name in batch:
+                batch.set_null(name, row)
+
+
+def skip_profile_missing(row_count: int, key_count: int, profile: str, rng: random.Random) -> None:
+    """Advance ``rng`` past ``profile_missing`` for ``row_count`` rows of ``key_count`` columns."""
+
+    missingness = PROFILE_DEFAULTS.get(profile, PROFILE_DEFAULTS["realistic"])["missingness"]
+    keys = range(key_count)
+    for _ in range(row_count):
+        if rng.random() < missingness:
+            rng.choice(keys)
+
+
+def profile_duplicates(row_count: int, profile: str, rng: random.Random) -> list[int]:
+    """Source row indices of the duplicates ``apply_profile`` appends to ``row_count`` rows."""
+
+    opts = PROFILE_DEFAULTS.get(profile, PROFILE_DEFAULTS["realistic"])
+    if opts["duplicates"] <= 0 or row_count <= 2:
+        return []
+    order = list(range(row_count))
+    for _ in range(max(1, int(row_count * opts["duplicates"]))):
+        order.append(order[rng.choice(range(len(order)))])
+    return order[row_count:]
+
@@ -12,6 +12,13 @@ def _choice(rng: random.Random, values: list[Any], weights: list[float] | None =
 
 
 def generate_value(column: dict[str, Any], idx: int, rng: random.Random) -> Any:
+    """Draw one value of ``column`` for row ``idx``.
+
+    ``rng`` may be a sequential ``random.Random`` (e.g. the current block of a
+    ``shared.io.rng.BlockStream``) or a ``shared.io.rng.CounterRNG`` positioned at the
+    row (``stream.at(idx)``) for random access to any row.
+    """
+
     ctype = column.get("type", "string")
     if ctype == "id":
         return idx + int(column.get("start", 1))
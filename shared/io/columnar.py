@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import csv
+from array import array
+from typing import Any, Iterable, Iterator
+
+_INT64_MIN, _INT64_MAX = -(1 << 63), (1 << 63) - 1
+_TYPECODES = {"int": "q", "float": "d", "bool": "b"}
+
+
+def _kind(values: list[Any]) -> str:
+    kind = None
+    for value in values:
+        if value is None:
+            continue
+        value_type = type(value)
+        if value_type is bool:
+            current = "bool"
+        elif value_type is int and _INT64_MIN <= value <= _INT64_MAX:
+            current = "int"
+        elif value_type is float:
+            current = "float"
+        else:
+            return "object"
+        if kind is None:
+            kind = current
+        elif kind != current:
+            return "object"
+    return kind or "object"
+
+
+class Column:
+    """One column of a ``ColumnBatch``.
+
+    ``int``/``float``/``bool`` columns keep their values in a typed ``array`` (8, 8
+    and 1 bytes per value) with an optional ``valid`` byte mask (``1`` = present);
+    null slots hold ``0``. ``object`` columns are plain lists with ``None`` inline.
+    """
+
+    __slots__ = ("kind", "values", "valid")
+
+    def __init__(self, kind: str, values: array | list[Any], valid: bytearray | None = None) -> None:
+        self.kind = kind
+        self.values = values
+        self.valid = valid
+
+    @classmethod
+    def from_values(cls, values: list[Any]) -> "Column":
+        kind = _kind(values)
+        if kind == "object":
+            return cls(kind, values)
+        if any(value is None for value in values):
+            valid = bytearray(value is not None for value in values)
+            typed = array(_TYPECODES[kind], [0 if value is None else value for value in values])
+            return cls(kind, typed, valid)
+        return cls(kind, array(_TYPECODES[kind], values))
+
+    @classmethod
+    def concat(cls, parts: list["Column"]) -> "Column":
+        kinds = {part.kind for part in parts}
+        if len(kinds) != 1 or "object" in kinds:
+            return cls.from_values([value for part in parts for value in part.to_pylist()])
+        values = array(parts[0].values.typecode)
+        for part in parts:
+            values.extend(part.values)
+        valid = None
+        if any(part.valid is not None for part in parts):
+            valid = bytearray()
+            for part in parts:
+                valid += part.valid if part.valid is not None else b"\x01" * len(part)
+        return cls(parts[0].kind, values, valid)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, row: int) -> Any:
+        if self.valid is not None and not self.valid[row]:
+            return None
+        value = self.values[row]
+        return bool(value) if self.kind == "bool" else value
+
+    def null_count(self) -> int:
+        if self.kind == "object":
+            return sum(value is None for value in self.values)
+        return 0 if self.valid is None else len(self.valid) - sum(self.valid)
+
+    def to_pylist(self) -> list[Any]:
+        values = self.values.tolist() if isinstance(self.values, array) else list(self.values)
+        if self.kind == "bool":
+            values = [bool(value) for value in values]
+        if self.valid is not None:
+            values = [value if ok else None for value, ok in zip(values, self.valid)]
+        return values
+
+    def set_null(self, row: int) -> None:
+        if self.kind == "object":
+            self.values[row] = None
+            return
+        if self.valid is None:
+            self.valid = bytearray(b"\x01") * len(self.values)
+        self.valid[row] = 0
+        self.values[row] = 0
+
+    def take(self, indices: list[int]) -> "Column":
+        values = self.values
+        taken = array(values.typecode, [values[idx] for idx in indices]) if isinstance(values, array) else [
+            values[idx] for idx in indices
+        ]
+        valid = None if self.valid is None else bytearray(self.valid[idx] for idx in indices)
+        return Column(self.kind, taken, valid)
+
+    def to_arrow(self, arrow_type: Any = None) -> Any:
+        """pyarrow array, of ``arrow_type`` if given (otherwise inferred).
+
+        ``int``/``float`` value buffers are shared with the array, not copied, when the
+        type is ``int64``/``float64``.
+        """
+
+        import pyarrow as pa
+
+        native = {"int": pa.int64(), "float": pa.float64()}.get(self.kind)
+        if native is None or (arrow_type is not None and arrow_type != native):
+            return pa.array(self.to_pylist(), type=arrow_type)
+        arrow_type = native
+        if self.valid is None:
+            return pa.Array.from_buffers(arrow_type, len(self.values), [None, pa.py_buffer(self.values)])
+        bitmap = pa.array(_bools(self.valid), type=pa.bool_()).buffers()[1]
+        return pa.Array.from_buffers(
+            arrow_type, len(self.values), [bitmap, pa.py_buffer(self.values)], null_count=self.null_count()
+        )
+
+
+def _bools(mask: bytearray) -> Any:
+    try:
+        import numpy as np
+    except ImportError:
+        return [bool(value) for value in mask]
+    return np.frombuffer(mask, dtype=np.bool_)
+
+
+class ColumnBatch:
+    """Rows of one table stored column by column.
+
+    Replaces ``list[dict]`` between generation and writing: a row costs one slot per
+    column instead of a dict, and numeric columns are packed (see ``Column``). Adapters
+    feed pyarrow (``to_arrow``), ``csv`` (``write_csv``) and sqlite ``executemany``
+    (``iter_tuples``); ``iter_rows`` yields dicts one at a time for row-wise code.
+    """
+
+    def __init__(self, columns: dict[str, Column] | None = None, length: int = 0) -> None:
+        self.columns: dict[str, Column] = dict(columns or {})
+        self.length = len(next(iter(self.columns.values()))) if self.columns else length
+
+    @classmethod
+    def from_columns(cls, columns: dict[str, list[Any]], length: int | None = None) -> "ColumnBatch":
+        return cls({name: Column.from_values(values) for name, values in columns.items()}, length or 0)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[dict[str, Any]], names: list[str] | None = None) -> "ColumnBatch":
+        rows = list(rows)
+        if names is None:
+            names = list(dict.fromkeys(name for row in rows for name in row))
+        return cls.from_columns({name: [row.get(name) for row in rows] for name in names}, len(rows))
+
+    @classmethod
+    def concat(cls, batches: Iterable["ColumnBatch"]) -> "ColumnBatch":
+        """Stack batches with the same columns into one batch."""
+
+        batches = list(batches)
+        if not batches:
+            return cls()
+        if len(batches) == 1:
+            return batches[0]
+        columns = {name: Column.concat([batch.columns[name] for batch in batches]) for name in batches[0].names}
+        return cls(columns, sum(len(batch) for batch in batches))
+
+    @property
+    def names(self) -> list[str]:
+        return list(self.columns)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def column(self, name: str) -> list[Any]:
+        return self.columns[name].to_pylist()
+
+    def set_column(self, name: str, values: list[Any]) -> None:
+        """Replace column ``name`` in place, or append it after the existing columns."""
+
+        if len(values) != self.length:
+            raise ValueError(f"Column {name!r} has {len(values)} values, expected {self.length}")
+        self.columns[name] = Column.from_values(values)
+
+    def set_null(self, name: str, row: int) -> None:
+        self.columns[name].set_null(row)
+
+    def take(self, indices: list[int]) -> "ColumnBatch":
+        return ColumnBatch({name: column.take(indices) for name, column in self.columns.items()}, len(indices))
+
+    def iter_tuples(self, names: list[str] | None = None) -> Iterator[tuple[Any, ...]]:
+        """Row tuples in ``names`` order (default: column order), e.g. for ``executemany``."""
+
+        selected = [self.columns[name].to_pylist() for name in (names or self.names)]
+        return zip(*selected) if selected else iter([()] * self.length)
+
+    def iter_rows(self) -> Iterator[dict[str, Any]]:
+        names = self.names
+        for values in self.iter_tuples(names):
+            yield dict(zip(names, values))
+
+    def to_rows(self) -> list[dict[str, Any]]:
+        return list(self.iter_rows())
+
+    def to_arrow(self, schema: Any = None) -> Any:
+        """pyarrow ``Table``; with ``schema``, columns follow it and missing ones are null."""
+
+        import pyarrow as pa
+
+        if schema is None:
+            return pa.table({name: column.to_arrow() for name, column in self.columns.items()})
+        arrays = [
+            self.columns[field.name].to_arrow(field.type) if field.name in self.columns else pa.nulls(self.length, field.type)
+            for field in schema
+        ]
+        return pa.Table.from_arrays(arrays, schema=schema)
+
+    def write_csv(self, handle: Any, names: list[str] | None = None, header: bool = True) -> int:
+        """Write the batch to an open text ``handle`` as CSV; nulls become empty fields."""
+
+        names = names or self.names
+        writer = csv.writer(handle)
+        if header:
+            writer.writerow(names)
+        present = [name for name in names if name in self.columns]
+        if present == names:
+            writer.writerows(self.iter_tuples(names))
+        else:
+            lookup = {name: self.columns[name].to_pylist() for name in present}
+            empty = [None] * self.length
+            writer.writerows(zip(*(lookup.get(name, empty) for name in names)))
+        return self.length
+
+
+def as_batch(table: ColumnBatch | Iterable[dict[str, Any]]) -> ColumnBatch:
+    return table if isinstance(table, ColumnBatch) else ColumnBatch.from_rows(table)
+
+
+def iter_rows(table: ColumnBatch | Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+    return table.iter_rows() if isinstance(table, ColumnBatch) else iter(table)
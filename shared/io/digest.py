@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
+
+MANIFEST_FILENAME = "manifest.json"
+DIGEST_ALGORITHM = "blake2b"
+DIGEST_SIZE = 16
+DEFAULT_DIGEST_CHUNK_ROWS = 10_000
+
+
+def _stdlib_canonical(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def canonical_encoder() -> Callable[[Any], bytes]:
+    """Compact UTF-8 JSON with sorted keys: the byte form rows are digested in.
+
+    Key order and file formatting do not change a row's encoding. It is always the
+    stdlib ``json`` form, never ``orjson`` (which spells float exponents differently and
+    writes NaN as ``null``), so a digest depends only on the data and not on which
+    optional packages are installed.
+    """
+
+    return _stdlib_canonical
+
+
+def _hasher() -> Any:
+    return hashlib.blake2b(digest_size=DIGEST_SIZE)
+
+
+class TableDigest:
+    """Running ``blake2b`` digests of a table's rows, per chunk of ``chunk_rows`` and overall.
+
+    Rows are digested in their ``canonical_encoder`` form. The table digest covers the
+    chunk digests in order, so two tables with equal digests hold the same rows in the
+    same order, and a mismatch can be located to a chunk without re-reading the rest.
+    """
+
+    def __init__(self, chunk_rows: int = DEFAULT_DIGEST_CHUNK_ROWS) -> None:
+        if chunk_rows < 1:
+            raise ValueError("chunk_rows must be >= 1")
+        self.chunk_rows = chunk_rows
+        self.rows = 0
+        self.chunks: list[str] = []
+        self._encode = canonical_encoder()
+        self._chunk = _hasher()
+
+    def add(self, row: Any) -> None:
+        self._chunk.update(self._encode(row))
+        self._chunk.update(b"\n")
+        self.rows += 1
+        if self.rows % self.chunk_rows == 0:
+            self.chunks.append(self._chunk.hexdigest())
+            self._chunk = _hasher()
+
+    def tap(self, rows: Iterable[Any]) -> Iterator[Any]:
+        """Yield ``rows`` unchanged, digesting each on the way (e.g. into a writer)."""
+
+        for row in rows:
+            self.add(row)
+            yield row
+
+    def to_dict(self) -> dict[str, Any]:
+        chunks = list(self.chunks)
+        if self.rows % self.chunk_rows:
+            chunks.append(self._chunk.hexdigest())
+        table = _hasher()
+        for chunk in chunks:
+            table.update(bytes.fromhex(chunk))
+        return {"rows": self.rows, "chunk_rows": self.chunk_rows, "digest": table.hexdigest(), "chunks": chunks}
+
+
+def compare_digests(table_name: str, expected: dict[str, Any], actual: TableDigest) -> list[str]:
+    """Differences between a manifest entry and the digest of the rows read back."""
+
+    found = actual.to_dict()
+    if found["digest"] == expected.get("digest") and found["rows"] == expected.get("rows"):
+        return []
+    if found["rows"] != expected.get("rows"):
+        return [f"{table_name} has {found['rows']} rows, manifest records {expected.get('rows')}"]
+    mismatched = next(
+        (idx for idx, (want, got) in enumerate(zip(expected.get("chunks", []), found["chunks"])) if want != got),
+        None,
+    )
+    if mismatched is None:
+        return [f"{table_name} digest does not match the manifest"]
+    first = mismatched * found["chunk_rows"] + 1
+    last = min(first + found["chunk_rows"] - 1, found["rows"])
+    return [f"{table_name} differs from the manifest in rows {first}-{last}"]
+
+
+def fingerprint(value: Any) -> str:
+    """Digest of a JSON-like value, e.g. a schema, for recording in a manifest."""
+
+    encoded = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=DIGEST_SIZE).hexdigest()
+
+
+def write_manifest(
+    out_dir: str | Path, *, generator: str, params: dict[str, Any], tables: dict[str, TableDigest]
+) -> Path:
+    """Write ``manifest.json`` with the generation ``params`` and each table's digests."""
+
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    manifest = {
+        "generator": generator,
+        "algorithm": f"{DIGEST_ALGORITHM}-{DIGEST_SIZE * 8}",
+        "params": params,
+        "tables": {name: digest.to_dict() for name, digest in tables.items()},
+    }
+    path = out / MANIFEST_FILENAME
+    path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return path
+
+
+def read_manifest(out_dir: str | Path) -> dict[str, Any] | None:
+    """The manifest written into ``out_dir``, or ``None`` when there is none."""
+
+    path = Path(out_dir) / MANIFEST_FILENAME
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
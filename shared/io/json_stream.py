@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import gzip
+import io
+import json
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Iterable, Iterator
+
+try:
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - exercised when orjson is not installed
+    _orjson = None
+
+JSON_MODES = ("ndjson", "json")
+COMPRESSIONS = ("gzip", "zstd")
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+DEFAULT_BUFFER_SIZE = 1 << 20
+
+
+def _stdlib_dumps(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def json_encoder() -> Callable[[Any], bytes]:
+    """Compact UTF-8 encoder: ``orjson.dumps`` when installed, otherwise stdlib ``json``.
+
+    Both write compact JSON with non-ASCII text as UTF-8; they only differ in how float
+    exponents are spelled (``1e-7`` vs ``1e-07``). Values orjson rejects, such as integers
+    beyond 64 bits, fall back to the stdlib encoder.
+    """
+
+    if _orjson is None:
+        return _stdlib_dumps
+    dumps = _orjson.dumps
+
+    def encode(value: Any) -> bytes:
+        try:
+            return dumps(value)
+        except TypeError:
+            return _stdlib_dumps(value)
+
+    return encode
+
+
+def _require_zstandard() -> Any:
+    try:
+        import zstandard
+    except ImportError as exc:
+        raise RuntimeError(
+            "Optional dependency 'zstandard' is required for zstd output. Install with: pip install zstandard"
+        ) from exc
+    return zstandard
+
+
+def compressed_path(path: str | Path, compression: str | None) -> Path:
+    """``path`` with the suffix of ``compression`` appended (``.gz``/``.zst``)."""
+
+    path = Path(path)
+    return path.with_name(path.name + COMPRESSION_SUFFIXES[compression]) if compression else path
+
+
+class _ClosingGzipFile(gzip.GzipFile):
+    """Reproducible gzip writer that also closes the file object it writes into.
+
+    ``GzipFile`` leaves a passed ``fileobj`` open, which would leave the compressed
+    trailer to be flushed (or lost) whenever the handle is garbage collected.
+    """
+
+    def __init__(self, raw: BinaryIO, level: int) -> None:
+        super().__init__(filename="", mode="wb", compresslevel=level, fileobj=raw, mtime=0)
+        self._raw = raw
+
+    def close(self) -> None:
+        try:
+            super().close()
+        finally:
+            self._raw.close()
+
+
+def open_binary(path: str | Path, mode: str, compression: str | None = None, level: int | None = None) -> BinaryIO:
+    """Open ``path`` for binary ``"rb"``/``"wb"``, compressing or decompressing on the fly.
+
+    gzip output carries no file name or timestamp, so the same rows always give the same
+    bytes. When reading, ``compression`` defaults to the one named by the file suffix.
+    """
+
+    path = Path(path)
+    if compression is None and mode == "rb":
+        compression = next((name for name, suffix in COMPRESSION_SUFFIXES.items() if path.suffix == suffix), None)
+    if compression is not None and compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression {compression!r}; expected one of {', '.join(COMPRESSIONS)}")
+    if compression == "zstd":
+        zstandard = _require_zstandard()
+        raw = path.open(mode)
+        if mode == "rb":
+            return zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        return zstandard.ZstdCompressor(level=3 if level is None else level).stream_writer(raw, closefd=True)
+    if compression == "gzip":
+        if mode == "rb":
+            return gzip.open(path, "rb")
+        level = 9 if level is None else level
+        return _ClosingGzipFile(path.open("wb"), level)
+    return path.open(mode)
+
+
+class JsonRowWriter:
+    """Write rows one at a time as NDJSON or as a JSON array, without holding them.
+
+    Encoded rows are collected into chunks of about ``buffer_size`` bytes before each
+    write. A JSON array is written one compact element per line between ``[`` and ``]``.
+    Use as a context manager, or call ``close`` to finish the file.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        mode: str = "ndjson",
+        compression: str | None = None,
+        compression_level: int | None = None,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+    ) -> None:
+        if mode not in JSON_MODES:
+            raise ValueError(f"Unknown JSON mode {mode!r}; expected one of {', '.join(JSON_MODES)}")
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.mode = mode
+        self.buffer_size = buffer_size
+        self.rows = 0
+        self._encode = json_encoder()
+        self._handle = open_binary(self.path, "wb", compression, compression_level)
+        self._chunk: list[bytes] = []
+        self._buffered = 0
+        if mode == "json":
+            self._push(b"[")
+
+    def _push(self, data: bytes) -> None:
+        self._chunk.append(data)
+        self._buffered += len(data)
+        if self._buffered >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._chunk:
+            self._handle.write(b"".join(self._chunk))
+            self._chunk, self._buffered = [], 0
+
+    def write(self, row: Any) -> None:
+        if self.mode == "ndjson":
+            self._push(self._encode(row) + b"\n")
+        else:
+            self._push((b"\n" if not self.rows else b",\n") + self._encode(row))
+        self.rows += 1
+
+    def write_rows(self, rows: Iterable[Any]) -> int:
+        start = self.rows
+        for row in rows:
+            self.write(row)
+        return self.rows - start
+
+    def close(self) -> None:
+        if self._handle.closed:
+            return
+        try:
+            if self.mode == "json":
+                self._push(b"\n]\n" if self.rows else b"]\n")
+            self.flush()
+        finally:
+            self._handle.close()
+
+    def __enter__(self) -> "JsonRowWriter":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def write_json_rows(
+    path: str | Path,
+    rows: Iterable[Any],
+    mode: str = "ndjson",
+    *,
+    compression: str | None = None,
+    compression_level: int | None = None,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+) -> int:
+    """Stream ``rows`` into ``path`` with ``JsonRowWriter``; returns the number written."""
+
+    with JsonRowWriter(path, mode, compression, compression_level, buffer_size) as writer:
+        return writer.write_rows(rows)
+
+
+def read_json_rows(path: str | Path, mode: str = "ndjson") -> Iterator[Any]:
+    """Rows of a file written by ``JsonRowWriter`` (compression taken from the suffix).
+
+    NDJSON is parsed line by line, and so is a JSON array in the one-element-per-line
+    layout ``JsonRowWriter`` writes; any other JSON array is parsed whole. Raises
+    ``json.JSONDecodeError`` on malformed input.
+    """
+
+    with open_binary(path, "rb") as raw:
+        lines = io.TextIOWrapper(raw, encoding="utf-8")
+        if mode == "json":
+            rows = _iter_array_lines(lines)
+            if rows is not None:
+                yield from rows
+                return
+        else:
+            for line in lines:
+                if line.strip():
+                    yield json.loads(line)
+            return
+    with open_binary(path, "rb") as raw:
+        parsed = json.load(raw)
+    if not isinstance(parsed, list):
+        raise json.JSONDecodeError("Expected a JSON array", "", 0)
+    yield from parsed
+
+
+def _iter_array_lines(lines: Iterator[str]) -> Iterator[Any] | None:
+    """Elements of a ``[``/one element per line/``]`` array, or ``None`` for another layout."""
+
+    first = next(lines, "").strip()
+    if first in {"[]", "[ ]"}:
+        return iter(())
+    if first != "[":
+        return None
+    line = next(lines, "").strip()
+    if line == "]":
+        return iter(())
+    try:
+        head = json.loads(line.removesuffix(","))
+    except json.JSONDecodeError:
+        return None
+    return _array_tail(head, line.endswith(","), lines)
+
+
+def _array_tail(head: Any, more: bool, lines: Iterator[str]) -> Iterator[Any]:
+    yield head
+    for number, line in enumerate(lines, start=3):
+        line = line.strip()
+        if not line:
+            continue
+        if line == "]" and not more:
+            if any(rest.strip() for rest in lines):
+                raise json.JSONDecodeError("Extra data after the JSON array", "", 0)
+            return
+        if not more:
+            raise json.JSONDecodeError(f"Expected ',' or ']' before line {number}", "", 0)
+        more = line.endswith(",")
+        yield json.loads(line.removesuffix(","))
+    raise json.JSONDecodeError("Unterminated JSON array", "", 0)
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import csv
+from pathlib import Path
+from typing import Any, Callable, Iterator
+from urllib.parse import unquote
+
+from shared.io.columnar import ColumnBatch
+from shared.io.json_stream import read_json_rows
+
+DEFAULT_READ_BATCH_SIZE = 50_000
+_TRUE = {"true", "1", "yes"}
+_FALSE = {"false", "0", "no"}
+
+
+def _number(text: str) -> Any:
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+def text_converter(column: dict[str, Any]) -> Callable[[str], Any]:
+    """Parse the text form of a ``column`` value (CSV cells, partition directories).
+
+    Empty text is ``None``. Values that do not parse as the column type are kept as
+    text, so type checks report them instead of the read failing.
+    """
+
+    ctype = column.get("type")
+
+    def convert(text: str) -> Any:
+        if text == "":
+            return None
+        if ctype in {"id", "integer", "float", None}:
+            return _number(text)
+        if ctype == "boolean":
+            lowered = text.lower()
+            return True if lowered in _TRUE else False if lowered in _FALSE else text
+        if ctype == "categorical":
+            return categories.get(text, text)
+        return text
+
+    categories = {str(value): value for value in column.get("categories", [])}
+    return convert
+
+
+def iter_csv_batches(
+    path: str | Path,
+    columns: list[dict[str, Any]] | None = None,
+    batch_size: int = DEFAULT_READ_BATCH_SIZE,
+) -> Iterator[ColumnBatch]:
+    """Read a CSV file ``batch_size`` rows at a time, parsing cells by ``columns`` specs."""
+
+    converters = {col["name"]: text_converter(col) for col in columns or []}
+    with Path(path).open(newline="", encoding="utf-8") as handle:
+        reader = csv.reader(handle)
+        header = next(reader, None)
+        if header is None:
+            return
+        parse = [converters.get(name) or text_converter({"name": name}) for name in header]
+        chunk: list[list[str]] = []
+        for record in reader:
+            chunk.append(record)
+            if len(chunk) >= batch_size:
+                yield _csv_batch(header, parse, chunk)
+                chunk = []
+        if chunk:
+            yield _csv_batch(header, parse, chunk)
+
+
+def _csv_batch(header: list[str], parse: list[Callable[[str], Any]], records: list[list[str]]) -> ColumnBatch:
+    width = len(header)
+    padded = [record + [""] * (width - len(record)) if len(record) < width else record for record in records]
+    cells = zip(*padded) if padded else [()] * width
+    return ColumnBatch.from_columns(
+        {name: [convert(text) for text in values] for name, convert, values in zip(header, parse, cells)},
+        len(records),
+    )
+
+
+def parquet_files(path: str | Path) -> list[tuple[Path, dict[str, str]]]:
+    """``(file, partition values)`` of a Parquet file or of a directory-partitioned dataset.
+
+    Partition values come from the directory names below ``path`` (URL-quoted, as
+    written by ``PartitionedParquetWriter``) in ``partition_by`` order.
+    """
+
+    path = Path(path)
+    if path.is_file():
+        return [(path, {})]
+    files = []
+    for file in sorted(path.rglob("*.parquet")):
+        parts = [unquote(part) for part in file.relative_to(path).parts[:-1]]
+        files.append((file, {str(idx): value for idx, value in enumerate(parts)}))
+    return files
+
+
+def iter_parquet_batches(
+    path: str | Path,
+    partition_columns: list[dict[str, Any]] | None = None,
+    batch_size: int = DEFAULT_READ_BATCH_SIZE,
+) -> Iterator[ColumnBatch]:
+    """Read a Parquet file, or a partitioned directory, record batch by record batch.
+
+    ``partition_columns`` are the specs of the partition columns in directory order;
+    their values are parsed from the directory names and added to every batch.
+    """
+
+    import pyarrow.parquet as pq
+
+    partition_columns = partition_columns or []
+    converters = [text_converter(col) for col in partition_columns]
+    for file, parts in parquet_files(path):
+        values = {
+            col["name"]: convert(parts.get(str(idx), ""))
+            for idx, (col, convert) in enumerate(zip(partition_columns, converters))
+        }
+        for record_batch in pq.ParquetFile(file).iter_batches(batch_size=batch_size):
+            batch = ColumnBatch.from_columns(
+                {name: column.to_pylist() for name, column in zip(record_batch.schema.names, record_batch.columns)},
+                record_batch.num_rows,
+            )
+            for name, value in values.items():
+                batch.set_column(name, [value] * len(batch))
+            yield batch
+
+
+def iter_json_batches(
+    path: str | Path, mode: str = "ndjson", batch_size: int = DEFAULT_READ_BATCH_SIZE
+) -> Iterator[ColumnBatch]:
+    """Read an NDJSON file or JSON array (see ``read_json_rows``) ``batch_size`` rows at a time."""
+
+    chunk: list[dict[str, Any]] = []
+    for row in read_json_rows(path, mode):
+        chunk.append(row)
+        if len(chunk) >= batch_size:
+            yield ColumnBatch.from_rows(chunk)
+            chunk = []
+    if chunk:
+        yield ColumnBatch.from_rows(chunk)
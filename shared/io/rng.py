@@ -2,9 +2,235 @@ from __future__ import annotations
 
 import hashlib
 import random
+from typing import Any, Callable, Iterator
+
+RNG_BLOCK_ROWS = 4096
+_MASK64 = (1 << 64) - 1
+_GAMMA = 0x9E3779B97F4A7C15
+_MIX1 = 0xBF58476D1CE4E5B9
+_MIX2 = 0x94D049BB133111EB
+_TO_UNIT = 1.0 / (1 << 53)
+
+
+def derive_seed(seed: int, *parts: object) -> int:
+    key = "::".join([str(seed), *(str(part) for part in parts)]).encode("utf-8")
+    return int(hashlib.sha256(key).hexdigest()[:16], 16)
 
 
 def derive_rng(seed: int, *parts: str) -> random.Random:
-    key = "::".join([str(seed), *parts]).encode("utf-8")
-    digest = hashlib.sha256(key).hexdigest()[:16]
-    return random.Random(int(digest, 16))
+    return random.Random(derive_seed(seed, *parts))
+
+
+def block_rng(seed: int, *parts: object, block: int) -> random.Random:
+    """RNG for one fixed-size block of the stream named by ``parts``.
+
+    Blocks are seeded independently, so any block can be produced without replaying
+    the ones before it (the basis for row-range sharding).
+    """
+
+    return random.Random(derive_seed(seed, *parts, "block", block))
+
+
+class BlockStream:
+    """Row-indexed stream that draws from one ``block_rng`` per ``block_rows`` rows.
+
+    Rows inside a block share a sequential ``random.Random``, so draws run at its
+    speed, while reaching any row replays at most ``block_rows - 1`` earlier rows of
+    its block instead of the whole stream. The stream remembers where it stopped:
+    a range that starts there continues without replaying anything.
+    """
+
+    def __init__(self, seed: int, *parts: object, block_rows: int = RNG_BLOCK_ROWS) -> None:
+        if block_rows < 1:
+            raise ValueError("block_rows must be >= 1")
+        self.seed = seed
+        self.parts = parts
+        self.block_rows = block_rows
+        self._rng: random.Random | None = None
+        self._next_row = -1
+
+    def spans(
+        self, start: int, stop: int, replay: Callable[[random.Random, int], Any]
+    ) -> Iterator[tuple[random.Random, range]]:
+        """``(rng, rows)`` per block covering rows ``[start, stop)``, in order.
+
+        ``rng`` is positioned at ``rows[0]``; the caller must make the same draws for
+        each row that ``replay(rng, row)`` makes, which is how skipped rows are replayed.
+        """
+
+        size = self.block_rows
+        row = start
+        while row < stop:
+            block, offset = divmod(row, size)
+            if row != self._next_row or offset == 0 or self._rng is None:
+                self._rng = block_rng(self.seed, *self.parts, block=block)
+                for skipped in range(row - offset, row):
+                    replay(self._rng, skipped)
+            end = min((block + 1) * size, stop)
+            self._next_row = end
+            yield self._rng, range(row, end)
+            row = end
+
+
+def _mix64(z: int) -> int:
+    z = ((z ^ (z >> 30)) * _MIX1) & _MASK64
+    z = ((z ^ (z >> 27)) * _MIX2) & _MASK64
+    return z ^ (z >> 31)
+
+
+def _row_state(key: int, row: int) -> int:
+    return _mix64((key + row * _GAMMA) & _MASK64)
+
+
+def counter_bits(key: int, row: int, draw: int = 0) -> int:
+    """64 random bits for draw number ``draw`` of ``row`` in the stream ``key``."""
+
+    return _mix64((_row_state(key, row) + (draw + 1) * _GAMMA) & _MASK64)
+
+
+class CounterRNG(random.Random):
+    """``random.Random`` whose draws are a pure function of (key, row, draw number).
+
+    The key is derived like ``derive_rng`` from ``(seed, *parts)``, typically
+    ``(seed, table, column)``. ``at(row)`` positions the generator at the first draw of
+    ``row``; the n-th draw after that is SplitMix64 output ``n`` of a state mixed from
+    the key and the row index, so any row can be reproduced in O(1) without replaying
+    earlier rows. All ``random.Random`` methods work on top of it (``randint``,
+    ``gauss``, ``choices``, ``getrandbits`` ...). ``random_array``/``bits_array`` give
+    the same draws for many rows at once with NumPy.
+    """
+
+    def __init__(self, seed: int, *parts: object) -> None:
+        self.key = derive_seed(seed, *parts)
+        self.row = 0
+        self._state = _row_state(self.key, 0)
+        self._draw = 0
+        super().__init__(0)
+
+    def seed(self, a: Any = None, version: int = 2) -> None:
+        """Reposition at the first draw of row ``a`` (``random.Random`` compatible)."""
+
+        self.at(int(a or 0))
+
+    def at(self, row: int) -> "CounterRNG":
+        self.row = row
+        self._state = _row_state(self.key, row)
+        self._draw = 0
+        self.gauss_next = None
+        return self
+
+    def getstate(self) -> tuple[int, int, int, float | None]:
+        return self.key, self.row, self._draw, self.gauss_next
+
+    def setstate(self, state: tuple[int, int, int, float | None]) -> None:
+        self.key, row, draw, gauss_next = state
+        self.at(row)
+        self._draw = draw
+        self.gauss_next = gauss_next
+
+    def _next64(self) -> int:
+        self._draw = draw = self._draw + 1
+        z = (self._state + draw * _GAMMA) & _MASK64
+        z = ((z ^ (z >> 30)) * _MIX1) & _MASK64
+        z = ((z ^ (z >> 27)) * _MIX2) & _MASK64
+        return z ^ (z >> 31)
+
+    def random(self) -> float:
+        return (self._next64() >> 11) * _TO_UNIT
+
+    def getrandbits(self, k: int) -> int:
+        if 0 <= k <= 64:
+            return self._next64() >> (64 - k)
+        if k < 0:
+            raise ValueError("number of bits must be non-negative")
+        value, filled = 0, 0
+        while filled < k:
+            value |= self._next64() << filled
+            filled += 64
+        return value & ((1 << k) - 1)
+
+    def bits_array(self, rows: Any, draw: int = 0) -> Any:
+        """uint64 array with draw number ``draw`` of every row in ``rows`` (NumPy)."""
+
+        import numpy as np
+
+        rows = np.asarray(rows, dtype=np.uint64)
+        with np.errstate(over="ignore"):
+            state = _mix64_array(np, np.uint64(self.key) + rows * np.uint64(_GAMMA))
+            return _mix64_array(np, state + np.uint64(((draw + 1) * _GAMMA) & _MASK64))
+
+    def random_array(self, rows: Any, draw: int = 0) -> Any:
+        """Floats in ``[0, 1)``: the ``random()`` value of draw number ``draw`` of every row."""
+
+        import numpy as np
+
+        return (self.bits_array(rows, draw) >> np.uint64(11)).astype(np.float64) * _TO_UNIT
+
+
+def _mix64_array(np: Any, z: Any) -> Any:
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(_MIX1)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(_MIX2)
+    return z ^ (z >> np.uint64(31))
+
+
+class IndexPermutation:
+    """Keyed bijection of ``range(size)``, evaluated in O(1) per index.
+
+    A four-round Feistel network over the smallest even-bit power of two covering
+    ``size``, with cycle walking back into range. Mapping row indices through it yields
+    distinct values in random order without storing the values already used.
+    """
+
+    ROUNDS = 4
+
+    def __init__(self, size: int, seed: int, *parts: object) -> None:
+        if size < 1:
+            raise ValueError("permutation size must be >= 1")
+        self.size = size
+        bits = max(2, (size - 1).bit_length())
+        self.half = (bits + 1) // 2
+        self.mask = (1 << self.half) - 1
+        self.keys = [derive_seed(seed, *parts, "feistel", idx) for idx in range(self.ROUNDS)]
+
+    def _encrypt(self, value: int) -> int:
+        half, mask = self.half, self.mask
+        left, right = value >> half, value & mask
+        for key in self.keys:
+            left, right = right, left ^ (_mix64(right ^ key) & mask)
+        return (left << half) | right
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: int) -> int:
+        if not 0 <= index < self.size:
+            raise IndexError("permutation index out of range")
+        value = self._encrypt(index)
+        while value >= self.size:
+            value = self._encrypt(value)
+        return value
+
+    def array(self, indices: Any) -> Any:
+        """Vectorized ``__getitem__`` for an array of indices (NumPy)."""
+
+        import numpy as np
+
+        half, mask = np.uint64(self.half), np.uint64(self.mask)
+        keys = [np.uint64(key) for key in self.keys]
+
+        def encrypt(values: Any) -> Any:
+            left, right = values >> half, values & mask
+            for key in keys:
+                left, right = right, left ^ (_mix64_array(np, right ^ key) & mask)
+            return (left << half) | right
+
+        values = np.asarray(indices, dtype=np.uint64)
+        if values.size and int(values.max()) >= self.size:
+            raise IndexError("permutation index out of range")
+        with np.errstate(over="ignore"):
+            values = encrypt(values)
+            outside = values >= np.uint64(self.size)
+            while outside.any():
+                values[outside] = encrypt(values[outside])
+                outside = values >= np.uint64(self.size)
+        return values.astype(np.int64)
@@ -17,3 +17,9 @@ def apply_foreign_keys(rows: list[dict], rel: dict, parent_rows: list[dict], rng
     keys = [r[rel["parent_key"]] for r in parent_rows]
     for row in rows:
         row[rel["child_key"]] = rng.choice(keys)
+
+
+def foreign_key_values(parent_keys: list, count: int, rng: random.Random) -> list:
+    """Child key column of ``count`` rows; same draws as ``apply_foreign_keys``."""
+
+    return [rng.choice(parent_keys) for _ in range(count)]
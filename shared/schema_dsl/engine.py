@@ -1,37 +1,338 @@
 from __future__ import annotations
 
-from typing import Any
+import random
+from typing import Any, Callable, Collection, Iterator, Sequence
 
 from shared.constraints.rules import validate_column_value
-from shared.corruption.profiles import apply_profile
+from shared.constraints.unique import UniqueTracker
+from shared.corruption.profiles import PROFILE_DEFAULTS, profile_duplicates, profile_missing, skip_profile_missing
 from shared.distributions.generators import generate_value
-from shared.io.rng import derive_rng
-from shared.relationships.fk import apply_foreign_keys, generation_order
+from shared.io.columnar import Column, ColumnBatch
+from shared.io.rng import BlockStream, CounterRNG, IndexPermutation, derive_rng
+from shared.relationships.fk import foreign_key_values, generation_order
 
+MAX_ATTEMPTS = 10
+DEFAULT_BATCH_SIZE = 50_000
+UNIQUE_BY_INDEX = frozenset({"id", "string"})
+
+
+def unique_sources(
+    table_name: str,
+    spec: dict[str, Any],
+    seed: int,
+    row_count: int | None = None,
+) -> dict[str, Callable[[int], Any]]:
+    """Constructive value sources for ``unique`` integer columns.
+
+    Row ``idx`` takes value ``min + permutation[idx]`` of a keyed permutation of
+    ``[min, max]``, so values are distinct without remembering the ones already used.
+    Raises ``ValueError`` when ``row_count`` rows cannot fit in the range.
+    """
+
+    sources: dict[str, Callable[[int], Any]] = {}
+    for col in spec.get("columns", []):
+        if col.get("type") == "integer" and col.get("constraints", {}).get("unique"):
+            low, high = int(col.get("min", 0)), int(col.get("max", 100))
+            if row_count is not None and row_count > high - low + 1:
+                raise ValueError(
+                    f"Cannot draw {row_count} unique values for {table_name}.{col['name']} from [{low}, {high}]"
+                )
+            permutation = IndexPermutation(max(high - low + 1, 1), seed, table_name, col["name"], "unique")
+            sources[col["name"]] = lambda idx, low=low, permutation=permutation: low + permutation[idx]
+    return sources
+
+
+def unique_trackers(spec: dict[str, Any], row_count: int) -> dict[str, UniqueTracker]:
+    """Bounded-memory trackers for ``unique`` columns that are not unique by construction."""
+
+    return {
+        c["name"]: UniqueTracker(row_count)
+        for c in spec.get("columns", [])
+        if c.get("constraints", {}).get("unique")
+        and c.get("type", "string") not in UNIQUE_BY_INDEX
+        and c.get("type") != "integer"
+    }
+
+
+def generate_columns(
+    table_name: str,
+    spec: dict[str, Any],
+    seed: int,
+    start: int,
+    stop: int,
+    unique_sets: dict[str, Any] | None = None,
+    names: Collection[str] | None = None,
+    streams: dict[str, BlockStream] | None = None,
+) -> ColumnBatch:
+    """Base column values of rows ``[start, stop)`` before foreign keys and profiles.
+
+    Each column draws from a ``BlockStream`` keyed by (seed, table, column), one value
+    per row, so any row or range can be regenerated by replaying at most one RNG block,
+    and columns are built one at a time without materializing rows (only ``names`` if
+    given). Pass the same ``streams`` for consecutive ranges to continue the streams
+    without replaying. ``id``/``string`` and ``unique`` integer columns are unique by
+    construction; other ``unique`` columns are only checked against ``unique_sets`` (the
+    rows generated so far with it), and retries draw from a per-row ``CounterRNG`` so
+    they do not shift the rows after them.
+    """
+
+    sources = unique_sources(table_name, spec, seed)
+    unique_sets = {} if unique_sets is None else unique_sets
+    streams = {} if streams is None else streams
+    columns: dict[str, list[Any]] = {}
+    for col in spec.get("columns", []):
+        name = col["name"]
+        if names is not None and name not in names:
+            continue
+        source = sources.get(name)
+        if source is not None:
+            columns[name] = [source(idx) for idx in range(start, stop)]
+            for idx, val in enumerate(columns[name], start):
+                if not validate_column_value(val, col):
+                    raise ValueError(f"Could not satisfy constraints for {table_name}.{name} at row {idx}")
+            continue
+        if name not in streams:
+            streams[name] = BlockStream(seed, table_name, name)
+        seen = unique_sets.get(name)
+        values: list[Any] = []
+        retries: CounterRNG | None = None
+
+        def replay(rng: random.Random, idx: int, col: dict[str, Any] = col) -> None:
+            generate_value(col, idx, rng)
+
+        for rng, rows in streams[name].spans(start, stop, replay):
+            for idx in rows:
+                val = generate_value(col, idx, rng)
+                attempts = 1
+                while not validate_column_value(val, col, seen):
+                    if attempts == MAX_ATTEMPTS:
+                        raise ValueError(f"Could not satisfy constraints for {table_name}.{name} at row {idx}")
+                    if retries is None:
+                        retries = CounterRNG(seed, table_name, name, "retry")
+                    if attempts == 1:
+                        retries.at(idx)
+                    val = generate_value(col, idx, retries)
+                    attempts += 1
+                if seen is not None:
+                    seen.add(val)
+                values.append(val)
+        columns[name] = values
+    return ColumnBatch.from_columns(columns, stop - start)
+
+
+def generate_rows(
+    table_name: str,
+    spec: dict[str, Any],
+    seed: int,
+    start: int,
+    stop: int,
+    unique_sets: dict[str, Any] | None = None,
+) -> list[dict]:
+    """``generate_columns`` as a list of row dicts."""
+
+    return generate_columns(table_name, spec, seed, start, stop, unique_sets).to_rows()
+
+
+def table_columns(table_name: str, spec: dict[str, Any], relationships: list[dict[str, Any]]) -> list[str]:
+    """Column names of a generated table in order: schema columns, then new foreign keys."""
+
+    names = list(dict.fromkeys(col["name"] for col in spec.get("columns", [])))
+    for rel in relationships:
+        if rel["child_table"] == table_name and rel["child_key"] not in names:
+            names.append(rel["child_key"])
+    return names
+
+
+def iter_table_batches(
+    table_name: str,
+    spec: dict[str, Any],
+    seed: int,
+    row_count: int,
+    relationships: list[dict[str, Any]],
+    context: dict[str, dict[str, Sequence[Any]]],
+    profile: str = "realistic",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    row_range: tuple[int, int] | None = None,
+    names: Collection[str] | None = None,
+) -> Iterator[ColumnBatch]:
+    """Yield one table in ``ColumnBatch`` batches of at most ``batch_size`` rows.
+
+    ``context`` holds the key columns of parent tables generated earlier; this table's
+    own key columns are added once its last batch has been produced. Column values,
+    each foreign key and the profile's missing cells draw from their own
+    ``BlockStream``, so the concatenated batches equal ``generate_tables`` output
+    without holding a whole foreign-key column. A profile with duplicates keeps the
+    table's batches until the end to copy rows from.
+
+    ``row_range`` yields only rows ``[start, stop)`` (each stream replays at most the
+    start of the block holding ``start``) and ``names`` only some columns. With either,
+    ``context`` is not updated. A row range cannot include profile duplicates, and
+    ``unique`` columns that are checked against seen values are only checked within
+    the range.
+    """
+
+    if batch_size < 1:
+        raise ValueError("batch_size must be >= 1")
+    first, last = row_range if row_range is not None else (0, row_count)
+    if not 0 <= first <= last <= row_count:
+        raise ValueError(f"Row range [{first}, {last}) is outside the {row_count} rows of {table_name}")
+    duplicates_enabled = PROFILE_DEFAULTS.get(profile, {}).get("duplicates", 0) > 0
+    if row_range is not None and duplicates_enabled:
+        raise ValueError(f"Profile {profile!r} adds duplicates, so {table_name} cannot be split into row ranges")
+    partial = row_range is not None or names is not None
+    keys = table_columns(table_name, spec, relationships)
+    unique_sources(table_name, spec, seed, row_count)
+    uniques = unique_trackers(spec, row_count)
+    streams: dict[str, BlockStream] = {}
+    foreign_keys: list[tuple[str, Any, BlockStream]] = []
+    for rel in relationships:
+        if rel["child_table"] != table_name:
+            continue
+        if rel["parent_table"] not in context:
+            raise ValueError(f"Parent table {rel['parent_table']} must be generated before {table_name}")
+        if names is None or rel["child_key"] in names:
+            parent_keys = context[rel["parent_table"]][rel["parent_key"]]
+            foreign_keys.append((rel["child_key"], parent_keys, BlockStream(seed, table_name, "fk", rel["child_key"])))
+    missing = BlockStream(seed, table_name, "profile", "missing")
+
+    def replay_missing(block_rng: random.Random, idx: int) -> None:
+        skip_profile_missing(1, len(keys), profile, block_rng)
+
+    retained: dict[str, list[Column]] = {}
+    if not partial:
+        retained = {rel["parent_key"]: [] for rel in relationships if rel["parent_table"] == table_name}
+    kept: list[ColumnBatch] | None = [] if duplicates_enabled else None
+
+    def finish(batch: ColumnBatch) -> ColumnBatch:
+        for name, parts in retained.items():
+            parts.append(batch.columns[name])
+        if kept is not None:
+            kept.append(batch)
+        return batch
+
+    for start in range(first, last, batch_size):
+        stop = min(start + batch_size, last)
+        batch = generate_columns(table_name, spec, seed, start, stop, uniques, names, streams)
+        for child_key, parent_keys, fk_stream in foreign_keys:
+
+            def replay_choice(block_rng: random.Random, idx: int, parent_keys: Any = parent_keys) -> None:
+                block_rng.choice(parent_keys)
+
+            values: list[Any] = []
+            for block_rng, rows in fk_stream.spans(start, stop, replay_choice):
+                values.extend(foreign_key_values(parent_keys, len(rows), block_rng))
+            batch.columns[child_key] = Column.from_values(values)
+        for block_rng, rows in missing.spans(start, stop, replay_missing):
+            profile_missing(batch, profile, block_rng, keys, range(rows.start - start, rows.stop - start))
+        yield finish(batch)
+    if kept:
+        duplicates = profile_duplicates(row_count, profile, derive_rng(seed, table_name))
+        if duplicates:
+            yield finish(ColumnBatch.concat(kept).take(duplicates))
+    if not partial:
+        context[table_name] = {name: Column.concat(parts) if parts else [] for name, parts in retained.items()}
+
+
+def key_context(
+    raw_schema: dict[str, Any],
+    seed: int,
+    table_name: str,
+    rows_override: int | None = None,
+    profile: str = "realistic",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> dict[str, dict[str, Sequence[Any]]]:
+    """Parent key columns ``table_name`` needs, generated without the rest of its ancestors.
+
+    Only the key columns of each ancestor are generated (plus, transitively, the keys
+    they reference), which lets a worker produce a slice of a child table on its own.
+    """
 
-def generate_tables(raw_schema: dict[str, Any], seed: int, rows_override: int | None = None, profile: str = "realistic") -> dict[str, list[dict]]:
     tables = raw_schema.get("tables", {})
     relationships = raw_schema.get("relationships", [])
-    results: dict[str, list[dict]] = {}
-    for table_name in generation_order(tables, relationships):
-        spec = tables[table_name]
-        rng = derive_rng(seed, table_name)
-        row_count = int(rows_override if rows_override is not None else spec.get("rows", 100))
-        unique_sets = {c["name"]: set() for c in spec.get("columns", []) if c.get("constraints", {}).get("unique")}
-        rows: list[dict] = []
-        for idx in range(row_count):
-            row = {}
-            for col in spec.get("columns", []):
-                for _ in range(10):
-                    val = generate_value(col, idx, rng)
-                    if validate_column_value(val, col, unique_sets.get(col["name"])):
-                        if col["name"] in unique_sets:
-                            unique_sets[col["name"]].add(val)
-                        row[col["name"]] = val
-                        break
-            rows.append(row)
+    needed: set[str] = set()
+    pending = [table_name]
+    while pending:
+        child = pending.pop()
         for rel in relationships:
-            if rel["child_table"] == table_name:
-                apply_foreign_keys(rows, rel, results[rel["parent_table"]], rng)
-        results[table_name] = apply_profile(rows, profile, rng)
-    return results
+            if rel["child_table"] == child and rel["parent_table"] not in needed:
+                needed.add(rel["parent_table"])
+                pending.append(rel["parent_table"])
+
+    context: dict[str, dict[str, Sequence[Any]]] = {}
+    for name in generation_order(tables, relationships):
+        if name not in needed:
+            continue
+        spec = tables[name]
+        key_names = list(dict.fromkeys(rel["parent_key"] for rel in relationships if rel["parent_table"] == name))
+        row_count = int(rows_override if rows_override is not None else spec.get("rows", 100))
+        batches = iter_table_batches(
+            name, spec, seed, row_count, relationships, context, profile, batch_size, names=key_names
+        )
+        parts: dict[str, list[Column]] = {key: [] for key in key_names}
+        for batch in batches:
+            for key in key_names:
+                parts[key].append(batch.columns[key])
+        context[name] = {key: Column.concat(columns) if columns else [] for key, columns in parts.items()}
+    return context
+
+
+def stream_batches(
+    raw_schema: dict[str, Any],
+    seed: int,
+    rows_override: int | None = None,
+    profile: str = "realistic",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    tables: Collection[str] | None = None,
+) -> dict[str, Iterator[ColumnBatch]]:
+    """Lazy ``iter_table_batches`` per table, in generation order.
+
+    Iterators should be consumed in that order, since child tables draw foreign keys
+    from the key columns of parents that have already been produced. Only one batch per
+    table (plus parent key columns) is held in memory. With ``tables``, only those tables
+    are streamed; a table whose parents have not been produced (not among ``tables``, or
+    not consumed yet) generates just their key columns first (see ``key_context``).
+    """
+
+    specs = raw_schema.get("tables", {})
+    relationships = raw_schema.get("relationships", [])
+    unknown = sorted(set(tables or ()) - set(specs))
+    if unknown:
+        raise ValueError(f"Unknown tables: {', '.join(unknown)}")
+    context: dict[str, dict[str, Sequence[Any]]] = {}
+
+    def table_batches(table_name: str) -> Iterator[ColumnBatch]:
+        if any(rel["child_table"] == table_name and rel["parent_table"] not in context for rel in relationships):
+            for parent, keys in key_context(raw_schema, seed, table_name, rows_override, profile, batch_size).items():
+                context.setdefault(parent, keys)
+        yield from iter_table_batches(
+            table_name,
+            specs[table_name],
+            seed,
+            int(rows_override if rows_override is not None else specs[table_name].get("rows", 100)),
+            relationships,
+            context,
+            profile,
+            batch_size,
+        )
+
+    return {
+        table_name: table_batches(table_name)
+        for table_name in generation_order(specs, relationships)
+        if tables is None or table_name in tables
+    }
+
+
+def generate_batches(
+    raw_schema: dict[str, Any],
+    seed: int,
+    rows_override: int | None = None,
+    profile: str = "realistic",
+) -> dict[str, ColumnBatch]:
+    """Generate every table as one ``ColumnBatch`` (same values as ``generate_tables``)."""
+
+    streams = stream_batches(raw_schema, seed, rows_override, profile)
+    return {table_name: ColumnBatch.concat(batches) for table_name, batches in streams.items()}
+
+
+def generate_tables(raw_schema: dict[str, Any], seed: int, rows_override: int | None = None, profile: str = "realistic") -> dict[str, list[dict]]:
+    return {name: batch.to_rows() for name, batch in generate_batches(raw_schema, seed, rows_override, profile).items()}
@@ -0,0 +1,69 @@
+import sqlite3
+
+import pytest
+
+from shared.io.columnar import ColumnBatch
+from shared.schema_dsl.engine import generate_batches, generate_tables, stream_batches
+from shared.schema_dsl.parser import load_schema
+
+ROWS = [
+    {"id": 1, "amount": 1.5, "label": "a", "flag": True},
+    {"id": None, "amount": 2.0, "label": None, "flag": False},
+    {"id": 3, "amount": None, "label": "c", "flag": None},
+]
+
+
+def test_batch_packs_numeric_columns_and_round_trips_nulls():
+    batch = ColumnBatch.from_rows(ROWS)
+    assert {name: column.kind for name, column in batch.columns.items()} == {
+        "id": "int",
+        "amount": "float",
+        "label": "object",
+        "flag": "bool",
+    }
+    assert batch.columns["id"].values.typecode == "q"
+    assert batch.to_rows() == ROWS
+    assert batch.take([2, 0]).to_rows() == [ROWS[2], ROWS[0]]
+
+
+def test_batch_set_null_keeps_the_typed_column():
+    batch = ColumnBatch.from_rows(ROWS[:1])
+    batch.set_null("id", 0)
+    assert batch.columns["id"].kind == "int"
+    assert batch.column("id") == [None]
+
+
+def test_arrow_adapter_preserves_values_and_nulls():
+    pytest.importorskip("pyarrow")
+    table = ColumnBatch.from_rows(ROWS).to_arrow()
+    assert str(table.schema.field("id").type) == "int64"
+    assert table.to_pylist() == ROWS
+
+
+def test_sqlite_and_csv_adapters(tmp_path):
+    batch = ColumnBatch.from_rows(ROWS)
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE t (id, amount, label, flag)")
+    conn.executemany("INSERT INTO t VALUES (?, ?, ?, ?)", batch.iter_tuples())
+    assert conn.execute("SELECT * FROM t").fetchall() == [(1, 1.5, "a", 1), (None, 2.0, None, 0), (3, None, "c", None)]
+
+    path = tmp_path / "t.csv"
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        assert batch.write_csv(handle, ["id", "label", "missing"]) == 3
+    assert path.read_text(encoding="utf-8").splitlines() == ["id,label,missing", "1,a,", ",,", "3,c,"]
+
+
+@pytest.mark.parametrize("profile", ["fast", "dirty"])
+def test_batches_match_row_tables(profile):
+    schema = load_schema("generators/parquet_generator/schemas/retail_basic_parquet.yaml")
+    batches = generate_batches(schema.raw, seed=4, rows_override=50, profile=profile)
+    tables = generate_tables(schema.raw, seed=4, rows_override=50, profile=profile)
+    assert {name: batch.to_rows() for name, batch in batches.items()} == tables
+
+
+@pytest.mark.parametrize("batch_size", [1, 7, 1000])
+def test_streamed_batches_match_row_tables(batch_size):
+    schema = load_schema("generators/sqlite_seed/schemas/retail_basic_sqlite.yaml")
+    tables = generate_tables(schema.raw, seed=8, rows_override=40, profile="dirty")
+    streams = stream_batches(schema.raw, seed=8, rows_override=40, profile="dirty", batch_size=batch_size)
+    assert {name: ColumnBatch.concat(list(batches)).to_rows() for name, batches in streams.items()} == tables
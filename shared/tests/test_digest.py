@@ -0,0 +1,40 @@
+from shared.io import digest as digest_module
+from shared.io.digest import TableDigest, canonical_encoder, compare_digests, read_manifest, write_manifest
+
+
+def _digest(rows, chunk_rows=2):
+    digest = TableDigest(chunk_rows)
+    for row in rows:
+        digest.add(row)
+    return digest
+
+
+def test_digests_ignore_key_order_but_not_row_order():
+    rows = [{"id": i, "name": f"n{i}"} for i in range(5)]
+    digest = _digest(rows).to_dict()
+
+    assert digest == _digest([{"name": row["name"], "id": row["id"]} for row in rows]).to_dict()
+    assert digest["rows"] == 5 and len(digest["chunks"]) == 3
+    assert _digest(rows[::-1]).to_dict()["digest"] != digest["digest"]
+    assert list(TableDigest().tap(rows)) == rows
+
+
+def test_mismatches_are_located_to_a_chunk(tmp_path):
+    rows = [{"id": i} for i in range(6)]
+    write_manifest(tmp_path, generator="test", params={"seed": 1}, tables={"t": _digest(rows)})
+    expected = read_manifest(tmp_path)["tables"]["t"]
+
+    assert compare_digests("t", expected, _digest(rows)) == []
+    assert compare_digests("t", expected, _digest(rows[:5])) == ["t has 5 rows, manifest records 6"]
+    changed = [*rows[:3], {"id": 99}, *rows[4:]]
+    assert compare_digests("t", expected, _digest(changed)) == ["t differs from the manifest in rows 3-4"]
+    assert read_manifest(tmp_path / "missing") is None
+
+
+def test_digests_do_not_depend_on_orjson(monkeypatch):
+    rows = [{"small": 1e-7, "large": 1e16, "nan": float("nan")}, {"nan": None}]
+    installed = _digest(rows).to_dict()
+    monkeypatch.setattr(digest_module, "_orjson", None, raising=False)
+
+    assert _digest(rows).to_dict() == installed
+    assert canonical_encoder()({"nan": float("nan")}) != canonical_encoder()({"nan": None})
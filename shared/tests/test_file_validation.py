@@ -0,0 +1,205 @@
+import json
+import sqlite3
+
+import pytest
+
+from shared.constraints.streaming import StreamingValidator, expected_row_counts, validate_sqlite, validate_stream
+from shared.io.columnar import ColumnBatch
+from shared.io.readers import iter_csv_batches, iter_json_batches, iter_parquet_batches
+
+SCHEMA = {
+    "dataset": "shop",
+    "tables": {
+        "orders": {
+            "rows": 4,
+            "columns": [
+                {"name": "order_id", "type": "id", "constraints": {"primary_key": True}},
+                {"name": "status", "type": "categorical", "constraints": {"allowed": ["new", "paid"], "not_null": True}},
+                {"name": "amount", "type": "float", "constraints": {"min": 0, "max": 100}},
+            ],
+        },
+        "customers": {
+            "rows": 3,
+            "columns": [
+                {"name": "customer_id", "type": "id", "constraints": {"unique": True}},
+                {"name": "email", "type": "string", "constraints": {"pattern": r"[^@]+@[^@]+$"}},
+            ],
+        },
+    },
+    "relationships": [
+        {"parent_table": "customers", "parent_key": "customer_id", "child_table": "orders", "child_key": "customer_id"}
+    ],
+}
+CUSTOMERS = [
+    {"customer_id": 1, "email": "a@x.io"},
+    {"customer_id": 2, "email": "b@x.io"},
+    {"customer_id": 2, "email": "nope"},
+]
+ORDERS = [
+    {"order_id": 1, "status": "new", "amount": 10.5, "customer_id": 1},
+    {"order_id": 2, "status": None, "amount": 250.0, "customer_id": 9},
+    {"order_id": 3, "status": "lost", "amount": "n/a", "customer_id": None},
+    {"order_id": 3, "status": "paid", "amount": 0.0, "customer_id": 2},
+]
+VIOLATIONS = {
+    "customers.customer_id violates uniqueness": 1,
+    "customers.email does not match pattern": 1,
+    "orders.order_id violates uniqueness": 1,
+    "orders.status violates not_null": 1,
+    "orders.status not in allowed": 1,
+    "orders.amount has invalid type for float": 1,
+    "orders.amount above max": 1,
+    "FK violation orders.customer_id -> customers.customer_id": 1,
+}
+
+
+def _write_csv(path, rows):
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        ColumnBatch.from_rows(rows).write_csv(handle)
+
+
+def test_csv_batches_parse_values_by_column_type(tmp_path):
+    path = tmp_path / "orders.csv"
+    _write_csv(path, ORDERS)
+
+    batches = list(iter_csv_batches(path, SCHEMA["tables"]["orders"]["columns"], batch_size=3))
+
+    assert [len(batch) for batch in batches] == [3, 1]
+    assert ColumnBatch.concat(batches).to_rows() == ORDERS
+
+
+def test_violations_are_counted_with_row_samples_across_batches():
+    batches = {
+        "orders": [ColumnBatch.from_rows(ORDERS[:1]), ColumnBatch.from_rows(ORDERS[1:])],
+        "customers": [ColumnBatch.from_rows(CUSTOMERS)],
+    }
+
+    result = validate_stream(SCHEMA, batches)
+
+    assert result.violations == VIOLATIONS
+    assert result.row_counts == {"customers": 3, "orders": 4}
+    assert "orders.order_id violates uniqueness in 1 row(s) (rows 3)" in result.errors
+    assert "FK violation orders.customer_id -> customers.customer_id in 1 row(s) (rows 1)" in result.errors
+
+
+def test_same_checks_on_every_file_format(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    for name, rows in (("orders", ORDERS), ("customers", CUSTOMERS)):
+        _write_csv(tmp_path / f"{name}.csv", rows)
+        (tmp_path / f"{name}.ndjson").write_text("".join(json.dumps(row) + "\n" for row in rows), encoding="utf-8")
+    pq.write_table(ColumnBatch.from_rows(CUSTOMERS).to_arrow(), tmp_path / "customers.parquet")
+    pq.write_table(ColumnBatch.from_rows([{**row, "amount": None} for row in ORDERS]).to_arrow(), tmp_path / "orders.parquet")
+
+    specs = SCHEMA["tables"]
+    from_csv = validate_stream(SCHEMA, {n: iter_csv_batches(tmp_path / f"{n}.csv", specs[n]["columns"]) for n in specs})
+    from_json = validate_stream(SCHEMA, {n: iter_json_batches(tmp_path / f"{n}.ndjson") for n in specs})
+    from_parquet = validate_stream(SCHEMA, {n: iter_parquet_batches(tmp_path / f"{n}.parquet") for n in specs})
+
+    assert from_csv.violations == from_json.violations == VIOLATIONS
+    numeric = {rule for rule in VIOLATIONS if rule.startswith("orders.amount")}
+    assert from_parquet.violations == {rule: count for rule, count in VIOLATIONS.items() if rule not in numeric}
+
+
+def test_streaming_validation_spills_parent_keys(tmp_path):
+    batches = {
+        "customers": [ColumnBatch.from_rows(CUSTOMERS[:1]), ColumnBatch.from_rows(CUSTOMERS[1:])],
+        "orders": [ColumnBatch.from_rows(ORDERS[:2]), ColumnBatch.from_rows(ORDERS[2:])],
+    }
+
+    result = validate_stream(SCHEMA, batches, memory_keys=1, scratch_dir=str(tmp_path))
+
+    assert result.violations == VIOLATIONS
+    assert "FK violation orders.customer_id -> customers.customer_id in 1 row(s) (rows 1)" in result.errors
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_partition_values_come_from_directory_names(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    (tmp_path / "orders" / "2024" / "a%2Fb").mkdir(parents=True)
+    pq.write_table(ColumnBatch.from_rows([{"id": 1}]).to_arrow(), tmp_path / "orders" / "2024" / "a%2Fb" / "part-0.parquet")
+    partitions = [{"name": "year", "type": "categorical", "categories": [2023, 2024]}, {"name": "region"}]
+
+    (batch,) = iter_parquet_batches(tmp_path / "orders", partitions)
+
+    assert batch.to_rows() == [{"id": 1, "year": 2024, "region": "a/b"}]
+
+
+def test_parents_must_be_checked_first_and_missing_columns_are_reported():
+    validator = StreamingValidator(SCHEMA)
+    with pytest.raises(ValueError, match="customers must be checked before orders"):
+        validator.check_table("orders", [])
+
+    result = validate_stream(SCHEMA, {"customers": [ColumnBatch.from_rows([{"customer_id": 1}])]})
+    assert "customers missing columns ['email']" in result.errors
+    assert "Missing output for table orders" in result.errors
+
+
+def test_expected_row_counts_include_duplicates():
+    schema = {"tables": {"a": {"rows": 10, "corruption": {"duplicate_rate": 0.2}}, "b": {"rows": 5}}}
+
+    assert expected_row_counts(schema) == {"a": 12, "b": 5}
+    assert expected_row_counts(schema, rows_override=100) == {"a": 120, "b": 100}
+
+
+def test_sqlite_checks_match_the_streaming_rules(tmp_path):
+    conn = sqlite3.connect(tmp_path / "shop.db")
+    conn.execute("CREATE TABLE customers (customer_id INTEGER, email TEXT)")
+    conn.execute("CREATE TABLE orders (order_id INTEGER, status TEXT, amount REAL, customer_id INTEGER)")
+    conn.executemany("INSERT INTO customers VALUES (?, ?)", [tuple(row.values()) for row in CUSTOMERS])
+    orders = [{**row, "amount": None} if row["amount"] == "n/a" else row for row in ORDERS]
+    conn.executemany("INSERT INTO orders VALUES (?, ?, ?, ?)", [tuple(row.values()) for row in orders])
+
+    result = validate_sqlite(conn, SCHEMA)
+
+    assert result.row_counts == {"orders": 4, "customers": 3}
+    assert result.violations == {
+        "orders.order_id violates uniqueness": 1,
+        "orders.status violates not_null": 1,
+        "orders.status not in allowed": 1,
+        "orders.amount above max": 1,
+        "customers.customer_id violates uniqueness": 1,
+        "customers.email does not match pattern": 1,
+        "FK violation orders.customer_id -> customers.customer_id": 1,
+    }
+    assert "orders.status violates not_null in 1 row(s) (rows 2)" in result.errors
+
+
+def test_json_cli_validates_files_without_regenerating(tmp_path, monkeypatch):
+    from generators.json_generator.generator import cli
+
+    schema = "generators/parquet_generator/schemas/retail_basic_parquet.yaml"
+    args = ["--schema", schema, "--out", str(tmp_path), "--profile", "fast"]
+    monkeypatch.setattr("sys.argv", ["prog", "generate", *args])
+    cli.main()
+
+    def regenerate(*_args, **_kwargs):
+        raise AssertionError("validate must not regenerate the dataset")
+
+    monkeypatch.setattr(cli, "stream_batches", regenerate)
+    monkeypatch.setattr("sys.argv", ["prog", "validate", *args])
+    cli.main()
+    report = json.loads((tmp_path / "validation_report.json").read_text())
+    assert report["ok"] is True
+
+    rows = [json.loads(line) for line in (tmp_path / "orders.ndjson").read_text().splitlines()]
+    rows[5]["customer_id"] = 10_000
+    (tmp_path / "orders.ndjson").write_text("".join(json.dumps(row) + "\n" for row in rows))
+    with pytest.raises(SystemExit):
+        cli.main()
+    report = json.loads((tmp_path / "validation_report.json").read_text())
+    assert report["stats"]["violations"] == {"FK violation orders.customer_id -> customers.customer_id": 1}
+
+
+def test_legacy_cli_validates_csv_directory(tmp_path):
+    from csv_generator.generator.cli import main
+
+    schema = "csv_generator/schemas/two_tables_fk_minimal.yaml"
+    assert main(["generate", "--schema", schema, "--out", str(tmp_path / "data")]) == 0
+    assert main(["validate", "--schema", schema, "--data", str(tmp_path / "data"), "--out", str(tmp_path / "r.json")]) == 0
+    assert json.loads((tmp_path / "r.json").read_text())["valid"] is True
+
+    children = tmp_path / "data" / "children.csv"
+    children.write_text("".join(children.read_text().splitlines(keepends=True)[:-1]))
+    assert main(["validate", "--schema", schema, "--data", str(tmp_path / "data"), "--out", str(tmp_path / "r.json")]) == 2
+    report = json.loads((tmp_path / "r.json").read_text())
+    assert report["errors"] == ["Row count mismatch for children: expected 24, got 23"]
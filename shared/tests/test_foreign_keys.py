@@ -0,0 +1,17 @@
+from shared.constraints.foreign_keys import ParentKeyIndex
+
+
+def test_spilled_index_finds_the_same_orphans(tmp_path):
+    probe = [3, None, 7, "3", 2.0, True, 10**30, 11]
+    with ParentKeyIndex() as in_memory, ParentKeyIndex(memory_keys=4, directory=tmp_path) as spilled:
+        for index in (in_memory, spilled):
+            index.update([1, 2, None, 3])
+            index.update(range(4, 10))
+            index.update(["a", 10**30])
+        assert not in_memory.spilled and spilled.spilled
+        assert len(in_memory) == len(spilled) == 11
+        assert spilled.missing(probe) == in_memory.missing(probe) == [3, 7]
+        assert spilled.missing([1, None, 9]) == []
+        assert list(tmp_path.iterdir()) == [spilled.path]
+    assert list(tmp_path.iterdir()) == []
+
@@ -0,0 +1,76 @@
+import gc
+import json
+import warnings
+
+import pytest
+
+from shared.io import json_stream
+from shared.io.json_stream import JsonRowWriter, compressed_path, read_json_rows, write_json_rows
+
+ROWS = [
+    {"id": 1, "name": "Zoë", "tags": ["a", "b"], "nested": {"x": 1.5, "ok": True}},
+    {"id": 2, "name": None, "tags": [], "nested": {"x": -0.25, "ok": False}},
+    {"id": 3, "name": "plain", "tags": ["c"], "nested": {"x": 1e-07, "ok": None}},
+]
+
+
+@pytest.mark.parametrize("mode", ["ndjson", "json"])
+@pytest.mark.parametrize("compression", [None, "gzip"])
+def test_rows_round_trip_in_small_chunks(tmp_path, mode, compression):
+    path = compressed_path(tmp_path / f"rows.{mode}", compression)
+    count = write_json_rows(path, iter(ROWS), mode, compression=compression, buffer_size=8)
+
+    assert count == 3
+    assert list(read_json_rows(path, mode)) == ROWS
+    if compression is None and mode == "json":
+        assert json.loads(path.read_text(encoding="utf-8")) == ROWS
+
+
+def test_empty_json_array_is_valid(tmp_path):
+    with JsonRowWriter(tmp_path / "empty.json", "json"):
+        pass
+    assert json.loads((tmp_path / "empty.json").read_text()) == []
+
+
+def test_stdlib_fallback_matches_orjson(tmp_path, monkeypatch):
+    pytest.importorskip("orjson")
+    write_json_rows(tmp_path / "fast.ndjson", ROWS[:2])
+    monkeypatch.setattr(json_stream, "_orjson", None)
+    write_json_rows(tmp_path / "stdlib.ndjson", ROWS[:2])
+
+    assert (tmp_path / "fast.ndjson").read_bytes() == (tmp_path / "stdlib.ndjson").read_bytes()
+    assert json_stream.json_encoder()({"big": 1 << 70}) == b'{"big":1180591620717411303424}'
+
+
+def test_gzip_output_closes_the_file(tmp_path):
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always", ResourceWarning)
+        write_json_rows(tmp_path / "rows.ndjson.gz", ROWS, compression="gzip")
+        gc.collect()
+    assert not [warning for warning in caught if issubclass(warning.category, ResourceWarning)]
+    assert list(read_json_rows(tmp_path / "rows.ndjson.gz")) == ROWS
+
+
+def test_gzip_output_is_reproducible(tmp_path):
+    write_json_rows(tmp_path / "a.ndjson.gz", ROWS, compression="gzip")
+    write_json_rows(tmp_path / "b.ndjson.gz", ROWS, compression="gzip")
+    assert (tmp_path / "a.ndjson.gz").read_bytes() == (tmp_path / "b.ndjson.gz").read_bytes()
+
+
+def test_unknown_mode_and_compression_are_rejected(tmp_path):
+    with pytest.raises(ValueError, match="JSON mode"):
+        JsonRowWriter(tmp_path / "x.txt", "csv")
+    with pytest.raises(ValueError, match="compression"):
+        JsonRowWriter(tmp_path / "x.ndjson", compression="bz2")
+
+
+def test_json_arrays_stream_by_line_and_reject_truncation(tmp_path):
+    pretty = tmp_path / "pretty.json"
+    pretty.write_text(json.dumps(ROWS, indent=2), encoding="utf-8")
+    assert list(read_json_rows(pretty, "json")) == ROWS
+
+    truncated = tmp_path / "truncated.json"
+    write_json_rows(truncated, ROWS, "json")
+    truncated.write_bytes(truncated.read_bytes()[:-3])
+    with pytest.raises(json.JSONDecodeError):
+        list(read_json_rows(truncated, "json"))
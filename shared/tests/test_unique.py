@@ -0,0 +1,70 @@
+import pytest
+
+from shared.constraints.unique import BloomFilter, HyperLogLog, UniqueTracker, value_hashes
+from shared.io.rng import IndexPermutation
+from shared.schema_dsl.engine import generate_tables
+
+
+def test_index_permutation_is_a_bijection():
+    for size in (1, 2, 7, 1000, 4097):
+        permutation = IndexPermutation(size, 9, "t", "c")
+        assert sorted(permutation[i] for i in range(size)) == list(range(size))
+
+
+def test_index_permutation_array_matches_scalar():
+    np = pytest.importorskip("numpy")
+    permutation = IndexPermutation(777, 9, "t", "c")
+    assert permutation.array(np.arange(777)).tolist() == [permutation[i] for i in range(777)]
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000, error_rate=0.01)
+    for value in range(1000):
+        bloom.add(value)
+    assert all(value in bloom for value in range(1000))
+    assert sum(value in bloom for value in range(1000, 11000)) < 500
+
+
+def test_unique_tracker_switches_to_bloom_after_exact_limit():
+    tracker = UniqueTracker(capacity=500, exact_limit=100)
+    for value in range(300):
+        tracker.add(f"v{value}")
+    assert tracker.exact is None and tracker.bloom is not None
+    assert all(f"v{value}" in tracker for value in range(300))
+
+
+def test_engine_builds_unique_integers_and_fails_loudly():
+    raw = {
+        "tables": {
+            "t": {
+                "rows": 50,
+                "columns": [{"name": "code", "type": "integer", "min": 1, "max": 50, "constraints": {"unique": True}}],
+            }
+        }
+    }
+    rows = generate_tables(raw, seed=1, profile="fast")["t"]
+    assert sorted(row["code"] for row in rows) == list(range(1, 51))
+
+    raw["tables"]["t"]["columns"].append({"name": "flag", "type": "boolean", "constraints": {"unique": True}})
+    with pytest.raises(ValueError, match="Could not satisfy constraints for t.flag"):
+        generate_tables(raw, seed=1, profile="fast")
+
+
+def test_hyperloglog_estimates_distinct_values():
+    sketch = HyperLogLog()
+    values = [f"v{value}" for value in range(200_000)]
+    sketch.add_hashes(value_hashes(values))
+    sketch.add_hashes(value_hashes(values[:50_000]))
+
+    assert sketch.estimate() == pytest.approx(200_000, rel=3 * sketch.relative_error)
+    assert len(sketch.registers) == 1 << 14
+
+
+def test_hyperloglog_python_and_numpy_updates_match():
+    pytest.importorskip("numpy")
+    vectorized, scalar = HyperLogLog(10), HyperLogLog(10)
+    hashes = value_hashes(list(range(5000)))
+    vectorized.add_hashes(hashes)
+    scalar.add_hashes([int(value) for value in hashes])
+
+    assert vectorized.registers == scalar.registers